@@ -15,6 +15,34 @@ S3_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
 S3_SECRET_KEY = os.getenv("AWS_SECRET_KEY")
 S3_BUCKET_NAME = os.getenv("AWS_S3_BUCKET_NAME")
 S3_REGION = os.getenv("AWS_S3_REGION")
+# S3 호환 엔드포인트 (로컬 대역 서버 등). 비우면 AWS 기본 엔드포인트
+S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL") or None
+
+# 영상 업로드 설정: 이 크기(MB) 이상이면 멀티파트로 나눠 동시에 업로드
+S3_MULTIPART_THRESHOLD_MB = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", 16))
+S3_MULTIPART_CHUNK_MB = int(os.getenv("S3_MULTIPART_CHUNK_MB", 16))  # 최소 5MB
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", 8))
+# true면 인코더가 조각 MP4(fMP4)를 쓰는 동안 멀티파트 업로드를 시작
+S3_UPLOAD_WHILE_ENCODING = (
+    os.getenv("S3_UPLOAD_WHILE_ENCODING", "false").lower() == "true"
+)
+S3_UPLOAD_POLL_INTERVAL = float(os.getenv("S3_UPLOAD_POLL_INTERVAL", 0.5))  # 초
+
+# 강의 생성 작업 큐: 업로드된 PDF 보관 위치와 워커 폴링 주기(초)
+LECTURE_UPLOAD_DIR = os.getenv(
+    "LECTURE_UPLOAD_DIR", os.path.join(BASE_DIR, "uploads")
+)
+LECTURE_WORKER_POLL_INTERVAL = float(os.getenv("LECTURE_WORKER_POLL_INTERVAL", 2))
+# 진행 중 작업의 생존 신호 주기(초). 신호가 LECTURE_JOB_STALE_SECONDS 넘게 끊기면
+# 워커가 죽은 것으로 보고 다시 대기열에 넣고, LECTURE_JOB_MAX_ATTEMPTS번 실행해도
+# 끝나지 않으면 실패 처리
+LECTURE_JOB_HEARTBEAT_INTERVAL = float(os.getenv("LECTURE_JOB_HEARTBEAT_INTERVAL", 30))
+LECTURE_JOB_STALE_SECONDS = float(os.getenv("LECTURE_JOB_STALE_SECONDS", 300))
+LECTURE_JOB_MAX_ATTEMPTS = int(os.getenv("LECTURE_JOB_MAX_ATTEMPTS", 2))
+
+# 큰 업로드는 임시 파일로 받음. 같은 디렉터리에 두어 작업 등록 시 복사 없이 이동(rename)
+os.makedirs(LECTURE_UPLOAD_DIR, exist_ok=True)
+FILE_UPLOAD_TEMP_DIR = LECTURE_UPLOAD_DIR
 
 INSTALLED_APPS = [
     "corsheaders",
@@ -0,0 +1,234 @@
+import os
+import wave
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+# MPEG 오디오 헤더 표 (버전: 1 = MPEG-1, 2 = MPEG-2, 25 = MPEG-2.5)
+_BITRATES = {  # kbps, (버전 그룹, 레이어) → 인덱스 1~14
+    (1, 1): [32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    25: [11025, 12000, 8000],
+}
+
+
+def _parse_frame_header(data: bytes, pos: int):
+    """
+    pos 위치의 MPEG 오디오 프레임 헤더를 해석합니다.
+    유효하면 (프레임 길이, 프레임당 샘플 수, 샘플레이트, 비트레이트, 버전, 모노 여부),
+    아니면 None.
+    """
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = {0: 25, 2: 2, 3: 1}.get((b1 >> 3) & 0x03)
+    layer = {1: 3, 2: 2, 3: 1}.get((b1 >> 1) & 0x03)
+    bitrate_idx = b2 >> 4
+    rate_idx = (b2 >> 2) & 0x03
+    if version is None or layer is None or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_idx - 1] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_idx]
+    padding = (b2 >> 1) & 0x01
+    mono = (b3 >> 6) == 3
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or version == 1) else 576
+        length = samples // 8 * bitrate // sample_rate + padding
+    return length, samples, sample_rate, bitrate, version, mono
+
+
+def _id3v2_size(data: bytes, pos: int) -> int:
+    """pos에 ID3v2 태그가 있으면 태그 전체 길이, 없으면 0."""
+    if data[pos : pos + 3] != b"ID3" or pos + 10 > len(data):
+        return 0
+    size = 0
+    for byte in data[pos + 6 : pos + 10]:  # synchsafe 정수
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[pos + 5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _vbr_frame_count(data: bytes, pos: int, version: int, mono: bool):
+    """
+    스트림 첫 프레임의 Xing/Info 또는 VBRI 태그에서 (전체 프레임 수, 전체 바이트 수)를 읽습니다.
+    태그가 없으면 None.
+    """
+    side_info = (17 if mono else 32) if version == 1 else (9 if mono else 17)
+    xing = pos + 4 + side_info
+    if data[xing : xing + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(data[xing + 4 : xing + 8], "big")
+        offset = xing + 8
+        frames = total_bytes = None
+        if flags & 0x1:
+            frames = int.from_bytes(data[offset : offset + 4], "big")
+            offset += 4
+        if flags & 0x2:
+            total_bytes = int.from_bytes(data[offset : offset + 4], "big")
+        if frames:
+            return frames, total_bytes
+    vbri = pos + 36
+    if data[vbri : vbri + 4] == b"VBRI":
+        total_bytes = int.from_bytes(data[vbri + 10 : vbri + 14], "big")
+        frames = int.from_bytes(data[vbri + 14 : vbri + 18], "big")
+        if frames:
+            return frames, total_bytes
+    return None
+
+
+# 앞쪽 몇 프레임의 비트레이트가 모두 같으면 CBR로 보고 파일 크기로 길이를 계산
+_CBR_PROBE_FRAMES = 16
+# 한 위치에서 해석하는 헤더(ID3v2 헤더, 프레임 헤더, Xing/VBRI 태그)가 들어가는 크기
+_HEADER_BYTES = 64
+# 파일에서 한 번에 읽는 크기: 연속된 프레임 헤더는 이 안에서 해석
+_READ_SIZE = 4096
+
+# read(pos) → (버퍼, 버퍼 안에서 pos의 위치)
+_Reader = Callable[[int], tuple[bytes, int]]
+
+
+def _window_reader(f: BinaryIO, end: int) -> _Reader:
+    """
+    파일의 pos부터 최소 _HEADER_BYTES(파일 끝 이전까지)를 담은 버퍼를 돌려주는 함수.
+    직전에 읽은 버퍼에 들어 있으면 다시 읽지 않고, 아니면 그 위치로 이동해 읽습니다.
+    """
+    buf = b""
+    start = 0
+
+    def read(pos: int) -> tuple[bytes, int]:
+        nonlocal buf, start
+        need = min(pos + _HEADER_BYTES, end)
+        if pos < start or start + len(buf) < need:
+            f.seek(pos)
+            buf = f.read(max(min(_READ_SIZE, end - pos), 0))
+            start = pos
+        return buf, pos - start
+
+    return read
+
+
+def _is_cbr(read: _Reader, pos: int, bitrate: int, size: int) -> bool:
+    for _ in range(_CBR_PROBE_FRAMES):
+        header = _parse_frame_header(*read(pos))
+        if header is None:
+            return pos >= size - 128  # 파일 끝(또는 ID3v1 태그)에 도달
+        if header[3] != bitrate:
+            return False
+        pos += header[0]
+    return True
+
+
+def mp3_duration(path: str | Path) -> float:
+    """
+    MP3를 디코딩하지 않고 프레임 헤더만 읽어 길이(초)를 구합니다.
+
+    - 첫 프레임에 Xing/Info·VBRI 태그가 있으면 태그의 프레임 수로 계산합니다.
+      청크별 MP3를 이어 붙인 파일(page_to_mp3 결과)처럼 스트림마다 태그가 있으면
+      태그의 바이트 수만큼 건너뛰며 스트림별 프레임 수를 더합니다.
+    - 태그가 없고 비트레이트가 일정(CBR)하면 파일 크기와 비트레이트로 계산합니다.
+    - 그 밖에는 프레임 헤더를 따라가며 샘플 수를 더합니다.
+
+    파일 전체를 읽지 않고, 태그나 스트림을 건너뛸 때는 그 위치로 이동해 필요한
+    헤더 부분만 읽습니다.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        f.seek(max(size - 128, 0))
+        end = size - (128 if size >= 128 and f.read(3) == b"TAG" else 0)  # ID3v1 제외
+        read = _window_reader(f, end)
+        pos = 0
+        total_samples = 0
+        sample_rate = None
+        first = True
+
+        while pos + 4 <= end:
+            data, offset = read(pos)
+            tag_size = _id3v2_size(data, offset)
+            if tag_size:
+                pos += tag_size
+                continue
+            header = _parse_frame_header(data, offset)
+            if header is None:
+                pos += 1  # 다음 동기 비트까지 건너뜀
+                continue
+            length, samples, rate, bitrate, version, mono = header
+            sample_rate = sample_rate or rate
+
+            tag = _vbr_frame_count(data, offset, version, mono)
+            if tag is not None:
+                frames, total_bytes = tag
+                total_samples += frames * samples
+                if not total_bytes:  # 바이트 수가 없으면 태그가 파일 전체를 설명한다고 봄
+                    break
+                pos += total_bytes
+            elif first and _is_cbr(read, pos, bitrate, size):
+                return (end - pos) * 8 / bitrate
+            else:
+                total_samples += samples
+                pos += max(length, 1)
+            first = False
+
+    if not sample_rate:
+        raise ValueError(f"MP3 프레임을 찾을 수 없습니다: {path}")
+    return total_samples / sample_rate
+
+
+def wav_duration(path: str | Path) -> float:
+    """WAV 헤더의 샘플 수로 길이(초)를 구합니다."""
+    with wave.open(str(path), "rb") as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+def audio_duration(path: str | Path) -> float:
+    """헤더만 읽어 오디오 길이(초)를 구합니다. 지원하지 않는 형식이면 ValueError."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".mp3":
+        return mp3_duration(path)
+    if suffix == ".wav":
+        return wav_duration(path)
+    raise ValueError(f"헤더로 길이를 알 수 없는 오디오 형식입니다: {path}")
+
+
+def plan_timeline(durations: list[float]) -> list[tuple[float, float]]:
+    """슬라이드별 길이 목록을 영상 안에서의 (시작, 끝) 초 목록으로 바꿉니다."""
+    timeline = []
+    start = 0.0
+    for duration in durations:
+        timeline.append((start, start + duration))
+        start += duration
+    return timeline
+
+
+def write_ffmetadata_chapters(
+    timeline: list[tuple[float, float]],
+    path: str | Path,
+    titles: list[str] | None = None,
+) -> Path:
+    """타임라인으로 ffmpeg 메타데이터(챕터) 파일을 만듭니다. 시간 단위는 밀리초."""
+    lines = [";FFMETADATA1"]
+    for idx, (start, end) in enumerate(timeline, start=1):
+        title = titles[idx - 1] if titles else f"슬라이드 {idx}"
+        title = title.replace("\\", "\\\\")
+        for ch in "=;#\n":
+            title = title.replace(ch, f"\\{ch}")
+        lines += [
+            "[CHAPTER]",
+            "TIMEBASE=1/1000",
+            f"START={int(start * 1000)}",
+            f"END={int(end * 1000)}",
+            f"title={title}",
+        ]
+    path = Path(path)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
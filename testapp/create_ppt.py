@@ -1,22 +1,58 @@
 # create_ppt.py
 import logging
+import math
 import os
+import re
+import shutil
 import subprocess
 import tempfile
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+import fitz
 from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips
 from pdf2image import convert_from_path
 
+from .audio_timeline import audio_duration, plan_timeline, write_ffmetadata_chapters
+from .soffice_pool import get_soffice_pool
+
 logger = logging.getLogger(__name__)
 
 _soffice_last_stderr = ""
 
+# 상주 LibreOffice 풀 사용 여부 (false면 요청마다 soffice를 새로 실행)
+SOFFICE_POOL_ENABLED = os.getenv("SOFFICE_POOL_ENABLED", "true").lower() == "true"
+
+# 영상 렌더러 설정: "ffmpeg"(정지 이미지 직접 인코딩),
+# "ffmpeg_segments"(슬라이드별 병렬 인코딩 후 이어 붙이기) 또는 "moviepy"
+VIDEO_RENDERER = os.getenv("VIDEO_RENDERER", "ffmpeg")
+VIDEO_SEGMENT_WORKERS = int(os.getenv("VIDEO_SEGMENT_WORKERS", os.cpu_count() or 2))
+# 정지 슬라이드용 낮은 프레임레이트. 슬라이드 전환은 프레임 경계에만 놓이므로
+# 오디오 경계와의 오차는 반 프레임 이내 (5fps → 0.1초)
+VIDEO_STILL_FPS = float(os.getenv("VIDEO_STILL_FPS", 5))
+# "copy"면 MP3는 그대로 사용하고, WAV(PCM)는 AAC로 한 번만 인코딩
+VIDEO_AUDIO_CODEC = os.getenv("VIDEO_AUDIO_CODEC", "copy")
+PCM_AUDIO_CODEC = os.getenv("PCM_AUDIO_CODEC", "aac")
+# 세그먼트 렌더러가 페이지 오디오를 이어 붙일 때 맞출 샘플레이트·채널 구성
+# (예: "48000", "mono"). 비워 두면 첫 페이지 오디오를 따라 리샘플링하지 않음
+VIDEO_AUDIO_SAMPLE_RATE = os.getenv("VIDEO_AUDIO_SAMPLE_RATE", "")
+VIDEO_AUDIO_CHANNEL_LAYOUT = os.getenv("VIDEO_AUDIO_CHANNEL_LAYOUT", "")
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+FFPROBE_BIN = os.getenv("FFPROBE_BIN", "ffprobe")
+
+# PDF → PNG 래스터라이저: "fitz"(PyMuPDF, 페이지별 스트리밍) 또는 "pdf2image"
+PDF_RASTERIZER = os.getenv("PDF_RASTERIZER", "fitz")
+RASTER_WORKERS = int(os.getenv("RASTER_WORKERS", os.cpu_count() or 2))
+SLIDE_SIZE = (1920, 1080)
+
 
 def _run_soffice_convert(pptx: Path, outdir: Path) -> int:
     """
-    soffice --convert-to pdf ... 명령을 실행하고,
+    PPTX를 outdir 아래 PDF로 변환하고,
     stderr를 전역 변수에 저장한 뒤 리턴코드를 체크합니다.
+    SOFFICE_POOL_ENABLED면 상주 LibreOffice 풀에 변환을 맡기고,
+    아니면 soffice --convert-to pdf ... 명령을 새로 실행합니다.
     """
     global _soffice_last_stderr
     try:
@@ -33,6 +69,13 @@ def _run_soffice_convert(pptx: Path, outdir: Path) -> int:
         # 출력 디렉토리 생성
         outdir.mkdir(parents=True, exist_ok=True)
 
+        if SOFFICE_POOL_ENABLED:
+            pdf_path, _soffice_last_stderr = get_soffice_pool().convert(pptx, outdir)
+            if not pdf_path.exists() or os.path.getsize(pdf_path) == 0:
+                raise RuntimeError(f"PDF 파일이 생성되지 않았습니다: {pdf_path}")
+            print(f"생성된 PDF 파일: {pdf_path} (풀 변환)")
+            return 0
+
         # 환경 변수 설정
         env = os.environ.copy()
         env["HOME"] = str(outdir)  # 임시 홈 디렉토리를 출력 디렉토리로 설정
@@ -112,6 +155,77 @@ def _workdir(prefix: str = "lecture_") -> tempfile.TemporaryDirectory:
     return tempfile.TemporaryDirectory(prefix=prefix)
 
 
+def _rasterize_pages(
+    pdf_path: str, page_indices: list[int], slide_dir: str
+) -> list[str]:
+    """
+    PDF의 지정된 페이지들을 SLIDE_SIZE에 맞는 배율로 바로 렌더링해 PNG로 저장합니다.
+    한 번에 한 페이지의 픽스맵만 메모리에 두고 즉시 디스크에 씁니다.
+    프로세스 풀 워커에서 실행되며, 워커마다 문서를 한 번만 엽니다.
+    """
+    width, height = SLIDE_SIZE
+    saved = []
+    with fitz.open(pdf_path) as doc:
+        for page_index in page_indices:
+            page = doc[page_index]
+            rect = page.rect
+            zoom = min(width / rect.width, height / rect.height)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            out_path = os.path.join(slide_dir, f"slide_{page_index + 1:04d}.png")
+            pix.save(out_path)
+            pix = None  # 다음 페이지 전에 픽스맵 해제
+            saved.append(out_path)
+    return saved
+
+
+def _pdf_to_images_fitz(pdf_path: Path, slide_dir: Path) -> list[Path]:
+    """
+    PyMuPDF로 PDF를 슬라이드 PNG로 변환합니다.
+    페이지를 워커 수만큼 나눠 병렬로 렌더링하므로, 슬라이드 수와 관계없이
+    최대 메모리는 워커 수 × 페이지 한 장 수준으로 유지됩니다.
+    """
+    with fitz.open(str(pdf_path)) as doc:
+        page_count = doc.page_count
+    if page_count == 0:
+        raise RuntimeError(f"PDF에 페이지가 없습니다: {pdf_path}")
+
+    workers = max(1, min(RASTER_WORKERS, page_count))
+    batches = [list(range(start, page_count, workers)) for start in range(workers)]
+    if workers == 1:
+        _rasterize_pages(str(pdf_path), batches[0], str(slide_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_rasterize_pages, str(pdf_path), batch, str(slide_dir))
+                for batch in batches
+            ]
+            for future in futures:
+                future.result()
+
+    return [slide_dir / f"slide_{idx:04d}.png" for idx in range(1, page_count + 1)]
+
+
+def _pdf_to_images_pdf2image(pdf_path: Path, slide_dir: Path) -> list[Path]:
+    """pdf2image(poppler)로 PDF를 슬라이드 PNG로 변환합니다."""
+    images = convert_from_path(
+        pdf_path,
+        dpi=300,  # 해상도 설정
+        fmt="png",
+        thread_count=4,  # 병렬 처리
+        grayscale=False,  # 컬러 이미지
+        size=SLIDE_SIZE,  # 16:9 비율
+    )
+
+    # 이미지 저장
+    slides: list[Path] = []
+    for idx, image in enumerate(images, start=1):
+        out_path = slide_dir / f"slide_{idx:04d}.png"
+        image.save(out_path, "PNG")
+        slides.append(out_path)
+        print(f"슬라이드 {idx} 저장: {out_path}")
+    return slides
+
+
 def _ppt_to_images(pptx: str | Path, slide_dir: Path) -> list[Path]:
     """
     PPTX를 이미지로 변환합니다.
@@ -139,26 +253,14 @@ def _ppt_to_images(pptx: str | Path, slide_dir: Path) -> list[Path]:
 
     # PDF를 이미지로 변환
     try:
-        images = convert_from_path(
-            pdf_path,
-            dpi=300,  # 해상도 설정
-            fmt="png",
-            thread_count=4,  # 병렬 처리
-            grayscale=False,  # 컬러 이미지
-            size=(1920, 1080),  # 16:9 비율
-        )
+        if PDF_RASTERIZER == "pdf2image":
+            slides = _pdf_to_images_pdf2image(pdf_path, slide_dir)
+        else:
+            slides = _pdf_to_images_fitz(pdf_path, slide_dir)
     except Exception as e:
         print(f"PDF를 이미지로 변환하는 중 오류 발생: {str(e)}")
         raise RuntimeError(f"PDF를 이미지로 변환하는 중 오류 발생: {str(e)}")
 
-    # 이미지 저장
-    slides: list[Path] = []
-    for idx, image in enumerate(images, start=1):
-        out_path = slide_dir / f"slide_{idx:04d}.png"
-        image.save(out_path, "PNG")
-        slides.append(out_path)
-        print(f"슬라이드 {idx} 저장: {out_path}")
-
     print(f"총 {len(slides)}개의 슬라이드 생성 완료")
     return slides
 
@@ -169,69 +271,510 @@ def _slide_clip(image_path: Path, audio_path: Path) -> ImageClip:
     return clip
 
 
-def build_lecture_video(
-    pptx_file: str,
-    audio_dir: str,
-    output_path: str,
-    fps: int = 24,
-) -> None:
-    """PPTX 파일과 오디오 파일들을 합쳐서 MP4 비디오를 생성합니다.
+def _probe_duration(audio_path: Path) -> float:
+    """ffprobe로 오디오 길이(초)를 구합니다."""
+    proc = subprocess.run(
+        [
+            FFPROBE_BIN,
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            str(audio_path),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(proc.stdout.strip())
+
+
+def _probe_audio_format(audio_path: Path) -> tuple[str, str]:
+    """ffprobe로 첫 오디오 스트림의 (샘플레이트, 채널 구성)을 구합니다."""
+    proc = subprocess.run(
+        [
+            FFPROBE_BIN,
+            "-v",
+            "error",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "stream=sample_rate,channels,channel_layout",
+            "-of",
+            "default=noprint_wrappers=1",
+            str(audio_path),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    info = dict(line.split("=", 1) for line in proc.stdout.splitlines() if "=" in line)
+    layout = info.get("channel_layout", "")
+    if layout in ("", "unknown"):
+        # 채널 마스크가 없는 WAV 등: 채널 수만으로 지정 (예: "1c")
+        layout = f"{info['channels']}c"
+    return info["sample_rate"], layout
+
+
+def _concat_audio_format(first_audio: Path) -> tuple[str, str]:
+    """이어 붙일 오디오의 (샘플레이트, 채널 구성): 설정값이 없으면 첫 페이지 오디오를 따름."""
+    if VIDEO_AUDIO_SAMPLE_RATE and VIDEO_AUDIO_CHANNEL_LAYOUT:
+        return VIDEO_AUDIO_SAMPLE_RATE, VIDEO_AUDIO_CHANNEL_LAYOUT
+    sample_rate, channel_layout = _probe_audio_format(first_audio)
+    return (
+        VIDEO_AUDIO_SAMPLE_RATE or sample_rate,
+        VIDEO_AUDIO_CHANNEL_LAYOUT or channel_layout,
+    )
 
-    Args:
-        pptx_file: PPTX 파일 경로
-        audio_dir: 오디오 파일들이 있는 디렉토리
-        output_path: 출력 MP4 파일 경로
-        fps: 초당 프레임 수
+
+def _audio_duration(audio_path: Path) -> float:
+    """
+    MP3·WAV는 헤더만 읽어(디코딩·하위 프로세스 없이) 오디오 길이(초)를 구하고,
+    그 밖의 형식이나 헤더를 해석하지 못한 경우에만 ffprobe를 사용합니다.
     """
-    # 1. PPTX → 이미지 변환
-    slides_dir = Path(audio_dir).parent / "slides"
-    slides_dir.mkdir(exist_ok=True)
-    print(f"슬라이드 디렉토리 생성: {slides_dir}")
+    try:
+        return audio_duration(audio_path)
+    except Exception as e:
+        logger.warning(f"헤더로 오디오 길이를 구하지 못해 ffprobe 사용: {e}")
+        return _probe_duration(audio_path)
 
-    slides = _ppt_to_images(pptx_file, slides_dir)
-    print(f"생성된 슬라이드 수: {len(slides)}")
 
-    # 2. 오디오 파일 목록
-    audio_files = sorted(Path(audio_dir).glob("page*.mp3"))
-    print(f"찾은 오디오 파일 수: {len(audio_files)}")
-    print(f"오디오 파일 목록: {[f.name for f in audio_files]}")
+def _page_index(path: Path) -> tuple[int, str]:
+    # page2.mp3가 page10.mp3보다 앞에 오도록 파일명의 숫자로 정렬
+    match = re.search(r"(\d+)$", path.stem)
+    return (int(match.group(1)) if match else 0, path.name)
 
-    # 3. 슬라이드 수와 오디오 파일 수가 일치하는지 확인
-    if len(slides) != len(audio_files):
-        print(
-            f"경고: 슬라이드 수({len(slides)})와 오디오 파일 수({len(audio_files)})가 일치하지 않습니다."
+
+def _merge_wavs(audio_files: list[Path], out_path: Path) -> list[float]:
+    """
+    페이지별 WAV의 샘플을 디코딩 없이 이어 붙여 강의 전체 WAV 하나를 만들고,
+    샘플 수로 계산한 페이지별 길이(초)를 반환합니다.
+    헤더만 먼저 읽어 전체 길이를 정해 두므로 출력 파일을 다시 고쳐 쓰지 않습니다.
+    """
+    headers = []
+    for path in audio_files:
+        with wave.open(str(path), "rb") as wav:
+            headers.append(wav.getparams())
+    first = headers[0]
+    for path, params in zip(audio_files, headers):
+        if params[:3] != first[:3]:  # (채널 수, 샘플 폭, 샘플레이트)
+            raise ValueError(
+                f"WAV 형식이 다릅니다: {path.name} {params[:3]} != {first[:3]}"
+            )
+
+    with wave.open(str(out_path), "wb") as out:
+        out.setparams(first)
+        out.setnframes(sum(params.nframes for params in headers))
+        for path in audio_files:
+            with wave.open(str(path), "rb") as wav:
+                while True:
+                    data = wav.readframes(1 << 16)
+                    if not data:
+                        break
+                    out.writeframes(data)
+    return [params.nframes / params.framerate for params in headers]
+
+
+def _is_pcm(audio_files: list[Path]) -> bool:
+    return bool(audio_files) and audio_files[0].suffix.lower() == ".wav"
+
+
+def _concat_list_line(path: Path) -> str:
+    # concat demuxer 목록 파일 형식: 작은따옴표는 '\'' 로 이스케이프
+    escaped = str(path.resolve()).replace("'", "'\\''")
+    return f"file '{escaped}'"
+
+
+# 모든 렌더러·세그먼트가 공유하는 영상 인코딩 파라미터
+# (세그먼트끼리 코덱 설정이 같아야 재인코딩 없이 이어 붙일 수 있음)
+_VIDEO_FILTER = (
+    "scale=1920:1080:force_original_aspect_ratio=decrease,"
+    "pad=1920:1080:(ow-iw)/2:(oh-ih)/2:color=white,format=yuv420p"
+)
+
+
+def _video_codec_args() -> list[str]:
+    return [
+        "-vf",
+        _VIDEO_FILTER,
+        "-r",
+        f"{VIDEO_STILL_FPS:g}",
+        "-c:v",
+        "libx264",
+        "-tune",
+        "stillimage",
+        "-preset",
+        "veryfast",
+        "-profile:v",
+        "high",
+        # B프레임을 쓰지 않아 재생 시각(pts)이 디코딩 순서와 같게 함: 세그먼트 연결·조각 MP4
+        # 에서 편집 목록 없이도 0초부터 시작 (정지 화면이라 압축률 차이는 거의 없음)
+        "-bf",
+        "0",
+        # 프레임레이트와 무관하게 10초마다 키프레임을 두어 탐색이 가능하도록 함
+        "-g",
+        str(max(int(VIDEO_STILL_FPS * 10), 1)),
+    ]
+
+
+def _audio_codec_args(pcm: bool = False) -> list[str]:
+    if pcm:
+        # MP4에는 PCM을 넣을 수 없으므로 여기서 처음이자 유일하게 인코딩
+        codec = PCM_AUDIO_CODEC if VIDEO_AUDIO_CODEC == "copy" else VIDEO_AUDIO_CODEC
+        return ["-c:a", codec, "-b:a", "192k"]
+    if VIDEO_AUDIO_CODEC == "copy":
+        return ["-c:a", "copy"]
+    return ["-c:a", VIDEO_AUDIO_CODEC, "-b:a", "192k", "-ar", "44100"]
+
+
+def _mp4_output_args(output_path: str, fragmented: bool) -> list[str]:
+    if fragmented:
+        # 조각 MP4를 pipe로 출력: 탐색이 불가능한 출력이라 ffmpeg가 앞부분을
+        # 고쳐 쓰지 않으므로, 인코딩 중인 파일을 앞에서부터 업로드할 수 있음
+        return [
+            "-f",
+            "mp4",
+            "-movflags",
+            "+frag_keyframe+empty_moov+default_base_moof",
+            "pipe:1",
+        ]
+    return ["-movflags", "+faststart", output_path]
+
+
+def _run_ffmpeg(
+    cmd: list[str], output_path: str, fragmented: bool
+) -> subprocess.CompletedProcess:
+    if not fragmented:
+        return subprocess.run(cmd, capture_output=True, text=True)
+    with open(output_path, "wb") as out:
+        return subprocess.run(cmd, stdout=out, stderr=subprocess.PIPE, text=True)
+
+
+def _render_with_ffmpeg(
+    slides: list[Path],
+    audio_files: list[Path],
+    output_path: str,
+    timeline: list[tuple[float, float]],
+    fragmented: bool = False,
+) -> list[tuple[float, float]]:
+    """
+    ffmpeg로 정지 슬라이드 영상을 직접 인코딩합니다.
+
+    슬라이드마다 프레임을 만들어 파이썬으로 넘기는 대신, concat demuxer에
+    이미지별 표시 시간(오디오 길이)을 주고 libx264 stillimage 튜닝과 낮은
+    프레임레이트로 인코딩합니다. 오디오는 가능하면 재인코딩 없이 복사합니다.
+    WAV(PCM) 오디오는 하나의 WAV로 이어 붙여 넣습니다.
+    슬라이드별 표시 시간과 챕터는 같은 타임라인에서 만듭니다.
+    fragmented면 faststart 대신 조각 MP4로 앞에서부터 순서대로 씁니다.
+    """
+    workdir = Path(output_path).parent
+    durations = [end - start for start, end in timeline]
+    pcm = _is_pcm(audio_files)
+    if pcm:
+        lecture_wav = workdir / "lecture_audio.wav"
+        _merge_wavs(audio_files, lecture_wav)
+        audio_input = ["-i", str(lecture_wav)]
+    else:
+        audio_list = workdir / "ffmpeg_audio.txt"
+        audio_list.write_text(
+            "\n".join(_concat_list_line(p) for p in audio_files) + "\n",
+            encoding="utf-8",
         )
-        print(
-            "대본 생성 시 슬라이드 수에 맞춰 오디오 파일이 생성되었는지 확인해주세요."
+        audio_input = ["-f", "concat", "-safe", "0", "-i", str(audio_list)]
+
+    slides_list = workdir / "ffmpeg_slides.txt"
+    lines = []
+    for slide_path, duration in zip(slides, durations):
+        lines.append(_concat_list_line(slide_path))
+        lines.append(f"duration {duration:.3f}")
+    # 마지막 이미지의 duration이 적용되려면 한 번 더 나열해야 함
+    lines.append(_concat_list_line(slides[-1]))
+    slides_list.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    chapters = write_ffmetadata_chapters(timeline, workdir / "ffmpeg_chapters.txt")
+
+    cmd = [
+        FFMPEG_BIN,
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(slides_list),
+        *audio_input,
+        "-f",
+        "ffmetadata",
+        "-i",
+        str(chapters),
+        "-map",
+        "0:v",
+        "-map",
+        "1:a",
+        "-map_chapters",
+        "2",
+        *_video_codec_args(),
+        *_audio_codec_args(pcm),
+        "-shortest",
+        *_mp4_output_args(output_path, fragmented),
+    ]
+    print(f"ffmpeg 렌더링 시작: 슬라이드 {len(slides)}장, 총 {sum(durations):.1f}초")
+    proc = _run_ffmpeg(cmd, output_path, fragmented)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg 렌더링 실패 (코드: {proc.returncode}): {proc.stderr}")
+    return timeline
+
+
+def _encode_segment(slide_path: Path, segment_path: Path, frames: int) -> Path:
+    """
+    슬라이드 한 장을 정확히 frames 프레임짜리 영상 전용 세그먼트 MP4로 만듭니다.
+    세그먼트 길이가 프레임 격자에 맞춰지므로 이어 붙여도 어긋남이 쌓이지 않습니다.
+    스레드 풀에서 ffmpeg 프로세스를 띄우며, 코어 분배는 풀 크기로 하므로
+    ffmpeg는 스레드 1개만 씁니다.
+    """
+    cmd = [
+        FFMPEG_BIN,
+        "-y",
+        "-loglevel",
+        "error",
+        "-loop",
+        "1",
+        "-framerate",
+        f"{VIDEO_STILL_FPS:g}",
+        "-i",
+        str(slide_path),
+        "-frames:v",
+        str(frames),
+        "-an",
+        *_video_codec_args(),
+        "-threads",
+        "1",
+        str(segment_path),
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"세그먼트 인코딩 실패 ({slide_path.name}, 코드: {proc.returncode}): {proc.stderr}"
         )
-        raise ValueError(
-            f"슬라이드 수({len(slides)})와 오디오 파일 수({len(audio_files)})가 일치하지 않습니다."
+    return segment_path
+
+
+def _frame_aligned(durations: list[float]) -> list[int]:
+    """오디오 길이를 덮는 최소 프레임 수 (오디오는 자르지 않고 뒤에 무음을 붙임)."""
+    return [max(1, math.ceil(d * VIDEO_STILL_FPS - 1e-6)) for d in durations]
+
+
+def _padded_audio_filter(
+    frame_counts: list[int], sample_rate: str, channel_layout: str
+) -> str:
+    """
+    페이지 오디오마다 무음을 붙여 세그먼트 길이에 정확히 맞춘 뒤 하나로 이어 붙이는
+    filter_complex. 오디오는 디코딩된 PCM 상태로 이어 붙여 마지막에 한 번만 인코딩합니다.
+    concat 필터는 입력 형식이 같아야 하므로 모두 sample_rate·channel_layout으로 맞춥니다.
+    """
+    parts = []
+    for idx, frames in enumerate(frame_counts):
+        seconds = frames / VIDEO_STILL_FPS
+        parts.append(
+            f"[{idx + 1}:a]aformat=sample_rates={sample_rate}:"
+            f"channel_layouts={channel_layout},"
+            f"apad,atrim=end={seconds:.6f},asetpts=N/SR/TB[a{idx}]"
         )
+    labels = "".join(f"[a{idx}]" for idx in range(len(frame_counts)))
+    parts.append(f"{labels}concat=n={len(frame_counts)}:v=0:a=1[aout]")
+    return ";".join(parts)
+
+
+def _render_with_ffmpeg_segments(
+    slides: list[Path],
+    audio_files: list[Path],
+    output_path: str,
+    timeline: list[tuple[float, float]],
+    fragmented: bool = False,
+    max_workers: int = VIDEO_SEGMENT_WORKERS,
+) -> list[tuple[float, float]]:
+    """
+    슬라이드별 영상 세그먼트를 스레드 풀에서 병렬 인코딩한 뒤, concat demuxer로
+    재인코딩 없이(-c:v copy) 이어 붙이고 오디오를 한 번만 인코딩해 넣습니다.
 
-    # 4. 각 슬라이드에 오디오 추가
+    세그먼트 길이는 오디오 길이를 프레임 격자로 올림한 값이고, 오디오에도 같은
+    길이가 되도록 무음을 붙이므로 슬라이드와 오디오가 슬라이드마다 정확히 맞습니다.
+    실제 세그먼트 길이로 만든 타임라인(챕터에도 사용)을 반환합니다.
+    """
+    frame_counts = _frame_aligned([end - start for start, end in timeline])
+    timeline = plan_timeline([frames / VIDEO_STILL_FPS for frames in frame_counts])
+
+    segment_dir = Path(output_path).parent / "segments"
+    segment_dir.mkdir(parents=True, exist_ok=True)
+    segment_paths = [
+        segment_dir / f"segment_{idx:04d}.mp4" for idx in range(1, len(slides) + 1)
+    ]
+
+    print(f"세그먼트 병렬 인코딩 시작: {len(slides)}개 (워커 {max_workers}개)")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(_encode_segment, slides, segment_paths, frame_counts))
+
+    segments_list = segment_dir / "segments.txt"
+    segments_list.write_text(
+        "\n".join(_concat_list_line(p) for p in segment_paths) + "\n",
+        encoding="utf-8",
+    )
+    chapters = write_ffmetadata_chapters(timeline, segment_dir / "chapters.txt")
+    audio_inputs = []
+    for audio_path in audio_files:
+        audio_inputs += ["-i", str(audio_path)]
+    cmd = [
+        FFMPEG_BIN,
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(segments_list),
+        *audio_inputs,
+        "-f",
+        "ffmetadata",
+        "-i",
+        str(chapters),
+        "-filter_complex",
+        _padded_audio_filter(frame_counts, *_concat_audio_format(audio_files[0])),
+        "-map",
+        "0:v",
+        "-map",
+        "[aout]",
+        "-map_chapters",
+        str(len(audio_files) + 1),
+        "-c:v",
+        "copy",
+        # 필터를 거친 PCM이므로 복사할 수 없고 여기서 한 번만 인코딩
+        *_audio_codec_args(pcm=True),
+        *_mp4_output_args(output_path, fragmented),
+    ]
+    proc = _run_ffmpeg(cmd, output_path, fragmented)
+    if proc.returncode != 0:
+        raise RuntimeError(f"세그먼트 연결 실패 (코드: {proc.returncode}): {proc.stderr}")
+    shutil.rmtree(segment_dir, ignore_errors=True)
+    return timeline
+
+
+def _render_with_moviepy(
+    slides: list[Path],
+    audio_files: list[Path],
+    output_path: str,
+    fps: int,
+    timeline: list[tuple[float, float]],
+) -> None:
+    """moviepy로 슬라이드 클립을 이어 붙여 MP4를 만듭니다."""
+    # 각 슬라이드에 오디오 추가
     clips = []
-    for slide_path, audio_path in zip(slides, audio_files):
+    for slide_path, audio_path, (start, end) in zip(slides, audio_files, timeline):
         # 슬라이드 이미지 로드
         slide = ImageClip(str(slide_path))
 
         # 오디오 로드
         audio = AudioFileClip(str(audio_path))
 
-        # 슬라이드 지속 시간을 오디오 길이에 맞춤
-        slide = slide.set_duration(audio.duration)
+        # 슬라이드 지속 시간을 타임라인(오디오 길이)에 맞춤
+        slide = slide.set_duration(end - start)
 
         # 오디오 추가
         slide = slide.set_audio(audio)
 
         clips.append(slide)
 
-    # 5. 모든 클립 연결
+    # 모든 클립 연결
     final_clip = concatenate_videoclips(clips)
 
-    # 6. MP4로 저장
+    # MP4로 저장
     final_clip.write_videofile(
         output_path,
         fps=fps,
         codec="libx264",
         audio_codec="aac",
     )
+
+
+def build_lecture_video(
+    pptx_file: str,
+    audio_dir: str,
+    output_path: str,
+    fps: int = 24,
+    slides: list[Path] | None = None,
+    renderer: str = VIDEO_RENDERER,
+    fragmented: bool = False,
+) -> list[tuple[float, float]]:
+    """PPTX 파일과 오디오 파일들을 합쳐서 MP4 비디오를 생성합니다.
+
+    Args:
+        pptx_file: PPTX 파일 경로
+        audio_dir: 오디오 파일들이 있는 디렉토리
+        output_path: 출력 MP4 파일 경로
+        fps: 초당 프레임 수 (moviepy 렌더러용)
+        slides: 미리 렌더링된 슬라이드 이미지 목록 (없으면 PPTX에서 변환)
+        renderer: "ffmpeg", "ffmpeg_segments" 또는 "moviepy"
+            (ffmpeg 계열 실패 시 moviepy로 대체)
+        fragmented: ffmpeg 계열 렌더러에서 faststart 대신 조각 MP4(fMP4)로
+            앞에서부터 순서대로 기록 (인코딩 중 업로드용)
+
+    Returns:
+        슬라이드별 (시작, 끝) 초 목록. 영상 인코딩·챕터에 쓴 것과 같은 타임라인입니다.
+    """
+    # 1. PPTX → 이미지 변환 (미리 렌더링된 경우 생략)
+    if slides is None:
+        slides_dir = Path(audio_dir).parent / "slides"
+        slides_dir.mkdir(exist_ok=True)
+        print(f"슬라이드 디렉토리 생성: {slides_dir}")
+
+        slides = _ppt_to_images(pptx_file, slides_dir)
+    print(f"생성된 슬라이드 수: {len(slides)}")
+
+    # 2. 오디오 파일 목록 (PCM 모드면 WAV, 아니면 MP3)
+    audio_dir = Path(audio_dir)
+    audio_files = sorted(audio_dir.glob("page*.wav"), key=_page_index) or sorted(
+        audio_dir.glob("page*.mp3"), key=_page_index
+    )
+    print(f"찾은 오디오 파일 수: {len(audio_files)}")
+    print(f"오디오 파일 목록: {[f.name for f in audio_files]}")
+
+    # 3. 슬라이드 수와 오디오 파일 수가 일치하는지 확인
+    if len(slides) != len(audio_files):
+        print(
+            f"경고: 슬라이드 수({len(slides)})와 오디오 파일 수({len(audio_files)})가 일치하지 않습니다."
+        )
+        print(
+            "대본 생성 시 슬라이드 수에 맞춰 오디오 파일이 생성되었는지 확인해주세요."
+        )
+        raise ValueError(
+            f"슬라이드 수({len(slides)})와 오디오 파일 수({len(audio_files)})가 일치하지 않습니다."
+        )
+
+    # 4. 타임라인 계획 (헤더만 읽어 슬라이드별 시작·끝 계산)
+    timeline = plan_timeline([_audio_duration(path) for path in audio_files])
+    total = timeline[-1][1] if timeline else 0.0
+    print(f"타임라인: 슬라이드 {len(timeline)}장, 총 {total:.1f}초")
+
+    # 5. 영상 렌더링
+    ffmpeg_renderers = {
+        "ffmpeg": _render_with_ffmpeg,
+        "ffmpeg_segments": _render_with_ffmpeg_segments,
+    }
+    if renderer in ffmpeg_renderers:
+        if shutil.which(FFMPEG_BIN):
+            try:
+                # 렌더러가 프레임 격자에 맞춘 실제 타임라인을 돌려줌
+                return ffmpeg_renderers[renderer](
+                    slides, audio_files, output_path, timeline, fragmented
+                )
+            except Exception as e:
+                logger.warning(f"{renderer} 렌더링 실패, moviepy로 대체합니다: {e}")
+        else:
+            logger.warning("ffmpeg를 찾을 수 없어 moviepy로 렌더링합니다.")
+
+    _render_with_moviepy(slides, audio_files, output_path, fps, timeline)
+    return timeline
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_key(*parts) -> str:
+    """임의의 JSON 직렬화 가능한 값들로 SHA-256 캐시 키를 만듭니다."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    내용 주소(content-addressed) 방식의 디스크 캐시.
+
+    키(해시)마다 파일 하나로 저장하고, 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용되지 않은(atime 기준) 파일부터 지웁니다.
+    적중 시 atime을 갱신하므로 LRU로 동작합니다.
+    ttl(초)이 주어지면 저장 시각(mtime)으로부터 ttl이 지난 항목은 미스로 취급합니다.
+    """
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int, ttl: Optional[float] = None
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """캐시된 바이트를 반환합니다. 없으면 None."""
+        path = self._path(key)
+        now = time.time()
+        try:
+            stat = path.stat()
+            if self.ttl is not None and now - stat.st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                raise FileNotFoundError(path)
+            data = path.read_bytes()
+            # 저장 시각(mtime)은 유지하고 마지막 사용 시각(atime)만 갱신
+            os.utime(path, (now, stat.st_mtime))
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        """바이트를 저장하고 용량을 넘으면 오래된 항목을 정리합니다."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 같은 키를 동시에 쓰는 경우를 대비해 임시 파일에 쓴 뒤 교체
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"캐시 저장 실패 ({path}): {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[Path]:
+        return [p for p in self.directory.glob("*/*") if not p.name.endswith(".tmp")]
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        """전체 크기가 max_bytes의 90% 이하가 될 때까지 오래된 항목부터 삭제합니다."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._total_bytes = total
+        if removed:
+            logger.info(f"캐시 정리: {removed}개 항목 삭제 ({self.directory})")
+
+    def stats(self) -> dict:
+        """적중/미스 횟수와 적중률을 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,215 @@
+import logging
+import os
+import shutil
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Lecture, LectureJob
+from .s3_upload import GrowingFileUpload, upload_file_to_s3
+from .utils import generate_lecture_video
+
+logger = logging.getLogger(__name__)
+
+
+def save_upload(pdf_file) -> str:
+    """
+    업로드된 PDF를 작업 큐용 디렉터리에 저장하고 경로를 반환합니다.
+    워커 프로세스가 읽을 수 있도록 요청 임시 디렉터리가 아닌 공유 경로를 사용합니다.
+    디스크 임시 파일로 받은 큰 업로드는 복사하지 않고 이동합니다
+    (FILE_UPLOAD_TEMP_DIR이 같은 파일 시스템이면 rename).
+    """
+    upload_dir = settings.LECTURE_UPLOAD_DIR
+    os.makedirs(upload_dir, exist_ok=True)
+
+    pdf_path = os.path.join(upload_dir, f"{uuid.uuid4().hex}.pdf")
+    if hasattr(pdf_file, "temporary_file_path"):
+        file_move_safe(pdf_file.temporary_file_path(), pdf_path)
+    else:
+        with open(pdf_path, "wb") as f:
+            for chunk in pdf_file.chunks():
+                f.write(chunk)
+    return pdf_path
+
+
+def enqueue_lecture_job(
+    subject: str, description: str, professor: str, pdf_file
+) -> LectureJob:
+    """PDF를 저장하고 대기 상태의 강의 생성 작업을 만듭니다."""
+    pdf_path = save_upload(pdf_file)
+    job = LectureJob.objects.create(
+        subject=subject,
+        description=description,
+        professor=professor,
+        pdf_path=pdf_path,
+    )
+    logger.info(
+        f"강의 생성 작업 등록: job={job.id}, pdf={pdf_path}, "
+        f"{getattr(pdf_file, 'page_count', '?')}페이지"
+    )
+    return job
+
+
+def claim_next_job() -> LectureJob | None:
+    """
+    가장 오래된 대기 작업 하나를 진행 중 상태로 바꾸고 반환합니다.
+    상태 조건부 UPDATE로 선점하므로 워커 여러 개가 같은 작업을 잡지 않습니다.
+    """
+    for job in LectureJob.objects.filter(status=LectureJob.STATUS_PENDING).order_by(
+        "created_at"
+    )[:10]:
+        now = timezone.now()
+        claimed = LectureJob.objects.filter(
+            id=job.id, status=LectureJob.STATUS_PENDING
+        ).update(
+            status=LectureJob.STATUS_RUNNING,
+            stage="queued",
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def reclaim_stale_jobs() -> int:
+    """
+    생존 신호가 LECTURE_JOB_STALE_SECONDS 넘게 끊긴 진행 중 작업(워커가 죽거나
+    강제 종료된 작업)을 다시 대기열에 넣습니다. 이미 LECTURE_JOB_MAX_ATTEMPTS번
+    실행했거나 PDF가 없으면 실패로 처리하고 PDF를 지웁니다. 회수한 작업 수를 반환합니다.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.LECTURE_JOB_STALE_SECONDS)
+    stale = LectureJob.objects.filter(status=LectureJob.STATUS_RUNNING).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, updated_at__lt=cutoff)
+    )
+    reclaimed = 0
+    for job in stale:
+        retry = job.attempts < settings.LECTURE_JOB_MAX_ATTEMPTS and os.path.exists(
+            job.pdf_path
+        )
+        if retry:
+            update = {"status": LectureJob.STATUS_PENDING, "stage": ""}
+        else:
+            update = {
+                "status": LectureJob.STATUS_FAILED,
+                "error": f"워커가 응답 없이 중단됨 (실행 {job.attempts}회)",
+            }
+        # 그사이 다른 워커가 신호를 보냈으면 건드리지 않음
+        updated = LectureJob.objects.filter(
+            id=job.id,
+            status=LectureJob.STATUS_RUNNING,
+            heartbeat_at=job.heartbeat_at,
+        ).update(**update)
+        if not updated:
+            continue
+        reclaimed += 1
+        if retry:
+            logger.warning(f"중단된 작업 {job.id}: 다시 대기열에 넣습니다.")
+        else:
+            logger.error(f"중단된 작업 {job.id}: 실패 처리합니다.")
+            if os.path.exists(job.pdf_path):
+                os.remove(job.pdf_path)
+    return reclaimed
+
+
+def _set_stage(job: LectureJob, stage: str) -> None:
+    LectureJob.objects.filter(id=job.id).update(
+        stage=stage, heartbeat_at=timezone.now()
+    )
+    logger.info(f"작업 {job.id} 단계: {stage}")
+
+
+def _heartbeat(job: LectureJob, stop: threading.Event) -> None:
+    """작업이 끝날 때까지 LECTURE_JOB_HEARTBEAT_INTERVAL마다 생존 신호를 기록합니다."""
+    try:
+        while not stop.wait(settings.LECTURE_JOB_HEARTBEAT_INTERVAL):
+            LectureJob.objects.filter(
+                id=job.id, status=LectureJob.STATUS_RUNNING
+            ).update(heartbeat_at=timezone.now())
+    finally:
+        connection.close()  # 이 스레드의 DB 연결 정리
+
+
+def _upload_progress(job: LectureJob):
+    """업로드 진행률을 10% 단위로 작업 단계("upload 40%")에 기록하는 콜백을 만듭니다."""
+    last = -1
+
+    def progress(uploaded: int, total: int) -> None:
+        nonlocal last
+        percent = uploaded * 100 // total // 10 * 10 if total else 0
+        if percent > last:
+            last = percent
+            _set_stage(job, f"upload {percent}%")
+
+    return progress
+
+
+def run_lecture_job(job: LectureJob) -> None:
+    """
+    작업 하나를 끝까지 실행합니다: 영상 생성 → S3 업로드 → Lecture 생성.
+    Lecture 객체는 영상이 준비된 뒤에만 만들어집니다.
+    S3_UPLOAD_WHILE_ENCODING이면 인코딩이 시작될 때 업로드도 시작합니다.
+    """
+    video_path = None
+    uploader = None
+    stop_heartbeat = threading.Event()
+    threading.Thread(
+        target=_heartbeat, args=(job, stop_heartbeat), name="job-heartbeat", daemon=True
+    ).start()
+
+    def start_upload(path: str) -> None:
+        nonlocal uploader
+        uploader = GrowingFileUpload(
+            path, os.path.basename(path), progress=_upload_progress(job)
+        ).start()
+
+    try:
+        video_path = generate_lecture_video(
+            subject=job.subject,
+            description=job.description,
+            professor=job.professor,
+            pdf_path=job.pdf_path,
+            on_stage=lambda stage: _set_stage(job, stage),
+            on_video_start=start_upload if settings.S3_UPLOAD_WHILE_ENCODING else None,
+        )
+
+        _set_stage(job, "upload")
+        if uploader is not None:
+            video_url = uploader.finish()
+        else:
+            video_url = upload_file_to_s3(
+                video_path, os.path.basename(video_path), _upload_progress(job)
+            )
+
+        with transaction.atomic():
+            lecture = Lecture.objects.create(
+                title=job.subject,
+                professor=job.professor,
+                video_url=video_url,
+            )
+            LectureJob.objects.filter(id=job.id).update(
+                status=LectureJob.STATUS_DONE, stage="done", lecture=lecture
+            )
+        logger.info(f"작업 {job.id} 완료: lecture={lecture.id}")
+    except Exception as e:
+        if uploader is not None:
+            uploader.abort()
+        logger.error(f"작업 {job.id} 실패: {str(e)}", exc_info=True)
+        LectureJob.objects.filter(id=job.id).update(
+            status=LectureJob.STATUS_FAILED, error=str(e)
+        )
+    finally:
+        stop_heartbeat.set()
+        # 영상 임시 디렉터리와 업로드 PDF 정리
+        if video_path:
+            shutil.rmtree(os.path.dirname(video_path), ignore_errors=True)
+        if os.path.exists(job.pdf_path):
+            os.remove(job.pdf_path)
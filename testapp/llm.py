@@ -0,0 +1,253 @@
+import logging
+import os
+import threading
+import time
+from typing import Iterator, Optional
+
+import httpx
+import openai
+
+from .disk_cache import DiskCache, make_key
+from .retry import retry_with_backoff
+
+logger = logging.getLogger(__name__)
+
+# ────────────────────────── #
+# 1. 환경 설정
+# ────────────────────────── #
+API_KEY = os.getenv("OPENAI_API_KEY", "YOUR_FALLBACK_API_KEY")
+# 테스트에서 로컬 대체 서버로 바꿀 수 있도록 base URL 설정 가능 (None이면 OpenAI 기본값)
+LLM_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 180))  # 초, 호출별로 덮어쓸 수 있음
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 1.0))  # 초
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 4))  # 모델별 동시 요청 수
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+
+# 동일 프롬프트 응답 캐시 (기본 비활성화, LLM_CACHE_ENABLED=true로 사용)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_DIR = os.getenv(
+    "LLM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "llm")
+)
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 60 * 60))  # 초
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+llm_cache = DiskCache(LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL)
+
+_clients: dict[tuple[str, Optional[str]], openai.OpenAI] = {}
+_clients_lock = threading.Lock()
+_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_semaphores_lock = threading.Lock()
+
+
+# ────────────────────────── #
+# 2. 프로세스 공용 클라이언트
+# ────────────────────────── #
+def get_client(api_key: str = API_KEY, base_url: Optional[str] = None) -> openai.OpenAI:
+    """
+    (api_key, base_url)마다 하나씩 만든 OpenAI 클라이언트를 재사용합니다.
+    keep-alive 연결 풀을 프로세스 전체가 공유하므로 호출마다 TLS 연결을 새로 맺지 않습니다.
+    재시도는 chat_completion에서 직접 처리하므로 SDK 자체 재시도는 끕니다.
+    """
+    base_url = base_url or LLM_BASE_URL
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                ),
+                timeout=LLM_TIMEOUT,
+            )
+            client = openai.OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                max_retries=0,
+                timeout=LLM_TIMEOUT,
+                http_client=http_client,
+            )
+            _clients[key] = client
+            logger.info(f"OpenAI 클라이언트 생성 (base_url: {base_url or '기본값'})")
+        return client
+
+
+def _semaphore(model: str) -> threading.BoundedSemaphore:
+    """모델별 동시 요청 수를 제한하는 세마포어를 반환합니다."""
+    with _semaphores_lock:
+        sem = _semaphores.get(model)
+        if sem is None:
+            sem = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+            _semaphores[model] = sem
+        return sem
+
+
+# ────────────────────────── #
+# 3. 재시도
+# ────────────────────────── #
+def _is_retryable(exc: Exception) -> bool:
+    """요청 과다(429)·서버 오류(5xx)·타임아웃·연결 오류면 재시도 대상입니다."""
+    if isinstance(
+        exc,
+        (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError),
+    ):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code >= 500
+    return False
+
+
+def call_with_retries(func, *, model: str, max_retries: int = LLM_MAX_RETRIES):
+    """
+    모델별 동시성 제한 안에서 func()를 실행하고,
+    재시도 대상 오류는 지수 백오프(+지터)로 재시도합니다.
+    """
+
+    def attempt():
+        with _semaphore(model):
+            return func()
+
+    return retry_with_backoff(
+        attempt,
+        retryable=_is_retryable,
+        max_retries=max_retries,
+        backoff_base=LLM_BACKOFF_BASE,
+        label="LLM 요청",
+    )
+
+
+# ────────────────────────── #
+# 4. Chat Completions
+# ────────────────────────── #
+def _usage_summary(usage) -> str:
+    """응답의 usage를 "입력 N / 출력 M 토큰" 형태로 요약합니다."""
+    if usage is None:
+        return "토큰 사용량 없음"
+    return f"입력 {usage.prompt_tokens} / 출력 {usage.completion_tokens} 토큰"
+
+
+def chat_completion(
+    client: Optional[openai.OpenAI],
+    model: str,
+    messages: list[dict],
+    temperature: float,
+    use_cache: bool = True,
+    timeout: Optional[float] = None,
+    response_format: Optional[dict] = None,
+) -> Optional[str]:
+    """
+    Chat Completions를 호출하고 응답 본문(content)을 반환합니다.
+
+    client가 None이면 공용 클라이언트를 사용합니다. 요청은 모델별 동시성 제한과
+    재시도를 거치며, timeout으로 호출별 제한 시간을 지정할 수 있습니다.
+    response_format(예: {"type": "json_object"})은 그대로 API에 전달됩니다.
+
+    LLM_CACHE_ENABLED일 때는 (model, temperature, messages) 해시로 응답을 캐시하여,
+    같은 프롬프트를 다시 보내면(예: 이후 단계 실패 후 재시도) API를 호출하지 않습니다.
+    use_cache=False로 호출부에서 캐시를 건너뛸 수 있습니다.
+    """
+    cache_on = LLM_CACHE_ENABLED and use_cache
+    key = make_key(model, temperature, messages, response_format) if cache_on else None
+    if cache_on:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            logger.info(f"LLM 응답 캐시 적중 (모델: {model}, {llm_cache.stats()})")
+            return cached.decode("utf-8")
+
+    client = client or get_client()
+    extra = {"response_format": response_format} if response_format else {}
+    started = time.monotonic()
+    response = call_with_retries(
+        lambda: client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            timeout=timeout or LLM_TIMEOUT,
+            **extra,
+        ),
+        model=model,
+    )
+    logger.info(
+        f"LLM 응답 수신 (모델: {model}, {time.monotonic() - started:.1f}초, "
+        f"{_usage_summary(response.usage)})"
+    )
+    content = response.choices[0].message.content
+
+    if cache_on and content:
+        llm_cache.set(key, content.encode("utf-8"))
+    return content
+
+
+def chat_completion_stream(
+    client: Optional[openai.OpenAI],
+    model: str,
+    messages: list[dict],
+    temperature: float,
+    use_cache: bool = True,
+    timeout: Optional[float] = None,
+) -> Iterator[str]:
+    """
+    Chat Completions를 stream=True로 호출하고 텍스트 조각을 도착하는 대로 내보냅니다.
+
+    연결·첫 응답까지는 chat_completion과 같은 재시도를 거치고, 스트림을 읽는 동안
+    모델별 동시성 슬롯을 점유합니다. 캐시 적중 시에는 전체 응답을 한 번에 내보내고,
+    스트림이 끝까지 도착하면 전체 응답을 캐시에 저장합니다.
+    """
+    cache_on = LLM_CACHE_ENABLED and use_cache
+    key = make_key(model, temperature, messages, None) if cache_on else None
+    if cache_on:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            logger.info(f"LLM 응답 캐시 적중 (모델: {model}, {llm_cache.stats()})")
+            yield cached.decode("utf-8")
+            return
+
+    client = client or get_client()
+    sem = _semaphore(model)
+    started = time.monotonic()
+    parts: list[str] = []
+    usage = None
+
+    def open_stream():
+        # 스트림을 다 읽을 때까지 동시성 슬롯을 점유하므로 실패했을 때만 바로 반환
+        sem.acquire()
+        try:
+            return client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                timeout=timeout or LLM_TIMEOUT,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+        except Exception:
+            sem.release()
+            raise
+
+    stream = retry_with_backoff(
+        open_stream,
+        retryable=_is_retryable,
+        max_retries=LLM_MAX_RETRIES,
+        backoff_base=LLM_BACKOFF_BASE,
+        label="LLM 스트림 요청",
+    )
+    try:
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage  # 마지막 청크에만 포함됨
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    finally:
+        sem.release()
+
+    logger.info(
+        f"LLM 스트림 완료 (모델: {model}, {time.monotonic() - started:.1f}초, "
+        f"{_usage_summary(usage)})"
+    )
+    if cache_on and parts:
+        llm_cache.set(key, "".join(parts).encode("utf-8"))
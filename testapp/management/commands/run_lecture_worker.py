@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from testapp.create_ppt import SOFFICE_POOL_ENABLED
+from testapp.jobs import claim_next_job, reclaim_stale_jobs, run_lecture_job
+from testapp.soffice_pool import get_soffice_pool
+
+
+class Command(BaseCommand):
+    help = "대기 중인 강의 생성 작업을 가져와 순서대로 실행하는 워커 프로세스"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="대기 작업을 모두 처리한 뒤 종료합니다.",
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = settings.LECTURE_WORKER_POLL_INTERVAL
+        self.stdout.write("강의 생성 워커 시작")
+        if SOFFICE_POOL_ENABLED:
+            # 첫 작업이 LibreOffice 기동을 기다리지 않도록 풀을 미리 띄움
+            get_soffice_pool().warm()
+
+        while True:
+            # 죽은 워커가 남긴 진행 중 작업은 매 폴링마다 회수
+            reclaimed = reclaim_stale_jobs()
+            if reclaimed:
+                self.stdout.write(f"중단된 작업 {reclaimed}개 회수")
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f"작업 {job.id} 실행: {job.subject}")
+            run_lecture_job(job)
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from testapp.voice import TTS_MAX_CHARS, chunk_text, split_pages
+
+
+def _line_chunks(text: str) -> list[str]:
+    """이전 방식: 비어 있지 않은 줄마다 요청 하나 (비교 기준)."""
+    return [line for line in text.splitlines() if line.strip()]
+
+
+class Command(BaseCommand):
+    help = "대본 파일별 TTS 요청 수를 줄 단위(이전)와 문장 묶음(현재) 방식으로 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("scripts", nargs="+", help="'=== Page N ===' 형식 대본 파일")
+        parser.add_argument("--max-chars", type=int, default=TTS_MAX_CHARS)
+
+    def handle(self, *args, **options):
+        max_chars = options["max_chars"]
+        total_before = total_after = 0
+
+        for script in options["scripts"]:
+            pages = split_pages(Path(script).read_text(encoding="utf-8"))
+            before = sum(len(_line_chunks(page)) for page in pages)
+            after = sum(len(list(chunk_text(page, max_chars))) for page in pages)
+            total_before += before
+            total_after += after
+            self.stdout.write(
+                f"{script}: {len(pages)}페이지, 요청 수 {before} → {after} "
+                f"(페이지당 {before / max(len(pages), 1):.1f} → "
+                f"{after / max(len(pages), 1):.1f})"
+            )
+
+        if total_before:
+            self.stdout.write(
+                f"합계: 요청 수 {total_before} → {total_after} "
+                f"({(1 - total_after / total_before) * 100:.0f}% 감소)"
+            )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from testapp.voice import (
+    DEFAULT_VOICE_KEY,
+    TTS_BACKEND,
+    TTS_BACKENDS,
+    TTS_MAX_WORKERS,
+    VOICE_MAP,
+    tts_pages_to_mp3,
+)
+
+
+class Command(BaseCommand):
+    help = "'=== Page N ===' 형식 대본 파일을 페이지별 오디오 파일로 합성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--txt", default="./dataset/txt/script_text_page.txt")
+        parser.add_argument("--out", default="./dataset/mp3")
+        parser.add_argument(
+            "--voice", default=DEFAULT_VOICE_KEY, choices=list(VOICE_MAP.keys())
+        )
+        parser.add_argument("--workers", type=int, default=TTS_MAX_WORKERS)
+        parser.add_argument(
+            "--backend", default=TTS_BACKEND, choices=list(TTS_BACKENDS)
+        )
+
+    def handle(self, *args, **options):
+        tts_pages_to_mp3(
+            options["txt"],
+            options["out"],
+            voice_key=options["voice"],
+            base_name="el_output_voice",
+            max_workers=options["workers"],
+            backend=options["backend"],
+        )
@@ -0,0 +1,155 @@
+import base64
+import json
+import re
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+# MPEG-1 Layer III 비트레이트(kbps)·샘플레이트 인덱스 (무음 프레임 생성용)
+_MP3_BITRATES = [32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+_MP3_RATES = {44100: 0, 48000: 1, 32000: 2}
+_PATH = re.compile(r"^/v1/text-to-speech/(?P<voice_id>[^/]+)/stream-input")
+
+
+def _silence(output_format: str, seconds: float) -> bytes:
+    """output_format("mp3_44100_128", "pcm_24000" 등)에 맞는 무음 오디오를 만듭니다."""
+    parts = output_format.split("_")
+    if parts[0] == "pcm":
+        return bytes(int(int(parts[1]) * seconds) * 2)  # 16비트 모노
+    rate, kbps = int(parts[1]), int(parts[2])
+    if parts[0] != "mp3" or rate not in _MP3_RATES or kbps not in _MP3_BITRATES:
+        raise ValueError(f"대역 서버가 지원하지 않는 출력 형식입니다: {output_format}")
+    # 모노 CBR 프레임 헤더 + 0으로 채운 본문 (디코더는 무음으로 재생)
+    header = bytes(
+        [
+            0xFF,
+            0xFB,
+            (_MP3_BITRATES.index(kbps) + 1) << 4 | _MP3_RATES[rate] << 2,
+            0xC0,
+        ]
+    )
+    frame = header + bytes(144 * kbps * 1000 // rate - 4)
+    return frame * max(1, round(seconds * rate / 1152))
+
+
+def make_handler(
+    chars_per_second: float = 12.0,
+    latency: float = 0.0,
+    frame_bytes: int = 8192,
+    drop_first: int = 0,
+    log=print,
+):
+    """
+    websockets.sync.server.serve에 넘길 연결 처리 함수를 만듭니다.
+    처음 drop_first개 연결은 오디오를 한 번 보낸 뒤 비정상 종료(1011)하여
+    클라이언트의 재시도 경로를 확인할 수 있게 합니다.
+    """
+    connections = 0
+    lock = threading.Lock()
+
+    def send_audio(ws, audio: bytes) -> None:
+        for start in range(0, len(audio), frame_bytes):
+            chunk = audio[start : start + frame_bytes]
+            ws.send(
+                json.dumps({"audio": base64.b64encode(chunk).decode(), "isFinal": None})
+            )
+
+    def handler(ws):
+        nonlocal connections
+        path = ws.request.path
+        match = _PATH.match(path)
+        if match is None:
+            ws.close(1008, "unknown path")
+            return
+        with lock:
+            connections += 1
+            drop = connections <= drop_first
+        query = dict(
+            item.split("=", 1) for item in path.partition("?")[2].split("&") if item
+        )
+        output_format = query.get("output_format", "mp3_44100_128")
+        log(f"연결: 음성 {match['voice_id']}, 형식 {output_format}")
+
+        chars = 0
+        try:
+            for raw in ws:
+                text = json.loads(raw).get("text", "")
+                if text == "":  # 입력 끝
+                    break
+                if not text.strip():  # 첫 메시지(공백 하나)
+                    continue
+                chars += len(text.strip())
+                if latency:
+                    time.sleep(latency)
+                seconds = len(text.strip()) / chars_per_second
+                send_audio(ws, _silence(output_format, seconds))
+                if drop:
+                    log("연결을 비정상 종료합니다 (재시도 확인용)")
+                    ws.close(1011, "dropped by stand-in")
+                    return
+            ws.send(json.dumps({"isFinal": True}))
+        except ValueError as e:
+            ws.send(json.dumps({"error": "invalid_request", "message": str(e)}))
+        except ConnectionClosed:
+            return
+        log(f"완료: {chars}자")
+
+    return handler
+
+
+class Command(BaseCommand):
+    help = (
+        "ElevenLabs 웹소켓 입력 스트리밍 프로토콜을 흉내 내는 로컬 대역 서버를 실행합니다. "
+        "ELEVENLABS_WS_URL=ws://HOST:PORT, TTS_TRANSPORT=websocket으로 연결하면 "
+        "네트워크 없이 스트리밍 TTS 경로를 실행해 볼 수 있습니다 (오디오는 무음)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--chars-per-second",
+            type=float,
+            default=12.0,
+            help="글자 수를 오디오 길이로 바꾸는 발화 속도",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="텍스트 조각마다 오디오를 보내기 전 기다릴 시간(초)",
+        )
+        parser.add_argument(
+            "--frame-bytes",
+            type=int,
+            default=8192,
+            help="오디오 메시지 하나의 최대 크기(바이트)",
+        )
+        parser.add_argument(
+            "--drop-first",
+            type=int,
+            default=0,
+            help="처음 N개 연결은 오디오를 조금 보낸 뒤 끊음 (재시도 확인용)",
+        )
+
+    def handle(self, *args, **options):
+        chars_per_second = options["chars_per_second"]
+        frame_bytes = options["frame_bytes"]
+        if chars_per_second <= 0 or frame_bytes <= 0:
+            raise CommandError("--chars-per-second와 --frame-bytes는 0보다 커야 합니다.")
+
+        handler = make_handler(
+            chars_per_second,
+            options["latency"],
+            frame_bytes,
+            options["drop_first"],
+            log=self.stdout.write,
+        )
+        with serve(handler, options["host"], options["port"]) as server:
+            self.stdout.write(
+                f"TTS 웹소켓 대역 서버 실행 중: ws://{options['host']}:{options['port']}"
+            )
+            server.serve_forever()
@@ -21,3 +21,43 @@ class Lecture(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class LectureJob(models.Model):
+    """
+    강의 영상 생성 작업. 업로드 요청은 이 객체만 만들고 바로 응답하며,
+    실제 생성은 별도 워커 프로세스(run_lecture_worker)가 수행한다.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "대기"),
+        (STATUS_RUNNING, "진행 중"),
+        (STATUS_DONE, "완료"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    description = models.CharField(max_length=2048)
+    professor = models.CharField(max_length=255)
+    pdf_path = models.CharField(max_length=1024)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True
+    )
+    stage = models.CharField(max_length=64, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    # 워커가 작업을 잡은 시각·마지막 생존 신호·실행 횟수 (중단된 작업 회수용)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    lecture = models.ForeignKey(
+        Lecture, null=True, blank=True, on_delete=models.SET_NULL, related_name="jobs"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
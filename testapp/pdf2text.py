@@ -1,42 +1,293 @@
 import logging
-from typing import Optional
+import os
+import re
+from typing import Iterable, Optional
 
 import fitz
 
 logger = logging.getLogger(__name__)
 
+# 추출 방식: "plain"(page.get_text() 그대로, 기존 동작) 또는
+# "layout"(블록·스팬 기반 압축 추출, 명시적으로 켤 때만 사용)
+PDF_EXTRACT_MODE = os.getenv("PDF_EXTRACT_MODE", "plain")
+# 페이지 높이 대비 상단/하단 여백 비율 (머리글/바닥글 영역)
+EDGE_MARGIN = float(os.getenv("PDF_EDGE_MARGIN", 0.08))
 
-def extract_text_from_pdf_content(pdf_content: bytes) -> Optional[str]:
+# 페이지 구분자: "------Page N------"
+PAGE_MARKER = re.compile(r"^------Page (\d+)------\s*$", re.MULTILINE)
+PAGE_ERROR_TEXT = "[오류: 이 페이지의 텍스트를 추출할 수 없습니다.]"
+BULLET_START = re.compile(r"^(?:[•●○◦▪■□◆◇►▶‣⁃∙·※\-–*]|\d+[.)]|[a-zA-Z][.)]|[가-힣][.)])\s")
+# "3", "- 3 -", "3 / 20", "Page 3", "p. 3", "3쪽" 처럼 쪽 번호만 있는 줄
+# (머리글/바닥글 위치에서만 지움. 본문의 "2024" 같은 숫자 줄은 그대로 둠)
+PAGE_NUMBER_LINE = re.compile(
+    r"^\W*(?:page|p\.?|slide)?\s*\d{1,4}\s*(?:/\s*\d{1,4})?\s*(?:쪽|페이지)?\W*$",
+    re.IGNORECASE,
+)
+
+
+def validate_pdf(source: str | bytes) -> int:
+    """
+    PDF 헤더와 xref(문서 구조)만 확인하고 페이지 수를 반환합니다.
+    페이지 내용은 해석하지 않으므로 큰 파일도 빠르게 검사할 수 있습니다.
+
+    Args:
+        source: PDF 파일 경로 또는 PDF 내용(바이트).
+
+    Raises:
+        ValueError: PDF가 아니거나 손상되었거나 암호가 걸린 경우.
+    """
+    if isinstance(source, bytes):
+        header = source[:5]
+    else:
+        with open(source, "rb") as f:
+            header = f.read(5)
+    if header != b"%PDF-":
+        raise ValueError("PDF 헤더가 없습니다.")
+
+    try:
+        if isinstance(source, bytes):
+            doc = fitz.open(stream=source, filetype="pdf")
+        else:
+            doc = fitz.open(source, filetype="pdf")
+    except Exception as e:
+        raise ValueError(f"PDF를 열 수 없습니다: {e}")
+    try:
+        if doc.needs_pass:
+            raise ValueError("암호가 걸린 PDF입니다.")
+        if doc.page_count < 1:
+            raise ValueError("페이지가 없는 PDF입니다.")
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def extract_text_from_pdf_path(
+    pdf_path: str, mode: str = PDF_EXTRACT_MODE
+) -> Optional[str]:
+    """
+    파일 경로로 PDF를 열어 페이지별 텍스트를 추출합니다.
+    파일 전체를 메모리로 읽지 않고 MuPDF가 필요한 부분만 파일에서 읽습니다.
+    """
+    try:
+        doc = fitz.open(pdf_path, filetype="pdf")
+    except Exception as e:
+        logger.error(f"PDF 파일 열기 오류 ({pdf_path}): {e}", exc_info=True)
+        return None
+    return _extract_text(doc, mode)
+
+
+def extract_text_from_pdf_content(
+    pdf_content: bytes, mode: str = PDF_EXTRACT_MODE
+) -> Optional[str]:
     """
     바이트(bytes)로 제공된 PDF 내용에서 페이지별 텍스트를 추출합니다.
 
     Args:
         pdf_content: PDF 파일의 내용 (바이트).
+        mode: "plain"(page.get_text() 그대로) 또는
+            "layout"(블록·스팬 정보로 줄 병합, 머리글/바닥글 제거, 표 압축).
 
     Returns:
         페이지 구분자가 포함된 추출된 텍스트 (문자열), 또는 오류 발생 시 None.
     """
-    full_text = ""
     try:
         # 메모리에서 PDF 열기
         doc = fitz.open(stream=pdf_content, filetype="pdf")
     except Exception as e:
         logger.error(f"PDF 스트림 열기 오류: {e}", exc_info=True)
         return None
+    return _extract_text(doc, mode)
+
+
+def _extract_text(doc, mode: str) -> str:
+    logger.info(f"{len(doc)} 페이지 PDF에서 텍스트 추출 중... (모드: {mode})")
+    if mode == "layout":
+        pages = _extract_layout_pages(doc)
+    else:
+        pages = _extract_plain_pages(doc)
+    doc.close()
+
+    logger.info("PDF 텍스트 추출 완료.")
+    return join_pdf_pages(pages)
 
-    logger.info(f"{len(doc)} 페이지 PDF에서 텍스트 추출 중...")
+
+def _extract_plain_pages(doc) -> list[tuple[int, str]]:
+    pages = []
     for i, page in enumerate(doc):
         try:
-            page_text = page.get_text()
-            full_text += f"------Page {i + 1}------\n"
-            full_text += page_text.strip() + "\n\n"
+            pages.append((i + 1, page.get_text().strip()))
         except Exception as e:
             logger.warning(
                 f"경고: {i + 1} 페이지 처리 중 오류 발생 - {e}", exc_info=True
             )
-            full_text += f"------Page {i + 1}------\n"
-            full_text += "[오류: 이 페이지의 텍스트를 추출할 수 없습니다.]\n\n"
+            pages.append((i + 1, PAGE_ERROR_TEXT))
+    return pages
 
-    doc.close()
-    logger.info("PDF 텍스트 추출 완료.")
-    return full_text.strip()
+
+# ────────────────────────── #
+# 레이아웃 기반 추출
+# ────────────────────────── #
+def _inside(bbox, area) -> bool:
+    """bbox의 중심이 area 안에 있는지 확인합니다."""
+    cx = (bbox[0] + bbox[2]) / 2
+    cy = (bbox[1] + bbox[3]) / 2
+    return area[0] <= cx <= area[2] and area[1] <= cy <= area[3]
+
+
+def _merge_block_lines(block: dict) -> list[str]:
+    """
+    한 블록 안에서 줄바꿈으로 잘린 문장을 이어 붙입니다.
+    글머리 기호로 시작하는 줄은 새 항목으로 남깁니다.
+    """
+    merged: list[str] = []
+    for line in block.get("lines", []):
+        text = "".join(span.get("text", "") for span in line.get("spans", [])).strip()
+        if not text:
+            continue
+        if not merged or BULLET_START.match(text):
+            merged.append(text)
+        elif merged[-1].endswith("-"):
+            merged[-1] = merged[-1][:-1] + text
+        else:
+            merged[-1] = f"{merged[-1]} {text}"
+    return merged
+
+
+def _table_rows(page) -> tuple[list[str], list[tuple]]:
+    """표를 "셀 | 셀" 형태의 행 목록으로 압축하고, 표 영역 목록을 함께 반환합니다."""
+    rows: list[str] = []
+    areas: list[tuple] = []
+    try:
+        tables = page.find_tables().tables
+    except Exception:  # 표 인식을 지원하지 않거나 실패하면 일반 텍스트로 처리
+        return rows, areas
+    for table in tables:
+        areas.append(tuple(table.bbox))
+        for row in table.extract():
+            cells = [" ".join((cell or "").split()) for cell in row]
+            if any(cells):
+                rows.append(" | ".join(cells))
+    return rows, areas
+
+
+def _page_items(page) -> list[tuple[str, str]]:
+    """
+    페이지의 텍스트를 (위치, 텍스트) 목록으로 만듭니다.
+    위치는 상단 여백이면 "head", 하단 여백이면 "foot", 그 밖은 "body"입니다.
+    """
+    height = page.rect.height
+    table_rows, table_areas = _table_rows(page)
+    items: list[tuple[str, str]] = []
+    table_added = False
+    for block in page.get_text("dict", sort=True)["blocks"]:
+        if block.get("type") != 0:  # 이미지 블록 제외
+            continue
+        bbox = block["bbox"]
+        if any(_inside(bbox, area) for area in table_areas):
+            # 표 안의 텍스트는 표가 처음 나온 위치에 압축된 행으로 한 번만 넣음
+            if not table_added:
+                items.extend(("body", row) for row in table_rows)
+                table_added = True
+            continue
+        if bbox[3] <= height * EDGE_MARGIN:
+            position = "head"
+        elif bbox[1] >= height * (1 - EDGE_MARGIN):
+            position = "foot"
+        else:
+            position = "body"
+        items.extend((position, text) for text in _merge_block_lines(block))
+    if table_rows and not table_added:
+        items.extend(("body", row) for row in table_rows)
+    return items
+
+
+def _extract_layout_pages(doc) -> list[tuple[int, str]]:
+    page_items: list[Optional[list[tuple[str, str]]]] = []
+    for i, page in enumerate(doc):
+        try:
+            page_items.append(_page_items(page))
+        except Exception as e:
+            logger.warning(
+                f"경고: {i + 1} 페이지 처리 중 오류 발생 - {e}", exc_info=True
+            )
+            page_items.append(None)
+
+    # 여러 페이지의 같은 위치(상단/하단 여백)에 반복되는 줄 = 머리글/바닥글
+    running = find_repeated_edges(
+        [[(p, t) for p, t in items or [] if p != "body"] for items in page_items],
+        min_pages=2,
+    )
+
+    pages = []
+    for i, items in enumerate(page_items):
+        if items is None:
+            pages.append((i + 1, PAGE_ERROR_TEXT))
+            continue
+        lines: list[str] = []
+        for position, text in items:
+            if is_edge_noise(position, text, running):
+                continue
+            if lines and lines[-1] == text:  # 연속 중복 줄 제거
+                continue
+            lines.append(text)
+        pages.append((i + 1, "\n".join(lines)))
+    return pages
+
+
+def split_pdf_pages(text: str) -> list[tuple[int, str]]:
+    """
+    extract_text_from_pdf_content 결과를 (페이지 번호, 본문) 목록으로 나눕니다.
+    첫 구분자 이전의 텍스트는 버립니다.
+    """
+    matches = list(PAGE_MARKER.finditer(text))
+    pages = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        pages.append((int(match.group(1)), text[match.end() : end].strip()))
+    return pages
+
+
+def join_pdf_pages(pages: list[tuple[int, str]]) -> str:
+    """(페이지 번호, 본문) 목록을 구분자가 포함된 텍스트로 다시 합칩니다."""
+    return "\n\n".join(
+        f"------Page {number}------\n{body}" for number, body in pages
+    ).strip()
+
+
+def line_signature(line: str) -> str:
+    """숫자를 #으로 바꿔 "3 / 20", "4 / 20" 같은 줄을 같은 줄로 봅니다."""
+    return re.sub(r"\d+", "#", line.strip().lower())
+
+
+def find_repeated_edges(
+    page_edges: list[Iterable[tuple[str, str]]],
+    min_ratio: float = 0.5,
+    min_pages: int = 3,
+) -> set[tuple[str, str]]:
+    """
+    페이지별 (위치, 줄) 목록에서 같은 위치("head"/"foot")에 반복해서 나타나는
+    줄의 (위치, 서명)을 찾습니다. 전체 페이지의 min_ratio 이상, 최소 min_pages
+    페이지에 나온 것만 반환합니다. 위치까지 함께 보므로 본문 중간에 우연히 반복된
+    문장은 머리글/바닥글로 보지 않습니다.
+    """
+    if len(page_edges) < min_pages:
+        return set()
+    counts: dict[tuple[str, str], int] = {}
+    for edges in page_edges:
+        for key in {(position, line_signature(line)) for position, line in edges}:
+            counts[key] = counts.get(key, 0) + 1
+    threshold = max(min_pages, int(len(page_edges) * min_ratio))
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def is_edge_noise(position: str, line: str, repeated: set[tuple[str, str]]) -> bool:
+    """
+    머리글/바닥글 위치("head"/"foot")의 줄이 반복되는 머리글/바닥글
+    (find_repeated_edges 결과)이거나 쪽 번호만 있는 줄이면 참입니다.
+    본문 위치("body")의 줄은 항상 남깁니다.
+    """
+    if position == "body":
+        return False
+    return (position, line_signature(line)) in repeated or bool(
+        PAGE_NUMBER_LINE.match(line)
+    )
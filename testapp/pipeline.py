@@ -0,0 +1,110 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    파이프라인의 한 단계.
+
+    func는 deps에 나열된 스테이지들의 결과를 같은 이름의 키워드 인자로 받습니다.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    deps: tuple[str, ...] = ()
+
+
+def _validate_stages(stages: dict[str, Stage]) -> None:
+    """알 수 없는 의존성이나 순환 의존성이 있으면 ValueError를 발생시킵니다."""
+    for stage in stages.values():
+        for dep in stage.deps:
+            if dep not in stages:
+                raise ValueError(f"스테이지 '{stage.name}'의 의존성 '{dep}'이 없습니다.")
+
+    visiting: set[str] = set()
+    visited: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"스테이지 순환 의존성 발견: '{name}'")
+        visiting.add(name)
+        for dep in stages[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+
+    for name in stages:
+        visit(name)
+
+
+def run_stages(
+    stages: list[Stage],
+    max_workers: int = 4,
+    on_stage: Optional[Callable[[str], None]] = None,
+) -> dict[str, Any]:
+    """
+    스테이지 의존성 그래프를 실행합니다.
+
+    입력이 모두 준비된 스테이지는 즉시 스레드 풀에 제출되므로, 서로 의존하지 않는
+    스테이지(예: 슬라이드 렌더링과 대본 생성·TTS)는 동시에 진행됩니다.
+    한 스테이지가 실패하면 새 스테이지 제출을 멈추고, 실행 중인 스테이지가 끝나길
+    기다린 뒤 첫 예외를 다시 발생시킵니다.
+
+    Args:
+        stages: 실행할 스테이지 목록
+        max_workers: 동시에 실행할 최대 스테이지 수
+        on_stage: 스테이지가 시작될 때 이름으로 호출되는 콜백
+
+    Returns:
+        스테이지 이름 → 결과 딕셔너리
+    """
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("스테이지 이름이 중복되었습니다.")
+    _validate_stages(by_name)
+
+    results: dict[str, Any] = {}
+    pending = dict(by_name)
+    running = {}
+    error: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="stage"
+    ) as pool:
+
+        def submit_ready() -> None:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.deps):
+                    del pending[name]
+                    logger.info(f"스테이지 시작: {name}")
+                    if on_stage is not None:
+                        on_stage(name)
+                    kwargs = {dep: results[dep] for dep in stage.deps}
+                    running[pool.submit(stage.func, **kwargs)] = name
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    logger.error(f"스테이지 실패: {name} ({exc})")
+                    if error is None:
+                        error = exc
+                    continue
+                results[name] = future.result()
+                logger.info(f"스테이지 완료: {name}")
+            if error is None:
+                submit_ready()
+
+    if error is not None:
+        raise error
+    return results
@@ -42,3 +42,30 @@ ppt_gen_prompt = """
 
 다음 '수업 내용' 텍스트를 사용하여 Python 코드만 생성해줘.
 """
+
+slide_spec_prompt = """
+너는 주어진 '수업 내용' 텍스트를 분석해서 PPT 슬라이드 명세를 JSON으로 출력하는 AI야.
+코드는 작성하지 말고, 아래 형식의 JSON 객체 하나만 출력해야 해.
+
+# 출력 형식[
+{
+  "file_name": "machine_learning_week1.pptx",
+  "slides": [
+    {"title": "강의명", "points": [{"text": "주제1"}, {"text": "주제2"}], "notes": "..."},
+    {"title": "제목", "points": [{"text": "주제", "explanation": "설명"}], "notes": "..."},
+    {"title": "요약", "points": [{"text": "- 이전 페이지 제목"}], "notes": "..."}
+  ]
+}
+]
+
+# 슬라이드 요구사항[
+- first page는 title로 강의명, points로 이번주 학습주제를 포함해야 해.
+- second page부터는 title, points(text와 explanation{text에 대한 간단한 설명}), notes(해당 페이지에 대한 상세한 설명) 포함해야 해.
+- last page는 title, points(2페이지부터의 title로 구성), notes를 포함해야 해.
+- file_name은 '수업 내용'에서 파악된 주차 정보를 바탕으로 적절하게 설정해야 해 (예: 'machine_learning_week1.pptx').
+- 슬라이드의 총 장수는 입력 텍스트의 내용을 기반으로 자동으로 결정되어야 해.
+- points 리스트의 각 항목은 반드시 'text' 키를 포함한 딕셔너리여야 하며, 문자열이면 안 돼.
+- 'explanation'이나 'notes'가 명확하지 않으면, '수업 내용'의 해당 부분을 바탕으로 적절히 요약해서 채워줘.
+- 모든 내용은 한국어로 작성해줘.
+]
+"""
@@ -0,0 +1,40 @@
+import logging
+import random
+import time
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def backoff_delay(base: float, attempt: int) -> float:
+    """attempt번째 재시도 전 대기 시간(초): 지수 백오프에 ±50% 지터를 곱한 값."""
+    return base * (2**attempt) * random.uniform(0.5, 1.5)
+
+
+def retry_with_backoff(
+    func: Callable[[], T],
+    *,
+    retryable: Callable[[Exception], bool],
+    max_retries: int,
+    backoff_base: float,
+    label: str,
+    log: Callable[[str], None] = logger.warning,
+) -> T:
+    """
+    func()를 실행하고, retryable(오류)가 참인 오류는 최대 max_retries번까지
+    지수 백오프(+지터)로 재시도합니다. 재시도할 때마다 label을 붙여 log로 알립니다.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not retryable(e):
+                raise
+            delay = backoff_delay(backoff_base, attempt)
+            log(
+                f"{label} 실패 ({e}), {delay:.1f}초 후 재시도 "
+                f"({attempt + 1}/{max_retries})"
+            )
+            time.sleep(delay)
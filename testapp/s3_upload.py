@@ -1,26 +1,285 @@
+import base64
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+MIN_PART_SIZE = 5 * MB  # S3 멀티파트 업로드의 마지막이 아닌 파트 최소 크기
+CONTENT_TYPE = "video/mp4"
+
+# 업로드 진행 콜백: (지금까지 올린 바이트 수, 전체 바이트 수)
+ProgressCallback = Callable[[int, int], None]
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * MB,
+    multipart_chunksize=max(settings.S3_MULTIPART_CHUNK_MB * MB, MIN_PART_SIZE),
+    max_concurrency=settings.S3_MAX_CONCURRENCY,
+    use_threads=True,
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    프로세스 전체에서 공유하는 S3 클라이언트를 반환합니다.
+    boto3 클라이언트는 스레드 안전하므로 한 번만 만들어 재사용합니다
+    (클라이언트 생성 자체는 스레드 안전하지 않아 잠금 안에서 만듦).
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = boto3.client(
+                "s3",
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET_KEY,
+                region_name=settings.S3_REGION,
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                # 동시 파트 업로드 수만큼 연결을 유지
+                config=Config(
+                    max_pool_connections=max(settings.S3_MAX_CONCURRENCY, 10)
+                ),
+            )
+        return _client
 
-def upload_file_to_s3(local_file_path: str, s3_filename: str) -> str:
-    s3_client = boto3.client(
-        "s3",
-        aws_access_key_id=settings.S3_ACCESS_KEY,
-        aws_secret_access_key=settings.S3_SECRET_KEY,
-        region_name=settings.S3_REGION,
-    )
 
-    s3_key = f"class/{s3_filename}"  # 원하는 경로
+def _s3_key(s3_filename: str) -> str:
+    return f"class/{s3_filename}"  # 원하는 경로
+
+
+def _s3_url(s3_key: str) -> str:
     bucket = settings.S3_BUCKET_NAME
+    if settings.S3_ENDPOINT_URL:
+        return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{bucket}/{s3_key}"
+    return f"https://{bucket}.s3.{settings.S3_REGION}.amazonaws.com/{s3_key}"
+
+
+class _ProgressTracker:
+    """boto3가 여러 스레드에서 넘기는 증분 바이트 수를 누적해 progress로 전달합니다."""
+
+    def __init__(self, total: int, progress: Optional[ProgressCallback]):
+        self.total = total
+        self.progress = progress
+        self._uploaded = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, bytes_amount: int) -> None:
+        with self._lock:
+            self._uploaded += bytes_amount
+            uploaded = self._uploaded
+        if self.progress:
+            self.progress(uploaded, self.total)
+
 
-    s3_client.upload_file(
+def upload_file_to_s3(
+    local_file_path: str,
+    s3_filename: str,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    완성된 파일을 S3에 올리고 URL을 반환합니다.
+    TRANSFER_CONFIG에 따라 큰 파일은 멀티파트로 나눠 동시에 업로드합니다.
+    progress가 주어지면 (올린 바이트 수, 전체 바이트 수)로 호출합니다.
+    """
+    s3_key = _s3_key(s3_filename)
+    total = os.path.getsize(local_file_path)
+
+    get_s3_client().upload_file(
         Filename=local_file_path,
-        Bucket=bucket,
+        Bucket=settings.S3_BUCKET_NAME,
         Key=s3_key,
         ExtraArgs={
-            "ContentType": "video/mp4"
+            "ContentType": CONTENT_TYPE
             # "ACL": "public-read"
         },
+        Config=TRANSFER_CONFIG,
+        Callback=_ProgressTracker(total, progress),
     )
+    logger.info(f"S3 업로드 완료: {s3_key} ({total} bytes)")
+    return _s3_url(s3_key)
 
-    return f"https://{bucket}.s3.{settings.S3_REGION}.amazonaws.com/{s3_key}"
+
+class GrowingFileUpload:
+    """
+    인코더가 아직 쓰고 있는 파일을 따라가며 멀티파트 업로드합니다.
+
+    start() 후에는 파일이 파트 크기만큼 자랄 때마다 그 구간을 바로 올리고,
+    finish()에서 남은 꼬리를 올린 뒤 업로드를 완료합니다. 파일은 앞에서부터
+    순서대로 써야(예: 조각 MP4) 효과가 있습니다. finish()에서 이미 올린 파트를
+    다시 읽어 MD5를 비교하고 바뀐 파트만 다시 올리므로, 인코더가 앞부분을
+    고쳐 쓰더라도(예: moviepy 대체 렌더링) 결과는 항상 최종 파일과 같습니다.
+    전체 크기는 finish()에서야 알 수 있으므로 progress도 그때부터 호출합니다.
+    """
+
+    def __init__(
+        self,
+        local_file_path: str,
+        s3_filename: str,
+        progress: Optional[ProgressCallback] = None,
+        poll_interval: float = settings.S3_UPLOAD_POLL_INTERVAL,
+    ):
+        self.path = local_file_path
+        self.s3_filename = s3_filename
+        self.s3_key = _s3_key(s3_filename)
+        self.progress = progress
+        self.poll_interval = poll_interval
+        self.part_size = TRANSFER_CONFIG.multipart_chunksize
+
+        self._upload_id: Optional[str] = None
+        self._offset = 0  # 파트로 나눠 보낸 바이트 수 (추적 스레드만 변경)
+        # 파트 번호 → (파일 내 위치, 크기, MD5, ETag)
+        self._parts: dict[int, tuple[int, int, str, str]] = {}
+        self._futures = []
+        self._uploaded = 0  # 올린 파트 크기의 합 (다시 올린 파트는 새 크기로)
+        self._total: Optional[int] = None  # 최종 파일 크기 (finish()에서 확정)
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._pool = ThreadPoolExecutor(
+            max_workers=settings.S3_MAX_CONCURRENCY, thread_name_prefix="s3-part"
+        )
+        self._thread = threading.Thread(
+            target=self._follow, name="s3-follow", daemon=True
+        )
+
+    def start(self) -> "GrowingFileUpload":
+        self._thread.start()
+        logger.info(f"인코딩 중 업로드 시작: {self.path} → {self.s3_key}")
+        return self
+
+    # ── 파트 업로드 ──
+    def _read(self, offset: int, size: int) -> bytes:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    def _upload_part(self, number: int, offset: int, size: int) -> None:
+        data = self._read(offset, size)
+        digest = hashlib.md5(data).digest()
+        response = get_s3_client().upload_part(
+            Bucket=settings.S3_BUCKET_NAME,
+            Key=self.s3_key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=data,
+            ContentMD5=base64.b64encode(digest).decode(),
+        )
+        with self._lock:
+            previous = self._parts.get(number)
+            self._parts[number] = (offset, len(data), digest.hex(), response["ETag"])
+            self._uploaded += len(data) - (previous[1] if previous else 0)
+            uploaded, total = self._uploaded, self._total
+        # 파일이 아직 자라는 중이면 전체 크기를 모르므로 보고하지 않음
+        if self.progress and total is not None:
+            self.progress(uploaded, total)
+
+    def _submit(self, size: int) -> None:
+        if self._upload_id is None:
+            self._upload_id = get_s3_client().create_multipart_upload(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=self.s3_key,
+                ContentType=CONTENT_TYPE,
+            )["UploadId"]
+        number = len(self._futures) + 1
+        self._futures.append(
+            self._pool.submit(self._upload_part, number, self._offset, size)
+        )
+        self._offset += size
+
+    def _follow(self) -> None:
+        """파일이 파트 크기만큼 자랄 때마다 파트를 보냅니다 (finish() 전까지)."""
+        while not self._done.is_set():
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            while size - self._offset >= self.part_size:
+                self._submit(self.part_size)
+            self._done.wait(self.poll_interval)
+
+    # ── 완료/취소 ──
+    def finish(self) -> str:
+        """파일 쓰기가 끝난 뒤 호출합니다. 남은 부분을 올리고 업로드를 완료해 URL을 반환합니다."""
+        self._done.set()
+        self._thread.join()
+        try:
+            size = os.path.getsize(self.path)
+            if self._upload_id is None or size < self._offset:
+                # 스트리밍할 만큼 크지 않았거나 파일이 줄어든 경우: 일반 업로드
+                self.abort()
+                return upload_file_to_s3(self.path, self.s3_filename, self.progress)
+
+            with self._lock:
+                self._total = size
+                uploaded = self._uploaded
+            if self.progress:
+                self.progress(uploaded, size)
+            while size - self._offset > self.part_size:
+                self._submit(self.part_size)
+            if size > self._offset:
+                self._submit(size - self._offset)
+            for future in self._futures:
+                future.result()
+
+            rewritten = self._reupload_changed_parts()
+            get_s3_client().complete_multipart_upload(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=self.s3_key,
+                UploadId=self._upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": number, "ETag": part[3]}
+                        for number, part in sorted(self._parts.items())
+                    ]
+                },
+            )
+        except Exception:
+            self.abort()
+            raise
+        self._pool.shutdown()
+        logger.info(
+            f"S3 업로드 완료: {self.s3_key} ({size} bytes, 파트 {len(self._parts)}개, "
+            f"다시 올린 파트 {rewritten}개)"
+        )
+        return _s3_url(self.s3_key)
+
+    def _reupload_changed_parts(self) -> int:
+        """이미 올린 파트 중 내용이 바뀐 파트를 다시 올리고 그 개수를 반환합니다."""
+        changed = [
+            (number, offset, size)
+            for number, (offset, size, md5, _) in sorted(self._parts.items())
+            if hashlib.md5(self._read(offset, size)).hexdigest() != md5
+        ]
+        if changed:
+            logger.warning(
+                f"업로드 후 바뀐 파트 {len(changed)}개를 다시 올립니다: {self.s3_key}"
+            )
+            futures = [
+                self._pool.submit(self._upload_part, number, offset, size)
+                for number, offset, size in changed
+            ]
+            for future in futures:
+                future.result()
+        return len(changed)
+
+    def abort(self) -> None:
+        """진행 중인 멀티파트 업로드를 취소합니다 (올린 파트는 S3에서 삭제됨)."""
+        self._done.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._upload_id is not None:
+            upload_id, self._upload_id = self._upload_id, None
+            try:
+                get_s3_client().abort_multipart_upload(
+                    Bucket=settings.S3_BUCKET_NAME, Key=self.s3_key, UploadId=upload_id
+                )
+            except Exception as e:
+                logger.warning(f"멀티파트 업로드 취소 실패 ({self.s3_key}): {e}")
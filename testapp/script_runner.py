@@ -0,0 +1,202 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import runpy
+import shlex
+import subprocess
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# ────────────────────────── #
+# 1. 환경 설정
+# ────────────────────────── #
+# 실행 방식: "forkserver"(python-pptx를 미리 import한 서버에서 fork)
+# 또는 "subprocess"(매번 새 인터프리터)
+SCRIPT_RUNNER = os.getenv("SCRIPT_RUNNER", "forkserver")
+SCRIPT_TIMEOUT = float(os.getenv("SCRIPT_TIMEOUT", 120))  # 초, 실제 경과 시간
+SCRIPT_CPU_SECONDS = int(os.getenv("SCRIPT_CPU_SECONDS", 60))
+SCRIPT_MEMORY_MB = int(os.getenv("SCRIPT_MEMORY_MB", 1024))
+
+# fork 서버가 미리 import해 둘 모듈 (자식은 import 비용 없이 시작)
+PRELOAD_MODULES = [
+    "pptx",
+    "pptx.util",
+    "pptx.dml.color",
+    "pptx.enum.text",
+    "lxml.etree",
+]
+# 생성 코드에 넘겨줄 환경 변수 (API 키 등 비밀값은 넘기지 않음)
+SAFE_ENV_KEYS = (
+    "PATH",
+    "HOME",
+    "LANG",
+    "LC_ALL",
+    "LANGUAGE",
+    "TMPDIR",
+    "PYTHONIOENCODING",
+)
+
+_context = None
+
+
+def _safe_env() -> dict:
+    env = {key: os.environ[key] for key in SAFE_ENV_KEYS if key in os.environ}
+    env.setdefault("PYTHONIOENCODING", "utf-8")
+    return env
+
+
+def _clean_launcher() -> str:
+    """
+    _safe_env()만 남긴 환경에서 현재 인터프리터를 실행하는 래퍼 스크립트를 만듭니다.
+
+    fork 서버는 시작될 때의 환경을 그대로 물려받고, 그 환경은 fork된 자식의
+    /proc/self/environ에도 남습니다. 자식에서 os.environ을 비우는 것만으로는
+    비밀값을 숨길 수 없으므로 fork 서버 자체를 이 래퍼로 띄웁니다.
+    """
+    env = " ".join(shlex.quote(f"{key}={value}") for key, value in _safe_env().items())
+    python = shlex.quote(sys.executable)
+    fd, path = tempfile.mkstemp(prefix="script_runner_", suffix=".sh")
+    with os.fdopen(fd, "w") as f:
+        f.write(f'#!/bin/sh\nexec /usr/bin/env -i {env} {python} "$@"\n')
+    os.chmod(path, 0o700)
+    atexit.register(os.remove, path)
+    return path
+
+
+def _get_context():
+    """
+    PRELOAD_MODULES를 미리 불러온 forkserver 컨텍스트를 반환합니다.
+    fork 서버(와 재시작된 fork 서버)는 비밀값이 빠진 환경으로 실행됩니다.
+    """
+    global _context
+    if _context is None:
+        _context = multiprocessing.get_context("forkserver")
+        _context.set_forkserver_preload(PRELOAD_MODULES)
+        # 프로세스 전체의 spawn 실행 파일이 바뀌지만 이 프로젝트에서 spawn 계열
+        # (spawn/forkserver)을 쓰는 곳은 여기뿐
+        _context.set_executable(_clean_launcher())
+    return _context
+
+
+# ────────────────────────── #
+# 2. 자식 프로세스
+# ────────────────────────── #
+def _child_main(
+    script: str, cwd: str, stdout_path: str, stderr_path: str, env: dict
+) -> None:
+    """fork된 자식에서 자원 제한·출력 캡처를 설정한 뒤 스크립트를 실행합니다."""
+    import resource
+
+    resource.setrlimit(resource.RLIMIT_CPU, (SCRIPT_CPU_SECONDS, SCRIPT_CPU_SECONDS))
+    memory = SCRIPT_MEMORY_MB * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+
+    # 파이썬 출력과 C 확장 출력 모두 파일로 받도록 fd 단위로 연결
+    out = open(stdout_path, "w", encoding="utf-8")
+    err = open(stderr_path, "w", encoding="utf-8")
+    os.dup2(out.fileno(), 1)
+    os.dup2(err.fileno(), 2)
+    sys.stdout = out
+    sys.stderr = err
+
+    code = 0
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        out.flush()
+        err.flush()
+    os._exit(code)
+
+
+# ────────────────────────── #
+# 3. 실행
+# ────────────────────────── #
+def _read_output(path: str) -> str:
+    if not os.path.exists(path):  # 자식이 출력 설정 전에 종료된 경우
+        return ""
+    return Path(path).read_text(encoding="utf-8", errors="replace")
+
+
+def _run_forked(
+    script: str, cwd: str, timeout: float
+) -> subprocess.CompletedProcess:
+    with tempfile.TemporaryDirectory(prefix="script_run_") as tmp:
+        stdout_path = os.path.join(tmp, "stdout")
+        stderr_path = os.path.join(tmp, "stderr")
+        process = _get_context().Process(
+            target=_child_main,
+            args=(script, cwd, stdout_path, stderr_path, _safe_env()),
+            daemon=True,
+        )
+        process.start()
+        process.join(timeout)
+        timed_out = process.is_alive()
+        if timed_out:
+            process.kill()
+            process.join()
+
+        stdout = _read_output(stdout_path)
+        stderr = _read_output(stderr_path)
+
+    cmd = [sys.executable, script]
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout, output=stdout, stderr=stderr)
+    # 신호로 종료되면 exitcode가 음수 (예: CPU 제한 초과 시 SIGXCPU)
+    return subprocess.CompletedProcess(cmd, process.exitcode, stdout, stderr)
+
+
+def run_python_script(
+    script: str | Path,
+    cwd: Optional[str | Path] = None,
+    timeout: float = SCRIPT_TIMEOUT,
+    check: bool = True,
+) -> subprocess.CompletedProcess:
+    """
+    LLM이 생성한 파이썬 스크립트를 격리된 자식 프로세스에서 실행합니다.
+
+    기본(SCRIPT_RUNNER=forkserver)은 python-pptx를 미리 import한 fork 서버에서
+    스크립트마다 자식을 fork하므로 인터프리터 시작·import 비용이 없습니다.
+    자식에는 CPU 시간·메모리 제한과 경과 시간 제한을 걸고, 비밀값이 빠진 환경 변수만
+    넘기며, 표준 출력/오류를 캡처합니다.
+
+    반환값과 예외는 subprocess.run(capture_output=True, text=True)과 같습니다:
+    시간 초과 시 subprocess.TimeoutExpired, check=True에서 실패 시
+    subprocess.CalledProcessError를 발생시킵니다.
+    """
+    script = str(Path(script).resolve())
+    cwd = str(cwd or os.getcwd())
+
+    if SCRIPT_RUNNER == "forkserver" and os.name == "posix":
+        result = _run_forked(script, cwd, timeout)
+    else:
+        result = subprocess.run(
+            [sys.executable, script],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            env=_safe_env(),
+            timeout=timeout,
+        )
+
+    logger.info(f"스크립트 실행 완료: {script} (종료 코드: {result.returncode})")
+    if check and result.returncode != 0:
+        raise subprocess.CalledProcessError(
+            result.returncode, result.args, result.stdout, result.stderr
+        )
+    return result
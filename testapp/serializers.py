@@ -1,7 +1,7 @@
-from PyPDF2 import PdfReader
 from rest_framework import serializers
 
-from .models import Lecture
+from .models import Lecture, LectureJob
+from .pdf2text import validate_pdf
 
 
 class LectureUploadSerializer(serializers.Serializer):
@@ -14,9 +14,13 @@ class LectureUploadSerializer(serializers.Serializer):
         if value.content_type != "application/pdf" or not value.name.endswith(".pdf"):
             raise serializers.ValidationError("PDF 파일만 업로드할 수 있습니다.")
 
+        # 큰 업로드는 디스크의 임시 파일을 그대로, 작은 업로드는 메모리 내용을 검사
         try:
-            value.seek(0)
-            PdfReader(value)
+            if hasattr(value, "temporary_file_path"):
+                value.page_count = validate_pdf(value.temporary_file_path())
+            else:
+                value.seek(0)
+                value.page_count = validate_pdf(value.read())
         except Exception:
             raise serializers.ValidationError("손상된 PDF 파일입니다.")
         finally:
@@ -34,3 +38,23 @@ class LectureDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Lecture
         fields = ["id", "title", "professor", "view_count", "video_url", "created_at"]
+
+
+class LectureJobSerializer(serializers.ModelSerializer):
+    lecture_id = serializers.IntegerField(source="lecture.id", read_only=True)
+    video_url = serializers.URLField(source="lecture.video_url", read_only=True)
+
+    class Meta:
+        model = LectureJob
+        fields = [
+            "id",
+            "subject",
+            "professor",
+            "status",
+            "stage",
+            "error",
+            "lecture_id",
+            "video_url",
+            "created_at",
+            "updated_at",
+        ]
@@ -0,0 +1,177 @@
+import io
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.util import Pt
+
+logger = logging.getLogger(__name__)
+
+# 사용할 템플릿 (없으면 python-pptx 기본 템플릿)
+SLIDE_TEMPLATE_PATH = os.getenv("SLIDE_TEMPLATE_PATH")
+FONT_NAME = os.getenv("SLIDE_FONT_NAME", "Malgun Gothic")
+TITLE_FONT_SIZE = Pt(32)
+BODY_FONT_SIZE = Pt(18)
+EXPLANATION_FONT_SIZE = Pt(14)
+
+TITLE_LAYOUT = 0  # 제목 슬라이드
+CONTENT_LAYOUT = 1  # 제목 및 내용
+
+
+def _load_template_bytes() -> bytes:
+    """템플릿을 한 번만 읽어 메모리에 올려둡니다. 렌더링마다 복사해서 사용합니다."""
+    if SLIDE_TEMPLATE_PATH:
+        return Path(SLIDE_TEMPLATE_PATH).read_bytes()
+    buffer = io.BytesIO()
+    Presentation().save(buffer)
+    return buffer.getvalue()
+
+
+_TEMPLATE_BYTES = _load_template_bytes()
+
+
+# ────────────────────────── #
+# 1. 명세 파싱 & 검증
+# ────────────────────────── #
+def parse_slide_spec(raw: str) -> dict:
+    """LLM 응답 문자열에서 JSON 명세를 꺼냅니다 (코드 블록 마커가 있어도 허용)."""
+    s = raw.strip()
+    if s.startswith("```"):
+        s = s.split("\n", 1)[1] if "\n" in s else ""
+        s = s.rsplit("```", 1)[0]
+    try:
+        return json.loads(s)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"슬라이드 명세가 올바른 JSON이 아닙니다: {e}")
+
+
+def validate_slide_spec(spec: dict) -> list[dict]:
+    """
+    슬라이드 명세 구조를 검증하고 슬라이드 목록을 반환합니다.
+
+    형식: {"file_name": str?, "slides": [{"title": str,
+    "points": [{"text": str, "explanation": str?}], "notes": str?}]}
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("슬라이드 명세는 객체여야 합니다.")
+
+    slides = spec.get("slides")
+    if not isinstance(slides, list) or not slides:
+        raise ValueError("slides는 비어있지 않은 리스트여야 합니다.")
+
+    file_name = spec.get("file_name")
+    if file_name is not None and not isinstance(file_name, str):
+        raise ValueError("file_name은 문자열이어야 합니다.")
+
+    for idx, slide in enumerate(slides, start=1):
+        if not isinstance(slide, dict):
+            raise ValueError(f"{idx}번 슬라이드는 딕셔너리여야 합니다.")
+        if not isinstance(slide.get("title"), str) or not slide["title"].strip():
+            raise ValueError(f"{idx}번 슬라이드에 'title'이 없습니다.")
+        if not isinstance(slide.get("points"), list):
+            raise ValueError(f"{idx}번 슬라이드의 points는 리스트여야 합니다.")
+        for point in slide["points"]:
+            if not isinstance(point, dict):
+                raise ValueError(f"{idx}번 슬라이드의 각 point는 딕셔너리여야 합니다.")
+            if not isinstance(point.get("text"), str):
+                raise ValueError(f"{idx}번 슬라이드의 각 point는 'text' 키를 포함해야 합니다.")
+            explanation = point.get("explanation")
+            if explanation is not None and not isinstance(explanation, str):
+                raise ValueError(f"{idx}번 슬라이드의 explanation은 문자열이어야 합니다.")
+        notes = slide.get("notes")
+        if notes is not None and not isinstance(notes, str):
+            raise ValueError(f"{idx}번 슬라이드의 notes는 문자열이어야 합니다.")
+
+    return slides
+
+
+def safe_file_name(name: Optional[str], default: str = "lecture.pptx") -> str:
+    """명세의 파일명을 작업 디렉터리에 안전한 .pptx 파일명으로 바꿉니다."""
+    stem = Path(name or "").stem
+    stem = re.sub(r"[^\w.-]", "_", stem).strip("._")
+    return f"{stem}.pptx" if stem else default
+
+
+def spec_to_ppt_structure(slides: list[dict]) -> list[str]:
+    """대본 생성에 넘길 슬라이드별 텍스트(제목 + 항목)를 만듭니다."""
+    structure = []
+    for slide in slides:
+        lines = [slide["title"]]
+        for point in slide["points"]:
+            lines.append(point["text"])
+            if point.get("explanation"):
+                lines.append(point["explanation"])
+        structure.append("\n".join(lines))
+    return structure
+
+
+# ────────────────────────── #
+# 2. 렌더링
+# ────────────────────────── #
+def _set_font(text_frame, size, bold: bool = False) -> None:
+    for paragraph in text_frame.paragraphs:
+        for run in paragraph.runs:
+            run.font.name = FONT_NAME
+            run.font.size = size
+            run.font.bold = bold
+
+
+def _set_white_background(slide) -> None:
+    fill = slide.background.fill
+    fill.solid()
+    fill.fore_color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
+
+
+def render_slide_spec(slides: list[dict], out_path: str | Path) -> Path:
+    """
+    검증된 슬라이드 명세로 PPTX를 만듭니다.
+    첫 슬라이드는 제목 레이아웃, 나머지는 제목 및 내용 레이아웃을 사용합니다.
+    """
+    prs = Presentation(io.BytesIO(_TEMPLATE_BYTES))
+
+    for idx, spec in enumerate(slides):
+        if idx == 0:
+            slide = prs.slides.add_slide(prs.slide_layouts[TITLE_LAYOUT])
+            slide.shapes.title.text = spec["title"]
+            _set_font(slide.shapes.title.text_frame, TITLE_FONT_SIZE, bold=True)
+            if len(slide.placeholders) > 1:
+                subtitle = slide.placeholders[1].text_frame
+                subtitle.text = "\n".join(point["text"] for point in spec["points"])
+                _set_font(subtitle, BODY_FONT_SIZE)
+        else:
+            slide = prs.slides.add_slide(prs.slide_layouts[CONTENT_LAYOUT])
+            slide.shapes.title.text = spec["title"]
+            _set_font(slide.shapes.title.text_frame, TITLE_FONT_SIZE, bold=True)
+
+            body = slide.placeholders[1].text_frame
+            body.clear()
+            first = True
+            for point in spec["points"]:
+                paragraph = body.paragraphs[0] if first else body.add_paragraph()
+                first = False
+                run = paragraph.add_run()
+                run.text = point["text"]
+                run.font.name = FONT_NAME
+                run.font.size = BODY_FONT_SIZE
+                paragraph.space_after = Pt(6)
+                if point.get("explanation"):
+                    sub = body.add_paragraph()
+                    sub.level = 1
+                    sub_run = sub.add_run()
+                    sub_run.text = point["explanation"]
+                    sub_run.font.name = FONT_NAME
+                    sub_run.font.size = EXPLANATION_FONT_SIZE
+
+        _set_white_background(slide)
+        if spec.get("notes"):
+            slide.notes_slide.notes_text_frame.text = spec["notes"]
+
+    out_path = Path(out_path)
+    prs.save(out_path)
+    logger.info(f"슬라이드 명세로 PPTX 생성 완료: {out_path} ({len(slides)}장)")
+    return out_path
@@ -0,0 +1,332 @@
+import atexit
+import logging
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from xmlrpc.client import Fault, ServerProxy
+
+from unoserver.client import UnoClient
+
+logger = logging.getLogger(__name__)
+
+# ────────────────────────── #
+# 1. 환경 설정
+# ────────────────────────── #
+SOFFICE_BIN = os.getenv("SOFFICE_BIN", "soffice")
+# unoserver 서버를 실행할 인터프리터. LibreOffice의 pyuno(python3-uno)는 배포판
+# 시스템 파이썬용으로만 빌드되므로 앱 인터프리터가 아니라 이쪽에서 uno를 import하고,
+# 앱은 XML-RPC 클라이언트(UnoClient)로만 변환을 요청함
+UNOSERVER_PYTHON = os.getenv("UNOSERVER_PYTHON", "/usr/bin/python3")
+SOFFICE_POOL_SIZE = int(os.getenv("SOFFICE_POOL_SIZE", 2))
+SOFFICE_MAX_CONVERSIONS = int(os.getenv("SOFFICE_MAX_CONVERSIONS", 50))  # 이후 재시작
+SOFFICE_CONVERT_TIMEOUT = int(os.getenv("SOFFICE_CONVERT_TIMEOUT", 60))  # 초
+SOFFICE_STARTUP_TIMEOUT = float(os.getenv("SOFFICE_STARTUP_TIMEOUT", 60))  # 초
+SOFFICE_QUEUE_TIMEOUT = float(os.getenv("SOFFICE_QUEUE_TIMEOUT", 300))  # 초
+# 프로세스마다 이 아래에 "<pid>-XXXX" 디렉터리를 따로 만들어 슬롯별 프로필을 둠
+SOFFICE_PROFILE_DIR = os.getenv(
+    "SOFFICE_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "soffice_pool")
+)
+
+
+def _soffice_env(tmpdir: Path) -> dict:
+    env = os.environ.copy()
+    env["TMPDIR"] = str(tmpdir)
+    env["PYTHONIOENCODING"] = "utf-8"  # Python I/O 인코딩 설정
+    env["LANG"] = "ko_KR.UTF-8"  # 한글 로케일 설정
+    env["LC_ALL"] = "ko_KR.UTF-8"
+    env["LANGUAGE"] = "ko_KR.UTF-8"
+    return env
+
+
+def _free_port() -> int:
+    """운영체제가 비어 있다고 알려 준 로컬 TCP 포트를 반환합니다."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _check_unoserver() -> None:
+    """UNOSERVER_PYTHON에서 uno와 unoserver를 import할 수 있는지 확인합니다."""
+    try:
+        proc = subprocess.run(
+            [UNOSERVER_PYTHON, "-c", "import uno, unoserver.server"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        proc = None
+        detail = str(e)
+    else:
+        detail = (proc.stderr.strip().splitlines() or [""])[-1]
+    if proc is None or proc.returncode != 0:
+        message = (
+            f"상주 LibreOffice 풀을 시작할 수 없습니다: {UNOSERVER_PYTHON}에서 "
+            f"uno/unoserver를 import하지 못했습니다 ({detail}). python3-uno와 "
+            "unoserver를 설치하거나 UNOSERVER_PYTHON을 지정하세요. "
+            "풀 없이 변환하려면 SOFFICE_POOL_ENABLED=false로 설정하세요."
+        )
+        logger.error(message)
+        raise RuntimeError(message)
+
+
+class SofficeInstance:
+    """
+    unoserver로 띄운 헤드리스 LibreOffice 상주 프로세스 하나.
+
+    포트는 시작할 때마다 비어 있는 포트를 새로 고르고, 사용자 프로필은 풀을 만든
+    프로세스 전용 디렉터리 아래에 두므로 여러 워커 프로세스가 동시에 풀을 띄워도
+    포트나 프로필이 겹치지 않습니다. 변환이 SOFFICE_CONVERT_TIMEOUT을 넘기면
+    unoserver가 LibreOffice와 함께 종료되고, 다음 사용 전에 재시작됩니다.
+    """
+
+    def __init__(self, slot: int, root: Path):
+        self.slot = slot
+        self.port = 0  # XML-RPC 포트 (start()에서 할당)
+        self.uno_port = 0
+        self.profile_dir = root / f"slot{slot}"
+        self.log_path = root / f"slot{slot}.log"
+        self.process: Optional[subprocess.Popen] = None
+        self.client: Optional[UnoClient] = None
+        self.conversions = 0
+        self.last_stderr = ""
+
+    @property
+    def stale(self) -> bool:
+        """변환 횟수가 SOFFICE_MAX_CONVERSIONS에 도달해 다음 사용 전에 재시작할 인스턴스."""
+        return self.conversions >= SOFFICE_MAX_CONVERSIONS
+
+    # ── 상주 프로세스 관리 ──
+    def start(self) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.port = _free_port()
+        self.uno_port = _free_port()
+        while self.uno_port == self.port:
+            self.uno_port = _free_port()
+        cmd = [
+            UNOSERVER_PYTHON,
+            "-m",
+            "unoserver.server",
+            "--interface",
+            "127.0.0.1",
+            "--port",
+            str(self.port),
+            "--uno-port",
+            str(self.uno_port),
+            "--executable",
+            shutil.which(SOFFICE_BIN) or SOFFICE_BIN,
+            "--user-installation",
+            str(self.profile_dir.resolve()),
+            "--conversion-timeout",
+            str(SOFFICE_CONVERT_TIMEOUT),
+        ]
+        logger.info(
+            f"LibreOffice 인스턴스 시작 (slot {self.slot}, port {self.port}, "
+            f"uno port {self.uno_port}, profile {self.profile_dir})"
+        )
+        with open(self.log_path, "ab") as log:
+            self.process = subprocess.Popen(
+                cmd,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=_soffice_env(self.profile_dir),
+                start_new_session=True,  # 종료 시 LibreOffice까지 한 번에 정리
+            )
+        self.conversions = 0
+        self.client = UnoClient("127.0.0.1", str(self.port))
+        try:
+            self._wait_ready()
+        except Exception:
+            self.stop()
+            raise
+
+    def _log_tail(self, lines: int = 20) -> str:
+        try:
+            with open(self.log_path, encoding="utf-8", errors="replace") as f:
+                return "".join(f.readlines()[-lines:])
+        except OSError:
+            return ""
+
+    def _wait_ready(self) -> None:
+        """unoserver가 LibreOffice에 연결되어 info()에 응답할 때까지 기다립니다."""
+        deadline = time.monotonic() + SOFFICE_STARTUP_TIMEOUT
+        proxy = ServerProxy(f"http://127.0.0.1:{self.port}", allow_none=True)
+        while True:
+            if self.process.poll() is not None:
+                message = (
+                    f"unoserver가 시작 중 종료되었습니다 (slot {self.slot}, "
+                    f"코드 {self.process.returncode}):\n{self._log_tail()}"
+                )
+                logger.error(message)
+                raise RuntimeError(message)
+            try:
+                proxy.info()
+                return
+            except (OSError, Fault):
+                pass
+            if time.monotonic() > deadline:
+                message = (
+                    f"unoserver 연결 시간 초과 (slot {self.slot}, port {self.port}):"
+                    f"\n{self._log_tail()}"
+                )
+                logger.error(message)
+                raise RuntimeError(message)
+            time.sleep(0.5)
+
+    def stop(self) -> None:
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()  # unoserver가 LibreOffice에 신호를 전달
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                try:
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.process.wait()
+        self.process = None
+        self.client = None
+
+    def restart(self) -> None:
+        logger.info(f"LibreOffice 인스턴스 재시작 (slot {self.slot})")
+        self.stop()
+        self.start()
+
+    def is_healthy(self) -> bool:
+        """프로세스가 살아 있고 XML-RPC 포트가 응답하는지 확인합니다."""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(("127.0.0.1", self.port), timeout=2):
+                return True
+        except OSError:
+            return False
+
+    # ── 변환 ──
+    def convert(self, pptx: Path, outdir: Path) -> Path:
+        """PPTX를 outdir 아래 같은 이름의 PDF로 변환하고 경로를 반환합니다."""
+        outdir.mkdir(parents=True, exist_ok=True)
+        pdf_path = outdir / f"{pptx.stem}.pdf"
+        try:
+            self.client.convert(
+                inpath=str(pptx.resolve()),
+                outpath=str(pdf_path.resolve()),
+                convert_to="pdf",
+                filtername="impress_pdf_Export",
+            )
+            self.last_stderr = ""
+        except Exception as e:
+            self.last_stderr = str(e)
+            if self.process is not None and self.process.poll() is not None:
+                # 시간 초과로 unoserver가 LibreOffice와 함께 종료된 경우
+                raise TimeoutError(
+                    f"LibreOffice 변환 실패 또는 시간 초과 (slot {self.slot}): {e}"
+                )
+            raise
+        self.conversions += 1
+        return pdf_path
+
+
+class SofficePool:
+    """
+    상주 LibreOffice 인스턴스 풀.
+
+    모든 인스턴스가 사용 중이면 변환 요청은 대기열에서 기다립니다.
+    사용 전 상태 점검에 실패하거나, 변환이 멈추거나, 변환 횟수가
+    SOFFICE_MAX_CONVERSIONS에 도달한 인스턴스는 다음에 꺼낼 때 재시작하므로
+    재시작 비용이나 실패가 이미 끝난 변환의 결과에 영향을 주지 않습니다.
+    """
+
+    def __init__(self, size: int = SOFFICE_POOL_SIZE):
+        _check_unoserver()
+        self.pid = os.getpid()
+        os.makedirs(SOFFICE_PROFILE_DIR, exist_ok=True)
+        # 프로세스 전용 디렉터리: 다른 워커 프로세스의 프로필과 겹치지 않음
+        self.root = Path(
+            tempfile.mkdtemp(prefix=f"{self.pid}-", dir=SOFFICE_PROFILE_DIR)
+        )
+        self._idle: queue.Queue[SofficeInstance] = queue.Queue()
+        self._instances = [SofficeInstance(slot, self.root) for slot in range(size)]
+        for instance in self._instances:
+            self._idle.put(instance)
+
+    def convert(self, pptx: Path, outdir: Path) -> tuple[Path, str]:
+        """변환된 PDF 경로와 마지막 stderr를 반환합니다."""
+        try:
+            instance = self._idle.get(timeout=SOFFICE_QUEUE_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError("사용 가능한 LibreOffice 인스턴스가 없습니다 (대기 시간 초과)")
+
+        try:
+            self._ensure_ready(instance)
+            try:
+                pdf_path = instance.convert(pptx, outdir)
+            except Exception:
+                # 멈췄거나 비정상 종료된 인스턴스는 다음 사용 전에 새로 띄움
+                instance.stop()
+                raise
+            return pdf_path, instance.last_stderr
+        finally:
+            self._idle.put(instance)
+
+    @staticmethod
+    def _ensure_ready(instance: SofficeInstance) -> None:
+        if instance.stale or not instance.is_healthy():
+            instance.restart()
+
+    def warm(self) -> None:
+        """
+        쉬고 있는 인스턴스를 모두 동시에 띄워 첫 변환이 LibreOffice 기동을 기다리지
+        않게 합니다. 시작에 실패한 인스턴스는 다음 사용 때 다시 시도합니다.
+        """
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            with ThreadPoolExecutor(max_workers=max(len(idle), 1)) as executor:
+                futures = [executor.submit(self._ensure_ready, i) for i in idle]
+            for instance, future in zip(idle, futures):
+                if future.exception() is not None:
+                    logger.warning(
+                        f"LibreOffice 인스턴스 미리 띄우기 실패 (slot {instance.slot}): "
+                        f"{future.exception()}"
+                    )
+        finally:
+            for instance in idle:
+                self._idle.put(instance)
+
+    def shutdown(self) -> None:
+        if os.getpid() != self.pid:  # fork로 물려받은 풀은 부모 프로세스 소유
+            return
+        for instance in self._instances:
+            instance.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+_pool: Optional[SofficePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_soffice_pool() -> SofficePool:
+    """프로세스 공용 LibreOffice 풀을 반환합니다 (처음 호출 시 생성)."""
+    global _pool
+    with _pool_lock:
+        # fork된 자식 프로세스는 부모의 인스턴스를 쓰지 않고 자기 풀을 새로 만듦
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = SofficePool()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -1,3 +1,283 @@
-from django.test import TestCase
+import os
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
 
-# Create your tests here.
+from boto3.s3.transfer import TransferConfig
+from django.test import SimpleTestCase, override_settings
+from moto import mock_aws
+from websockets.exceptions import ConnectionClosedError
+from websockets.sync.server import serve
+
+from . import s3_upload, voice
+from .management.commands.tts_ws_standin import _silence, make_handler
+
+
+# ────────────────────────── #
+# TTS 웹소켓 스트리밍 (로컬 대역 서버)
+# ────────────────────────── #
+@contextmanager
+def _standin(**options):
+    """대역 서버를 빈 포트에 띄우고 (URL, 서버 로그 목록)을 돌려줍니다."""
+    events: list[str] = []
+    with serve(make_handler(log=events.append, **options), "127.0.0.1", 0) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"ws://127.0.0.1:{server.socket.getsockname()[1]}", events
+        finally:
+            server.shutdown()
+            thread.join()
+
+
+class WebsocketTTSTests(SimpleTestCase):
+    TEXT = "첫 번째 문장입니다. 두 번째 문장은 조금 더 깁니다!\n마지막 줄"
+
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        for name, value in {
+            "_rate_limiter": voice.TokenBucket(0),
+            "TTS_BACKOFF_BASE": 0.01,
+            "TTS_MAX_RETRIES": 2,
+            "TTS_WS_TIMEOUT": 5,
+        }.items():
+            patcher = mock.patch.object(voice, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _use(self, url: str, output_format: str, audio_ext: str):
+        for name, value in {
+            "ELEVENLABS_WS_URL": url,
+            "OUTPUT_FORMAT": output_format,
+            "AUDIO_EXT": audio_ext,
+        }.items():
+            patcher = mock.patch.object(voice, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _expected_audio(self, output_format: str) -> bytes:
+        # 대역 서버는 문장마다 12자/초 길이의 무음을 보냄
+        return b"".join(
+            _silence(output_format, len(sentence) / 12.0)
+            for sentence in voice.split_sentences(self.TEXT)
+        )
+
+    def test_mp3_frames_are_written_in_order(self):
+        with _standin(frame_bytes=1000) as (url, _):
+            self._use(url, "mp3_44100_128", "mp3")
+            out = self.tmp / "page.mp3"
+            voice.page_to_audio_ws(self.TEXT, str(out), "voice")
+
+        self.assertEqual(out.read_bytes(), self._expected_audio("mp3_44100_128"))
+
+    def test_pcm_frames_are_assembled_into_wav(self):
+        output_format = f"pcm_{voice.PCM_SAMPLE_RATE}"
+        # 홀수 크기 프레임이라 샘플 중간에서 끊긴 프레임도 이어 붙여야 함
+        with _standin(frame_bytes=1001) as (url, _):
+            self._use(url, output_format, "wav")
+            out = self.tmp / "page.wav"
+            voice.page_to_audio_ws(self.TEXT, str(out), "voice")
+
+        with wave.open(str(out), "rb") as wav:
+            self.assertEqual(wav.getnchannels(), 1)
+            self.assertEqual(wav.getsampwidth(), voice.PCM_SAMPLE_WIDTH)
+            self.assertEqual(wav.getframerate(), voice.PCM_SAMPLE_RATE)
+            frames = wav.readframes(wav.getnframes())
+        self.assertEqual(frames, self._expected_audio(output_format))
+
+    def test_dropped_connection_is_retried(self):
+        with _standin(drop_first=1) as (url, events):
+            self._use(url, "mp3_44100_128", "mp3")
+            out = self.tmp / "page.mp3"
+            voice.page_to_audio_ws(self.TEXT, str(out), "voice")
+
+        connections = [event for event in events if event.startswith("연결:")]
+        self.assertEqual(len(connections), 2)
+        # 끊긴 시도에서 받은 오디오는 남지 않음
+        self.assertEqual(out.read_bytes(), self._expected_audio("mp3_44100_128"))
+
+    def test_streamed_input_is_not_retried(self):
+        with _standin(drop_first=1) as (url, events):
+            self._use(url, "mp3_44100_128", "mp3")
+            with self.assertRaises(ConnectionClosedError):
+                voice.page_to_audio_ws(
+                    iter(voice.split_sentences(self.TEXT)),
+                    str(self.tmp / "page.mp3"),
+                    "voice",
+                )
+
+        self.assertEqual(len([e for e in events if e.startswith("연결:")]), 1)
+
+    def test_server_error_message_raises(self):
+        # 대역 서버가 지원하지 않는 형식이면 error 메시지를 보냄
+        with _standin() as (url, events):
+            self._use(url, "mp3_22050_32", "mp3")
+            with self.assertRaisesRegex(RuntimeError, "지원하지 않는 출력 형식"):
+                voice.page_to_audio_ws(self.TEXT, str(self.tmp / "page.mp3"), "voice")
+
+        # 재시도 대상이 아니므로 연결은 한 번뿐
+        self.assertEqual(len([e for e in events if e.startswith("연결:")]), 1)
+
+
+class TTSBackendTests(SimpleTestCase):
+    def test_incomplete_backend_fails_on_creation(self):
+        class Incomplete(voice.TTSBackend):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_registered_backends_are_complete(self):
+        for backend in voice.TTS_BACKENDS.values():
+            self.assertFalse(backend.__abstractmethods__, backend.name)
+
+
+# ────────────────────────── #
+# S3 업로드 (moto)
+# ────────────────────────── #
+PART = s3_upload.MIN_PART_SIZE
+
+
+@mock_aws
+@override_settings(
+    S3_ACCESS_KEY="testing",
+    S3_SECRET_KEY="testing",
+    S3_BUCKET_NAME="lectures",
+    S3_REGION="us-east-1",
+    S3_ENDPOINT_URL=None,
+)
+class S3UploadTests(SimpleTestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "lecture.mp4"
+        # 공용 클라이언트를 moto 안에서 새로 만들도록 비움
+        patcher = mock.patch.object(s3_upload, "_client", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = s3_upload.get_s3_client()
+        self.client.create_bucket(Bucket="lectures")
+        self.calls: list[tuple[int, int]] = []
+
+    def progress(self, uploaded: int, total: int) -> None:
+        self.calls.append((uploaded, total))
+
+    def _object(self, name: str) -> dict:
+        return self.client.get_object(Bucket="lectures", Key=f"class/{name}")
+
+    def _growing(self) -> s3_upload.GrowingFileUpload:
+        upload = s3_upload.GrowingFileUpload(
+            str(self.path), "lecture.mp4", self.progress, poll_interval=0.01
+        )
+        upload.part_size = PART  # 테스트 파일을 작게 유지
+        return upload
+
+    def _wait_for_parts(self, upload, count: int) -> None:
+        deadline = time.monotonic() + 10
+        while len(upload._futures) < count:
+            self.assertLess(time.monotonic(), deadline, "파트 업로드가 시작되지 않음")
+            time.sleep(0.01)
+        for future in upload._futures[:count]:
+            future.result()
+
+    def assertFinalProgress(self, total: int) -> None:
+        self.assertTrue(self.calls)
+        self.assertEqual(self.calls[-1], (total, total))
+        self.assertTrue(all(t == total and u <= total for u, t in self.calls))
+        self.assertEqual([u for u, _ in self.calls], sorted(u for u, _ in self.calls))
+
+    def test_multipart_upload_reports_progress(self):
+        data = os.urandom(2 * PART + 123)
+        self.path.write_bytes(data)
+        config = TransferConfig(
+            multipart_threshold=PART, multipart_chunksize=PART, max_concurrency=2
+        )
+        with mock.patch.object(s3_upload, "TRANSFER_CONFIG", config):
+            url = s3_upload.upload_file_to_s3(
+                str(self.path), "lecture.mp4", self.progress
+            )
+
+        self.assertTrue(url.endswith("/class/lecture.mp4"))
+        obj = self._object("lecture.mp4")
+        self.assertEqual(obj["Body"].read(), data)
+        self.assertIn("-3", obj["ETag"])  # 파트 3개로 올린 객체
+        self.assertEqual(obj["ContentType"], s3_upload.CONTENT_TYPE)
+        self.assertFinalProgress(len(data))
+
+    def test_uploads_parts_while_file_grows(self):
+        self.path.write_bytes(b"")
+        upload = self._growing().start()
+        chunks = [os.urandom(PART // 2 + 1) for _ in range(5)]
+        with open(self.path, "ab") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                f.flush()
+                time.sleep(0.05)
+        self._wait_for_parts(upload, 2)
+        # 전체 크기를 모르는 동안에는 진행률을 보고하지 않음
+        self.assertEqual(self.calls, [])
+
+        upload.finish()
+
+        data = b"".join(chunks)
+        self.assertEqual(self._object("lecture.mp4")["Body"].read(), data)
+        self.assertEqual(len(upload._parts), 3)
+        self.assertFinalProgress(len(data))
+
+    def test_rewritten_part_is_uploaded_again(self):
+        data = bytearray(os.urandom(2 * PART + 10))
+        self.path.write_bytes(data)
+        upload = self._growing().start()
+        self._wait_for_parts(upload, 2)
+
+        # 이미 올린 첫 파트를 고쳐 씀 (예: 대체 렌더러가 파일을 다시 쓰는 경우)
+        data[100:200] = os.urandom(100)
+        with open(self.path, "r+b") as f:
+            f.seek(100)
+            f.write(data[100:200])
+        with self.assertLogs(s3_upload.logger, "WARNING"):
+            upload.finish()
+
+        self.assertEqual(self._object("lecture.mp4")["Body"].read(), bytes(data))
+        self.assertFinalProgress(len(data))
+
+    def test_small_file_uses_single_upload(self):
+        data = os.urandom(1000)
+        self.path.write_bytes(data)
+        upload = self._growing().start()
+
+        upload.finish()
+
+        obj = self._object("lecture.mp4")
+        self.assertEqual(obj["Body"].read(), data)
+        self.assertNotIn("-", obj["ETag"])
+        self.assertIsNone(upload._upload_id)
+        self.assertFinalProgress(len(data))
+
+    def test_failed_part_aborts_multipart_upload(self):
+        self.path.write_bytes(os.urandom(PART + 10))
+        upload = self._growing()
+        real_upload_part = self.client.upload_part
+        calls = 0
+
+        def flaky_upload_part(**kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise RuntimeError("connection reset")
+            return real_upload_part(**kwargs)
+
+        with mock.patch.object(self.client, "upload_part", flaky_upload_part):
+            upload.start()
+            with self.assertRaisesRegex(RuntimeError, "connection reset"):
+                upload.finish()
+
+        uploads = self.client.list_multipart_uploads(Bucket="lectures")
+        self.assertEqual(uploads.get("Uploads", []), [])
+        self.assertNotIn("Contents", self.client.list_objects_v2(Bucket="lectures"))
@@ -0,0 +1,160 @@
+import logging
+import os
+import re
+import unicodedata
+
+from .pdf2text import (
+    find_repeated_edges,
+    is_edge_noise,
+    join_pdf_pages,
+    line_signature,
+    split_pdf_pages,
+)
+
+logger = logging.getLogger(__name__)
+
+# 로컬 정제 결과가 이 점수 이상이면 LLM 정제를 건너뜀 (0~1)
+LOCAL_CLEAN_MIN_SCORE = float(os.getenv("LOCAL_CLEAN_MIN_SCORE", 0.9))
+# 머리글/바닥글 후보로 볼 페이지 앞뒤 줄 수
+EDGE_LINES = 3
+# 전체 페이지 중 이 비율 이상에 같은 위치로 나오면 반복 줄로 판단
+REPEAT_RATIO = 0.5
+MIN_REPEAT_PAGES = 3
+
+# 줄 앞의 장식용 기호(글머리표 등)
+_DECORATION = re.compile(r"^[\s•●○◦▪▫■□◆◇►▶▸▹‣⁃∙·※★☆✓✔➢➤→\-–—*]+")
+_SPACES = re.compile(r"[ \t 　]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _edge_count(line_count: int) -> int:
+    """짧은 페이지에서는 본문까지 머리글/바닥글로 보지 않도록 앞뒤 범위를 줄입니다."""
+    return max(1, min(EDGE_LINES, line_count // 3))
+
+
+def _positions(idx: int, line_count: int) -> list[str]:
+    """idx번째 줄의 위치: 앞쪽 "head", 뒤쪽 "foot" (아주 짧은 페이지는 둘 다)."""
+    edge = _edge_count(line_count)
+    positions = []
+    if idx < edge:
+        positions.append("head")
+    if idx >= line_count - edge:
+        positions.append("foot")
+    return positions
+
+
+def _edge_lines(body: str) -> list[tuple[str, str]]:
+    """페이지 앞뒤 줄을 (위치, 줄) 목록으로 반환합니다."""
+    lines = [line for line in body.splitlines() if line.strip()]
+    return [
+        (position, line)
+        for idx, line in enumerate(lines)
+        for position in _positions(idx, len(lines))
+    ]
+
+
+def _repeated_edges(pages: list[tuple[int, str]]) -> set[tuple[str, str]]:
+    return find_repeated_edges(
+        [_edge_lines(body) for _, body in pages], REPEAT_RATIO, MIN_REPEAT_PAGES
+    )
+
+
+def find_repeated_edge_lines(pages: list[tuple[int, str]]) -> list[str]:
+    """
+    페이지 앞뒤에 반복되는 머리글/바닥글 줄을 원문 그대로 반환합니다
+    (서명마다 처음 나온 줄 하나씩). 분할 정제 때 LLM에 알려줄 힌트로 씁니다.
+    """
+    repeated = _repeated_edges(pages)
+    found: dict[tuple[str, str], str] = {}
+    for _, body in pages:
+        for position, line in _edge_lines(body):
+            key = (position, line_signature(line))
+            if key in repeated:
+                found.setdefault(key, line.strip())
+    return list(dict.fromkeys(found.values()))
+
+
+def _normalize_line(line: str) -> str:
+    line = unicodedata.normalize("NFC", line)
+    # 깨진 문자·제어 문자 제거 (탭은 공백으로)
+    line = "".join(
+        ch
+        for ch in line.replace("\t", " ")
+        if ch != "�" and unicodedata.category(ch) not in ("Cc", "Co", "Cs")
+    )
+    line = _DECORATION.sub("", line)
+    return _SPACES.sub(" ", line).strip()
+
+
+def _clean_page(body: str, repeated: set[tuple[str, str]]) -> str:
+    lines = [line for line in body.splitlines() if line.strip()]
+
+    kept = []
+    for idx, line in enumerate(lines):
+        # 머리글/바닥글·쪽 번호는 페이지 앞뒤 줄에서만 지움 (pdf2text 레이아웃 추출과 같은 규칙)
+        if any(
+            is_edge_noise(position, line, repeated)
+            for position in _positions(idx, len(lines))
+        ):
+            continue
+        normalized = _normalize_line(line)
+        if normalized:
+            kept.append(normalized)
+    return _BLANK_LINES.sub("\n\n", "\n".join(kept)).strip()
+
+
+def text_quality_score(text: str) -> float:
+    """
+    정제된 텍스트가 LLM 정제 없이 쓸 만한지 0~1 점수로 평가합니다.
+
+    - 글자(한글/영문/숫자)와 일반 문장부호의 비율이 높을수록 좋음
+    - 한두 글자짜리 조각 줄이 많을수록 감점 (줄바꿈이 깨진 추출)
+    - 본문이 빈 페이지가 많을수록 감점
+    """
+    pages = split_pdf_pages(text)
+    bodies = [body for _, body in pages] if pages else [text]
+    content = "".join(bodies)
+    if not content.strip():
+        return 0.0
+
+    visible = [ch for ch in content if not ch.isspace()]
+    readable = sum(
+        1
+        for ch in visible
+        if ch.isalnum() or unicodedata.category(ch).startswith("P") or ch in "+=<>%$&"
+    )
+    char_ratio = readable / len(visible)
+
+    lines = [line for body in bodies for line in body.splitlines() if line.strip()]
+    fragments = sum(1 for line in lines if len(line.strip()) <= 2)
+    fragment_ratio = 1 - fragments / len(lines) if lines else 0.0
+
+    filled_ratio = sum(1 for body in bodies if body.strip()) / len(bodies)
+
+    return round(char_ratio * fragment_ratio * filled_ratio, 3)
+
+
+def clean_text_locally(text_content: str) -> tuple[str, float]:
+    """
+    extract_text_from_pdf_content 결과를 LLM 없이 정제합니다.
+
+    페이지 앞뒤에 반복되는 머리글/바닥글, 번호만 있는 줄, 장식용 기호,
+    깨진 문자와 불필요한 공백을 제거하고 '------Page X------' 구조는 유지합니다.
+
+    Returns:
+        (정제된 텍스트, 품질 점수)
+    """
+    pages = split_pdf_pages(text_content)
+    if not pages:
+        return text_content.strip(), 0.0
+
+    repeated = _repeated_edges(pages)
+    cleaned = join_pdf_pages(
+        [(number, _clean_page(body, repeated)) for number, body in pages]
+    )
+    score = text_quality_score(cleaned)
+    logger.info(
+        f"로컬 텍스트 정제 완료: {len(pages)}페이지, 반복 줄 {len(repeated)}종, "
+        f"{len(text_content)}자 → {len(cleaned)}자, 품질 점수 {score}"
+    )
+    return cleaned, score
@@ -0,0 +1,150 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from tokenizers import Tokenizer
+
+from .pdf2text import join_pdf_pages, split_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+# ────────────────────────── #
+# 1. 환경 설정
+# ────────────────────────── #
+# 로컬 tokenizer.json 경로. 이미지 빌드 때 Xenova/gpt-4o의 tokenizer.json을 이 위치에
+# 받아 두며(Dockerfile 참고), 실행 중에는 네트워크에서 받지 않음.
+# 파일이 없거나 읽지 못하면 글자 수로 토큰 수를 추정
+TOKENIZER_PATH = os.getenv(
+    "TOKENIZER_PATH", str(Path(__file__).resolve().parent / "assets" / "tokenizer.json")
+)
+# 메시지 하나당 역할·구분자에 쓰이는 대략적인 추가 토큰 수
+MESSAGE_OVERHEAD_TOKENS = 4
+OMITTED_MARKER = "\n...(생략)..."
+
+_tokenizer: Optional[Tokenizer] = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+
+def prompt_budget(name: str, default: int) -> int:
+    """
+    프롬프트별 입력 토큰 예산을 반환합니다.
+    환경 변수 {NAME}_PROMPT_TOKENS로 덮어쓸 수 있습니다 (예: LESSON_SCRIPT_PROMPT_TOKENS).
+    """
+    return int(os.getenv(f"{name.upper()}_PROMPT_TOKENS", default))
+
+
+# ────────────────────────── #
+# 2. 토큰 계산
+# ────────────────────────── #
+def _get_tokenizer() -> Optional[Tokenizer]:
+    """토크나이저를 한 번만 불러옵니다. 불러오지 못하면 글자 수 기반 추정을 사용합니다."""
+    global _tokenizer, _tokenizer_loaded
+    with _tokenizer_lock:
+        if not _tokenizer_loaded:
+            _tokenizer_loaded = True
+            try:
+                _tokenizer = Tokenizer.from_file(TOKENIZER_PATH)
+                logger.info(f"토크나이저 로드 완료 ({TOKENIZER_PATH})")
+            except Exception as e:
+                logger.warning(f"토크나이저 로드 실패, 글자 수로 토큰 수를 추정합니다: {e}")
+        return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수를 셉니다."""
+    if not text:
+        return 0
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        # 한글 위주 텍스트는 대략 2자당 1토큰
+        return len(text) // 2 + 1
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def count_message_tokens(messages: list[dict]) -> int:
+    """Chat Completions 메시지 목록의 입력 토큰 수를 셉니다."""
+    return sum(
+        count_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+def log_prompt_tokens(name: str, messages: list[dict], budget: int) -> int:
+    """프롬프트 토큰 수를 기록하고 반환합니다. 예산을 넘으면 경고합니다."""
+    tokens = count_message_tokens(messages)
+    if tokens > budget:
+        logger.warning(f"프롬프트 토큰 수 초과 ({name}): {tokens} / {budget}")
+    else:
+        logger.info(f"프롬프트 토큰 수 ({name}): {tokens} / {budget}")
+    return tokens
+
+
+# ────────────────────────── #
+# 3. 입력 압축
+# ────────────────────────── #
+def fit_text(text: str, max_tokens: int) -> str:
+    """text가 max_tokens를 넘으면 앞부분만 남기고 생략 표시를 붙입니다."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    keep = max(max_tokens - count_tokens(OMITTED_MARKER), 0)
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        end = keep * 2
+    else:
+        offsets = tokenizer.encode(text, add_special_tokens=False).offsets
+        end = offsets[keep - 1][1] if keep else 0
+    return text[:end].rstrip() + OMITTED_MARKER
+
+
+def fit_items(items: list[str], max_tokens: int, separator_tokens: int = 0) -> list[str]:
+    """
+    항목 목록 전체가 max_tokens 안에 들도록 긴 항목부터 줄입니다.
+
+    짧은 항목은 그대로 두고 남는 예산을 긴 항목들에 똑같이 나누므로,
+    어느 항목도 통째로 빠지지 않습니다. separator_tokens는 항목마다 붙는
+    구분자(페이지 머리 등)의 토큰 수입니다.
+    """
+    sizes = [count_tokens(item) for item in items]
+    if sum(sizes) + separator_tokens * len(items) <= max_tokens:
+        return items
+
+    remaining = max_tokens - separator_tokens * len(items)
+    left = len(items)
+    cap = max(sizes, default=0)
+    for size in sorted(sizes):
+        share = remaining // left if left else 0
+        if size > share:
+            cap = share
+            break
+        remaining -= size
+        left -= 1
+    return [fit_text(item, cap) for item in items]
+
+
+def compact_pages(text: str, max_tokens: int) -> str:
+    """
+    '------Page X------'로 구분된 텍스트를 max_tokens 안으로 줄입니다.
+    페이지 구조는 유지하고 각 페이지의 뒷부분부터 잘라냅니다.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    pages = split_pdf_pages(text)
+    if not pages:
+        return fit_text(text, max_tokens)
+
+    marker_tokens = count_tokens(f"------Page {pages[-1][0]}------\n\n")
+    bodies = fit_items([body for _, body in pages], max_tokens, marker_tokens)
+    compacted = join_pdf_pages(
+        [(number, body) for (number, _), body in zip(pages, bodies)]
+    )
+    logger.info(
+        f"텍스트 압축: {count_tokens(text)} → {count_tokens(compacted)} 토큰 "
+        f"(예산 {max_tokens})"
+    )
+    return compacted
@@ -1,9 +1,15 @@
 from django.urls import path
 
-from .views import UploadLectureView, LectureListView, LectureDetailView
+from .views import (
+    UploadLectureView,
+    LectureListView,
+    LectureDetailView,
+    LectureJobDetailView,
+)
 
 urlpatterns = [
     path("lectures", UploadLectureView.as_view(), name="upload_lecture"),
     path("lectures/", LectureListView.as_view(), name="lecture_list"),
     path("lectures/<int:id>", LectureDetailView.as_view(), name="lecture_detail"),
+    path("jobs/<int:id>", LectureJobDetailView.as_view(), name="lecture_job_detail"),
 ]
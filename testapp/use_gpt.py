@@ -1,33 +1,64 @@
 import logging
 import os
+import re
 import subprocess
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 
 import openai
-from openai import OpenAI
+
+from .llm import (
+    API_KEY,
+    LLM_MAX_CONCURRENCY,
+    chat_completion,
+    chat_completion_stream,
+    get_client,
+)
+from .pdf2text import join_pdf_pages, split_pdf_pages
+from .script_runner import run_python_script
+from .text_cleaner import find_repeated_edge_lines
+from .token_budget import (
+    compact_pages,
+    count_message_tokens,
+    count_tokens,
+    fit_items,
+    fit_text,
+    log_prompt_tokens,
+    prompt_budget,
+)
 
 logger = logging.getLogger(__name__)
 
-API_KEY = os.getenv("OPENAI_API_KEY", "YOUR_FALLBACK_API_KEY")
 MODEL_NAME = "gpt-4o"
 
+# 대본의 페이지 구분 마커 ("=== Page N ===")
+PAGE_MARKER = re.compile(r"=== Page \d+ ===")
+
+# 슬라이드별 대본 생성 모드의 동시 요청 수와 슬라이드별 재시도 횟수
+SCRIPT_MAX_WORKERS = int(os.getenv("SCRIPT_MAX_WORKERS", LLM_MAX_CONCURRENCY))
+SCRIPT_SLIDE_RETRIES = int(os.getenv("SCRIPT_SLIDE_RETRIES", 2))
+
+# 분할 정제 시 창 하나의 최대 토큰 수
+CLEAN_WINDOW_TOKENS = int(os.getenv("CLEAN_WINDOW_TOKENS", 6000))
+
+# 프롬프트별 입력 토큰 예산 ({NAME}_PROMPT_TOKENS로 변경 가능)
+PPT_STRUCTURE_BUDGET = prompt_budget("ppt_structure", 24000)
+LESSON_SCRIPT_BUDGET = prompt_budget("lesson_script", 24000)
+SLIDE_SCRIPT_BUDGET = prompt_budget("slide_script", 4000)
+CLEAN_TEXT_BUDGET = prompt_budget("clean_text", 12000)  # 응답도 비슷한 길이
+PPT_CODE_BUDGET = prompt_budget("ppt_code", 24000)
+
 
 def get_openai_client(api_key: str = API_KEY) -> Optional[openai.OpenAI]:
-    """OpenAI 클라이언트를 초기화하고 반환합니다. 실패 시 None을 반환합니다."""
+    """공용 OpenAI 클라이언트를 반환합니다. 실패 시 None을 반환합니다."""
     if not api_key or api_key == "YOUR_FALLBACK_API_KEY":
         logger.error(
             "OpenAI API 키가 설정되지 않았습니다. 환경 변수 'OPENAI_API_KEY' 또는 함수 인자를 확인하세요."
         )
         return None
     try:
-        client = openai.OpenAI(api_key=API_KEY)
-        logger.info("OpenAI 클라이언트가 성공적으로 초기화되었습니다.")
-        return client
-    except openai.AuthenticationError:
-        logger.error("OpenAI 인증 실패. API 키가 올바른지 확인하세요.")
-        return None
+        return get_client(api_key=api_key)
     except Exception as e:
         logger.error(
             f"OpenAI 클라이언트 초기화 중 예상치 못한 오류 발생: {e}", exc_info=True
@@ -41,6 +72,7 @@ def generate_ppt_structure(
     description: str = "",
     model: str = MODEL_NAME,
     custom_api_key: Optional[str] = None,
+    use_cache: bool = True,
 ) -> Optional[str]:
     """텍스트를 PPT 구조로 변환합니다."""
     text_content = ""
@@ -80,7 +112,8 @@ def generate_ppt_structure(
     7.  **언어**: 결과는 한국어로 작성합니다.
     """
 
-    user_message = f"""
+    def build_messages(text: str) -> list[dict]:
+        user_message = f"""
     다음 텍스트 내용과 강의 설명을 기반으로 파워포인트 프레젠테이션 슬라이드 구조를 생성해주세요:
 
     --- 강의 설명 ---
@@ -88,31 +121,35 @@ def generate_ppt_structure(
     --- 강의 설명 끝 ---
 
     --- 원본 텍스트 시작 ---
-    {text_content}
+    {text}
     --- 원본 텍스트 끝 ---
     """
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message},
+        ]
+
+    # 예산을 넘는 원본 텍스트는 페이지 구조를 유지한 채 압축
+    text_content = compact_pages(
+        text_content, PPT_STRUCTURE_BUDGET - count_message_tokens(build_messages(""))
+    )
+    messages = build_messages(text_content)
+    log_prompt_tokens("ppt_structure", messages, PPT_STRUCTURE_BUDGET)
 
-    try:
-        client = openai.OpenAI(api_key=openai.api_key)
-        logger.info("OpenAI 클라이언트가 성공적으로 초기화되었습니다.")
-        return client
-    except openai.AuthenticationError:
-        logger.error("OpenAI 인증 실패. API 키가 올바른지 확인하세요.")
+    client = get_openai_client(api_key=custom_api_key or API_KEY)
+    if not client:
         return None
 
     structured_content = None
     try:
         logger.info(f"OpenAI 모델({model})에 PPT 구조 생성 요청을 보냅니다...")
-        response = client.chat.completions.create(
+        structured_content_msg = chat_completion(
+            client,
             model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message},
-            ],
+            messages=messages,
             temperature=0.5,
+            use_cache=use_cache,
         )
-
-        structured_content_msg = response.choices[0].message.content
         if structured_content_msg:
             structured_content = structured_content_msg.strip()
             if not structured_content:
@@ -154,42 +191,10 @@ def generate_ppt_structure(
         return None
 
 
-def generate_lesson_script(
-    input_text_file: str,
-    output_script_file: str,
-    description: str = "",
-    model: str = MODEL_NAME,
-    custom_api_key: Optional[str] = None,
-    ppt_structure: Optional[List[str]] = None,
-) -> Optional[str]:
-    """입력 텍스트 파일의 내용을 바탕으로 수업 대본을 생성하고 지정된 파일에 저장합니다."""
-    input_text = ""
-    try:
-        logger.info(f"'{input_text_file}' 파일 읽기 시도...")
-        with open(input_text_file, "r", encoding="utf-8") as f:
-            input_text = f.read()
-        if not input_text.strip():
-            logger.warning(
-                f"'{input_text_file}' 파일이 비어있습니다. 내용을 확인해주세요."
-            )
-            return None
-        logger.info(
-            f"'{input_text_file}' 파일 읽기 완료 (내용 길이: {len(input_text)}자)."
-        )
-    except FileNotFoundError:
-        logger.error(
-            f"입력 파일 '{input_text_file}'을(를) 찾을 수 없습니다. 파일 경로를 확인해주세요."
-        )
-        return None
-    except Exception as e:
-        logger.error(f"'{input_text_file}' 파일 읽기 중 오류 발생: {e}", exc_info=True)
-        return None
-
-    api_key_to_use = custom_api_key if custom_api_key else API_KEY
-    client = get_openai_client(api_key=api_key_to_use)
-    if not client:
-        return None
-
+def _build_lesson_script_messages(
+    input_text: str, description: str, ppt_structure: Optional[List[str]]
+) -> list[dict]:
+    """수업 대본 생성 요청 메시지를 만듭니다."""
     # PPT 구조가 있는 경우 프롬프트에 포함
     ppt_context = ""
     if ppt_structure:
@@ -232,21 +237,98 @@ def generate_lesson_script(
     12. 마지막 페이지는 "=== Page N ===" 형식으로 명확히 구분되어야 합니다.
     """
 
+    return [
+        {
+            "role": "system",
+            "content": "당신은 교육 전문가입니다. 주어진 내용을 바탕으로 명확하고 이해하기 쉬운 강의 대본을 작성해주세요. 각 슬라이드의 내용을 자연스럽게 설명하는 방식으로 작성해주세요.",
+        },
+        {"role": "user", "content": prompt_instructions},
+    ]
+
+
+def _lesson_script_messages(
+    input_text: str,
+    description: str,
+    ppt_structure: Optional[List[str]],
+    budget: int = LESSON_SCRIPT_BUDGET,
+) -> list[dict]:
+    """
+    수업 대본 생성 요청 메시지를 budget 토큰 안으로 만듭니다.
+
+    PPT 구조가 있으면 구조를 우선 넣고 원본 텍스트는 남는 예산만큼만 넣습니다.
+    남는 예산에 원본이 들어가지 않으면 슬라이드 구조가 내용을 대신하므로 원본을 뺍니다.
+    """
+    if ppt_structure:
+        overhead = count_message_tokens(
+            _build_lesson_script_messages("", description, [""] * len(ppt_structure))
+        )
+        ppt_structure = fit_items(ppt_structure, budget - overhead)
+
+    remaining = budget - count_message_tokens(
+        _build_lesson_script_messages("", description, ppt_structure)
+    )
+    if count_tokens(input_text) > remaining:
+        if ppt_structure:
+            logger.info(
+                "원본 텍스트가 예산을 넘어 PPT 슬라이드 구조만으로 대본을 요청합니다."
+            )
+            input_text = "(원본 텍스트 생략: 아래 PPT 슬라이드 구조를 기준으로 작성)"
+        else:
+            input_text = compact_pages(input_text, remaining)
+
+    messages = _build_lesson_script_messages(input_text, description, ppt_structure)
+    log_prompt_tokens("lesson_script", messages, budget)
+    return messages
+
+
+def generate_lesson_script(
+    input_text_file: str,
+    output_script_file: str,
+    description: str = "",
+    model: str = MODEL_NAME,
+    custom_api_key: Optional[str] = None,
+    ppt_structure: Optional[List[str]] = None,
+    use_cache: bool = True,
+) -> Optional[str]:
+    """입력 텍스트 파일의 내용을 바탕으로 수업 대본을 생성하고 지정된 파일에 저장합니다."""
+    input_text = ""
+    try:
+        logger.info(f"'{input_text_file}' 파일 읽기 시도...")
+        with open(input_text_file, "r", encoding="utf-8") as f:
+            input_text = f.read()
+        if not input_text.strip():
+            logger.warning(
+                f"'{input_text_file}' 파일이 비어있습니다. 내용을 확인해주세요."
+            )
+            return None
+        logger.info(
+            f"'{input_text_file}' 파일 읽기 완료 (내용 길이: {len(input_text)}자)."
+        )
+    except FileNotFoundError:
+        logger.error(
+            f"입력 파일 '{input_text_file}'을(를) 찾을 수 없습니다. 파일 경로를 확인해주세요."
+        )
+        return None
+    except Exception as e:
+        logger.error(f"'{input_text_file}' 파일 읽기 중 오류 발생: {e}", exc_info=True)
+        return None
+
+    api_key_to_use = custom_api_key if custom_api_key else API_KEY
+    client = get_openai_client(api_key=api_key_to_use)
+    if not client:
+        return None
+
+    messages = _lesson_script_messages(input_text, description, ppt_structure)
+
     try:
         logger.info(f"OpenAI 모델({model})에 대본 생성 요청을 보냅니다...")
-        response = client.chat.completions.create(
+        script_content = chat_completion(
+            client,
             model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "당신은 교육 전문가입니다. 주어진 내용을 바탕으로 명확하고 이해하기 쉬운 강의 대본을 작성해주세요. 각 슬라이드의 내용을 자연스럽게 설명하는 방식으로 작성해주세요.",
-                },
-                {"role": "user", "content": prompt_instructions},
-            ],
+            messages=messages,
             temperature=0.7,
+            use_cache=use_cache,
         )
-
-        script_content = response.choices[0].message.content
         if not script_content:
             logger.warning("OpenAI 응답의 content 필드가 비어 있습니다.")
             return None
@@ -283,16 +365,238 @@ def generate_lesson_script(
         return None
 
 
-def clean_text_with_llm(text_content: str, api_key: str, model: str) -> Optional[str]:
-    """LLM을 사용하여 텍스트를 정제합니다."""
-    if not api_key or api_key.startswith("YOUR_"):
-        logger.error("OpenAI API 키가 올바르게 설정되지 않았습니다.")
+def stream_lesson_script_pages(
+    input_text_file: str,
+    output_script_file: str,
+    description: str = "",
+    model: str = MODEL_NAME,
+    custom_api_key: Optional[str] = None,
+    ppt_structure: Optional[List[str]] = None,
+    use_cache: bool = True,
+) -> Iterator[str]:
+    """
+    수업 대본을 스트리밍으로 생성하면서 완성된 페이지를 순서대로 내보냅니다.
+
+    "=== Page N ===" 마커가 새로 나타나면 직전 페이지가 끝난 것으로 보고 바로
+    내보내므로, 뒤 페이지가 생성되는 동안 앞 페이지의 TTS를 시작할 수 있습니다.
+    스트림이 끝나면 전체 대본을 output_script_file에 저장합니다.
+    페이지 분리 규칙은 voice.split_pages와 같습니다 (빈 페이지 제외).
+    """
+    input_text = Path(input_text_file).read_text(encoding="utf-8")
+    if not input_text.strip():
+        raise RuntimeError(f"'{input_text_file}' 파일이 비어있습니다.")
+
+    client = get_openai_client(api_key=custom_api_key or API_KEY)
+    if not client:
+        raise RuntimeError("OpenAI 클라이언트 초기화 실패")
+
+    messages = _lesson_script_messages(input_text, description, ppt_structure)
+    logger.info(f"OpenAI 모델({model})에 대본 스트리밍 요청을 보냅니다...")
+
+    buffer = ""
+    page_start = 0  # 현재 페이지 본문이 시작되는 위치
+    page_count = 0
+    for delta in chat_completion_stream(
+        client, model=model, messages=messages, temperature=0.7, use_cache=use_cache
+    ):
+        buffer += delta
+        for match in PAGE_MARKER.finditer(buffer, page_start):
+            page = buffer[page_start : match.start()].strip()
+            if page:
+                page_count += 1
+                yield page
+            page_start = match.end()
+
+    page = buffer[page_start:].strip()
+    if page:
+        page_count += 1
+        yield page
+
+    Path(output_script_file).write_text(buffer, encoding="utf-8")
+    logger.info(f"스트리밍 대본 저장 완료: '{output_script_file}' ({page_count}페이지)")
+    if page_count < 2:  # 최소 소개·요약 페이지
+        raise RuntimeError("생성된 대본의 페이지 수가 부족합니다.")
+
+
+def _deck_outline(ppt_structure: List[str]) -> str:
+    """슬라이드 제목(첫 줄)만 모은 간단한 전체 목차를 만듭니다."""
+    lines = []
+    for i, content in enumerate(ppt_structure, start=1):
+        title = content.strip().splitlines()[0] if content.strip() else ""
+        lines.append(f"{i}. {title}")
+    return "\n".join(lines)
+
+
+def _build_slide_script_messages(
+    index: int, total: int, slide: str, outline: str, description: str
+) -> list[dict]:
+    """슬라이드 한 장의 대본 생성 요청 메시지를 만듭니다."""
+    if index == 1:
+        role = "첫 페이지입니다. 강의 소개와 목차를 포함해주세요."
+    elif index == total:
+        role = "마지막 페이지입니다. 전체 내용의 요약을 포함해주세요."
+    else:
+        role = "앞뒤 슬라이드와 자연스럽게 이어지도록 설명해주세요."
+
+    prompt = f"""
+    아래 강의의 {index}/{total}번 슬라이드에 대한 발표 대본을 작성해주세요.
+    {role}
+
+    **강의 설명:**
+    ---
+    {description}
+    ---
+
+    **전체 슬라이드 목차 (흐름 참고용):**
+    ---
+    {outline}
+    ---
+
+    **이번 슬라이드 내용:**
+    ---
+    {slide}
+    ---
+
+    **대본 작성 요구사항:**
+    1. 자연스러운 한국어 구어체로, 2-3분 정도 발표할 수 있는 분량으로 작성해주세요.
+    2. 슬라이드 내용을 그대로 읽지 말고, 이해하기 쉽게 풀어서 설명해주세요.
+    3. 전문 용어는 쉽게 설명해주세요.
+    4. "=== Page N ===" 같은 페이지 구분자나 제목 없이 대본 본문만 작성해주세요.
+    """
+    return [
+        {
+            "role": "system",
+            "content": "당신은 교육 전문가입니다. 주어진 슬라이드 한 장을 자연스럽게 설명하는 강의 대본을 작성해주세요.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _slide_script_messages(
+    index: int,
+    ppt_structure: List[str],
+    outline: str,
+    description: str,
+    budget: int = SLIDE_SCRIPT_BUDGET,
+) -> list[dict]:
+    """슬라이드 한 장의 대본 생성 요청 메시지를 budget 토큰 안으로 만듭니다."""
+    total = len(ppt_structure)
+    slide = ppt_structure[index - 1]
+    messages = _build_slide_script_messages(index, total, slide, outline, description)
+    if count_message_tokens(messages) > budget:
+        overhead = count_message_tokens(
+            _build_slide_script_messages(index, total, "", outline, description)
+        )
+        slide = fit_text(slide, budget - overhead)
+        messages = _build_slide_script_messages(
+            index, total, slide, outline, description
+        )
+    log_prompt_tokens(f"slide_script {index}", messages, budget)
+    return messages
+
+
+def generate_lesson_script_per_slide(
+    input_text_file: str,
+    output_script_file: str,
+    description: str = "",
+    model: str = MODEL_NAME,
+    custom_api_key: Optional[str] = None,
+    ppt_structure: Optional[List[str]] = None,
+    use_cache: bool = True,
+    max_workers: int = SCRIPT_MAX_WORKERS,
+) -> Optional[str]:
+    """
+    슬라이드마다 따로 대본을 생성해 순서대로 합칩니다.
+
+    각 요청에는 해당 슬라이드 내용과 전체 목차만 넣어 병렬로 보내므로, 지연 시간은
+    가장 느린 슬라이드 하나 수준이 됩니다. 실패한 슬라이드는 그 슬라이드만 재시도합니다.
+    ppt_structure가 없으면 generate_lesson_script로 대체합니다.
+    반환값과 저장 형식("=== Page N ===")은 generate_lesson_script와 같습니다.
+    """
+    if not ppt_structure:
+        logger.warning("PPT 구조가 없어 전체 대본 생성 방식으로 대체합니다.")
+        return generate_lesson_script(
+            input_text_file=input_text_file,
+            output_script_file=output_script_file,
+            description=description,
+            model=model,
+            custom_api_key=custom_api_key,
+            use_cache=use_cache,
+        )
+
+    client = get_openai_client(api_key=custom_api_key or API_KEY)
+    if not client:
         return None
 
-    logger.info(f"OpenAI 모델 ({model})을 사용하여 텍스트 정제 시작...")
+    # 목차는 모든 요청에 들어가므로 예산의 절반까지만 사용
+    outline = fit_text(_deck_outline(ppt_structure), SLIDE_SCRIPT_BUDGET // 2)
+
+    def generate_slide(index: int) -> str:
+        messages = _slide_script_messages(index, ppt_structure, outline, description)
+        for attempt in range(SCRIPT_SLIDE_RETRIES + 1):
+            try:
+                content = chat_completion(
+                    client,
+                    model=model,
+                    messages=messages,
+                    temperature=0.7,
+                    use_cache=use_cache,
+                )
+                page = PAGE_MARKER.sub("", content or "").strip()
+                if page:
+                    return page
+                logger.warning(f"슬라이드 {index} 대본 응답이 비어 있습니다.")
+            except Exception as e:
+                logger.warning(f"슬라이드 {index} 대본 생성 실패: {e}")
+            if attempt < SCRIPT_SLIDE_RETRIES:
+                logger.info(
+                    f"슬라이드 {index} 대본 재시도 ({attempt + 1}/{SCRIPT_SLIDE_RETRIES})"
+                )
+        raise RuntimeError(f"슬라이드 {index} 대본 생성 실패")
+
+    logger.info(
+        f"OpenAI 모델({model})에 슬라이드별 대본 생성 요청을 보냅니다 "
+        f"({len(ppt_structure)}장, 동시 {max_workers}개)..."
+    )
     try:
-        client = OpenAI(api_key=api_key)
-        prompt = f"""
+        with ThreadPoolExecutor(
+            max_workers=max(max_workers, 1), thread_name_prefix="script"
+        ) as pool:
+            pages = list(pool.map(generate_slide, range(1, len(ppt_structure) + 1)))
+    except Exception as e:
+        logger.error(f"슬라이드별 대본 생성 중 오류 발생: {e}", exc_info=True)
+        return None
+
+    script_content = "\n\n".join(
+        f"=== Page {i} ===\n{page}" for i, page in enumerate(pages, start=1)
+    )
+    try:
+        with open(output_script_file, "w", encoding="utf-8") as f:
+            f.write(script_content)
+        logger.info(
+            f"생성된 대본을 '{output_script_file}' 파일로 성공적으로 저장했습니다."
+        )
+    except IOError as e:
+        logger.error(
+            f"'{output_script_file}' 파일 저장 중 입출력 오류 발생: {e}", exc_info=True
+        )
+        return None
+    return script_content
+
+
+def _clean_text_messages(
+    text_content: str, repeated_lines: Optional[List[str]] = None
+) -> list[dict]:
+    """텍스트 정제 요청 메시지를 만듭니다."""
+    hint = ""
+    if repeated_lines:
+        # 분할 정제 시 창 하나만 보고는 알 수 없는, 문서 전체에서 반복되는 줄
+        hint = (
+            "\n참고: 다음 줄들은 문서 전체에서 여러 페이지에 반복되는 머리글/바닥글입니다. 제거하세요.\n"
+            + "\n".join(f"- {line}" for line in repeated_lines)
+            + "\n"
+        )
+    prompt = f"""
 다음 텍스트는 PDF 프레젠테이션에서 페이지별로 추출되었습니다.
 페이지는 '------Page X------'로 구분됩니다.
 
@@ -302,27 +606,53 @@ def clean_text_with_llm(text_content: str, api_key: str, model: str) -> Optional
 3. 페이지 내용 자체에 포함된 슬라이드 번호나 페이지 번호를 제거합니다.
 4. 장식용 기호, 불필요한 공백, 깨진 문자를 제거합니다.
 5. 최종 결과는 페이지 구조를 유지하면서, 각 페이지 내용이 자연스럽게 읽히도록 합니다.
-
+{hint}
 --- 원본 텍스트 시작 ---
 {text_content}
 --- 원본 텍스트 끝 ---
 
 정제된 텍스트:
 """
+    return [
+        {
+            "role": "system",
+            "content": "당신은 텍스트 정제 전문가입니다. PDF 프레젠테이션에서 추출된 텍스트의 페이지 구조를 유지하면서 머리글/바닥글, 페이지 번호, 노이즈를 제거하여 가독성을 높이는 역할을 합니다.",
+        },
+        {"role": "user", "content": prompt},
+    ]
 
-        response = client.chat.completions.create(
+
+def clean_text_with_llm(
+    text_content: str, api_key: str, model: str, use_cache: bool = True
+) -> Optional[str]:
+    """LLM을 사용하여 텍스트를 정제합니다."""
+    if not api_key or api_key.startswith("YOUR_"):
+        logger.error("OpenAI API 키가 올바르게 설정되지 않았습니다.")
+        return None
+
+    # 정제 결과는 입력과 길이가 비슷하므로 자를 수 없음 → 예산을 넘으면 분할 정제
+    messages = _clean_text_messages(text_content)
+    if count_message_tokens(messages) > CLEAN_TEXT_BUDGET:
+        pages = split_pdf_pages(text_content)
+        if len(_page_windows(pages, CLEAN_WINDOW_TOKENS)) > 1:
+            logger.info("정제할 텍스트가 예산을 넘어 분할 정제로 전환합니다.")
+            return clean_text_with_llm_chunked(
+                text_content, api_key, model, use_cache=use_cache
+            )
+    log_prompt_tokens("clean_text", messages, CLEAN_TEXT_BUDGET)
+
+    logger.info(f"OpenAI 모델 ({model})을 사용하여 텍스트 정제 시작...")
+    try:
+        client = get_client(api_key=api_key)
+        content = chat_completion(
+            client,
             model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "당신은 텍스트 정제 전문가입니다. PDF 프레젠테이션에서 추출된 텍스트의 페이지 구조를 유지하면서 머리글/바닥글, 페이지 번호, 노이즈를 제거하여 가독성을 높이는 역할을 합니다.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+            messages=messages,
             temperature=0.2,
+            use_cache=use_cache,
         )
 
-        cleaned_text = response.choices[0].message.content.strip()
+        cleaned_text = content.strip()
         logger.info("OpenAI API를 통한 텍스트 정제 성공.")
         return cleaned_text
 
@@ -331,6 +661,92 @@ def clean_text_with_llm(text_content: str, api_key: str, model: str) -> Optional
         return None
 
 
+def _page_windows(
+    pages: list[tuple[int, str]], window_tokens: int
+) -> list[list[tuple[int, str]]]:
+    """페이지를 순서대로 묶어 window_tokens를 넘지 않는 창들로 나눕니다."""
+    windows: list[list[tuple[int, str]]] = []
+    current: list[tuple[int, str]] = []
+    current_tokens = 0
+    for page in pages:
+        tokens = count_tokens(page[1]) + 10  # 구분자 몫
+        if current and current_tokens + tokens > window_tokens:
+            windows.append(current)
+            current, current_tokens = [], 0
+        current.append(page)
+        current_tokens += tokens
+    if current:
+        windows.append(current)
+    return windows
+
+
+def clean_text_with_llm_chunked(
+    text_content: str,
+    api_key: str,
+    model: str,
+    use_cache: bool = True,
+    window_tokens: int = CLEAN_WINDOW_TOKENS,
+    max_workers: int = LLM_MAX_CONCURRENCY,
+) -> Optional[str]:
+    """
+    큰 PDF 텍스트를 '------Page X------' 단위로 묶은 창으로 나눠 병렬로 정제한 뒤
+    페이지 순서대로 다시 합칩니다 (map-reduce).
+
+    반복되는 머리글/바닥글은 창을 나누기 전에 문서 전체에서 찾아 각 창의 프롬프트에
+    알려주므로, 창 경계를 넘어서도 제거됩니다. 정제에 실패하거나 구분자를 잃은 창은
+    원본 텍스트를 그대로 사용합니다. 창이 하나뿐이면 clean_text_with_llm과 같습니다.
+    """
+    pages = split_pdf_pages(text_content)
+    windows = _page_windows(pages, window_tokens) if pages else []
+    if len(windows) <= 1:
+        return clean_text_with_llm(text_content, api_key, model, use_cache=use_cache)
+
+    if not api_key or api_key.startswith("YOUR_"):
+        logger.error("OpenAI API 키가 올바르게 설정되지 않았습니다.")
+        return None
+
+    client = get_client(api_key=api_key)
+    # 페이지 앞뒤 위치에 반복되는 줄만 (본문에서 반복되는 제목·수식은 제외)
+    repeated_lines = find_repeated_edge_lines(pages)
+    logger.info(
+        f"텍스트 분할 정제 시작: {len(pages)}페이지 → {len(windows)}개 창, "
+        f"반복 줄 {len(repeated_lines)}개"
+    )
+
+    def clean_window(window: list[tuple[int, str]]) -> str:
+        raw = join_pdf_pages(window)
+        messages = _clean_text_messages(raw, repeated_lines)
+        log_prompt_tokens(
+            f"clean_text {window[0][0]}-{window[-1][0]}", messages, CLEAN_TEXT_BUDGET
+        )
+        try:
+            content = chat_completion(
+                client,
+                model=model,
+                messages=messages,
+                temperature=0.2,
+                use_cache=use_cache,
+            )
+            cleaned = (content or "").strip()
+            # 구분자가 모두 남아 있어야 페이지 구조가 유지된 것으로 봄
+            if len(split_pdf_pages(cleaned)) != len(window):
+                raise ValueError("정제 결과에서 페이지 구분자가 누락되었습니다.")
+            return cleaned
+        except Exception as e:
+            logger.warning(
+                f"페이지 {window[0][0]}-{window[-1][0]} 정제 실패, 원본 사용: {e}"
+            )
+            return raw
+
+    with ThreadPoolExecutor(
+        max_workers=max(max_workers, 1), thread_name_prefix="clean"
+    ) as pool:
+        cleaned_windows = list(pool.map(clean_window, windows))
+
+    logger.info("텍스트 분할 정제 완료.")
+    return "\n\n".join(cleaned_windows)
+
+
 def generate_and_execute_ppt_code(
     input_lecture_file: str,
     output_code_file: str,
@@ -340,6 +756,7 @@ def generate_and_execute_ppt_code(
     openai_api_key: str,
     model: str = MODEL_NAME,
     execute_code: bool = True,
+    use_cache: bool = True,
 ) -> Optional[str]:
     """
     강의 내용 텍스트 파일을 기반으로 python-pptx 코드를 생성하고,
@@ -380,36 +797,46 @@ def generate_and_execute_ppt_code(
         logger.error(f"입력 파일 읽기 중 오류 발생: {e}", exc_info=True)
         return None
 
-    full_prompt = (
-        f"{api_prompt_text}\n"
-        "---\n"
-        "--- 예시 입력 ---\n"
-        f"{example_input_text}\n"
-        "---\n"
-        "--- 예시 출력 ---\n"
-        f"{example_output_code}\n"
-        "---\n"
-        "위 예시를 참고하여, 아래 실제 수업 내용에 대해 완전한 Python 스크립트를 생성해 주세요.\n"
-        "[수업 내용 시작]\n"
-        f"{lecture_content}\n"
-        "[수업 내용 끝]"
+    def build_prompt(content: str) -> str:
+        return (
+            f"{api_prompt_text}\n"
+            "---\n"
+            "--- 예시 입력 ---\n"
+            f"{example_input_text}\n"
+            "---\n"
+            "--- 예시 출력 ---\n"
+            f"{example_output_code}\n"
+            "---\n"
+            "위 예시를 참고하여, 아래 실제 수업 내용에 대해 완전한 Python 스크립트를 생성해 주세요.\n"
+            "[수업 내용 시작]\n"
+            f"{content}\n"
+            "[수업 내용 끝]"
+        )
+
+    system_message = "You are an AI assistant that generates complete Python scripts using the python-pptx library based on provided lecture content and formatting instructions. Only return valid Python code. Do not include any text, explanation, or formatting."
+
+    def build_messages(content: str) -> list[dict]:
+        return [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": build_prompt(content)},
+        ]
+
+    lecture_content = compact_pages(
+        lecture_content, PPT_CODE_BUDGET - count_message_tokens(build_messages(""))
     )
+    messages = build_messages(lecture_content)
+    log_prompt_tokens("ppt_code", messages, PPT_CODE_BUDGET)
 
     generated_code = None
     try:
         logger.info(f"OpenAI API 요청 전송 (모델: {model})...")
-        response = client.chat.completions.create(
+        raw_generated_content = chat_completion(
+            client,
             model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an AI assistant that generates complete Python scripts using the python-pptx library based on provided lecture content and formatting instructions. Only return valid Python code. Do not include any text, explanation, or formatting.",
-                },
-                {"role": "user", "content": full_prompt},
-            ],
+            messages=messages,
             temperature=0.5,
+            use_cache=use_cache,
         )
-        raw_generated_content = response.choices[0].message.content
         logger.info("API 응답을 성공적으로 받았습니다.")
 
         if not raw_generated_content:
@@ -461,13 +888,7 @@ def generate_and_execute_ppt_code(
     if execute_code:
         logger.info(f"'{output_code_file}' 실행을 시도합니다...")
         try:
-            process = subprocess.run(
-                [sys.executable, output_code_file],
-                check=True,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-            )
+            process = run_python_script(output_code_file)
             logger.info(f"--- '{output_code_file}' 실행 결과 (표준 출력) ---")
             if process.stdout:
                 print(process.stdout)
@@ -490,6 +911,8 @@ def generate_and_execute_ppt_code(
             )
             logger.error(f"표준 출력:\n{e.stdout}")
             logger.error(f"표준 오류:\n{e.stderr}")
+        except subprocess.TimeoutExpired as e:
+            logger.error(f"'{output_code_file}' 실행 시간 초과 ({e.timeout}초)")
         except FileNotFoundError:
             logger.error(
                 f"실행할 파일 '{output_code_file}'을(를) 찾을 수 없습니다.",
@@ -2,25 +2,78 @@ import logging
 import os
 import shutil
 import subprocess
-import sys
 import tempfile
 import uuid
 from pathlib import Path
-
-from .create_ppt import build_lecture_video
-from .pdf2text import extract_text_from_pdf_content
-from .prompts import ppt_gen_prompt
+from typing import Callable, Optional
+
+from .create_ppt import build_lecture_video, _ppt_to_images
+from .llm import chat_completion
+from .pdf2text import extract_text_from_pdf_path
+from .pipeline import Stage, run_stages
+from .prompts import ppt_gen_prompt, slide_spec_prompt
+from .script_runner import run_python_script
+from .slide_spec import (
+    parse_slide_spec,
+    render_slide_spec,
+    safe_file_name,
+    spec_to_ppt_structure,
+    validate_slide_spec,
+)
+from .text_cleaner import LOCAL_CLEAN_MIN_SCORE, clean_text_locally
+from .token_budget import (
+    compact_pages,
+    count_message_tokens,
+    log_prompt_tokens,
+    prompt_budget,
+)
 from .use_gpt import (
     generate_lesson_script,
+    generate_lesson_script_per_slide,
+    stream_lesson_script_pages,
     MODEL_NAME,
     get_openai_client,
     clean_text_with_llm,
+    clean_text_with_llm_chunked,
     API_KEY,
 )
-from .voice import tts_pages_to_mp3
+from .voice import tts_page_stream, tts_pages_to_mp3
 
 logger = logging.getLogger(__name__)
 
+# PPTX 생성 방식: "code"(LLM이 쓴 python-pptx 스크립트 실행)
+# 또는 "spec"(LLM이 JSON 슬라이드 명세를 주고 프로세스 안에서 렌더링)
+PPTX_GENERATION_MODE = os.getenv("PPTX_GENERATION_MODE", "code")
+
+# 대본 생성 방식: "batch"(전체 대본 완성 후 TTS),
+# "stream"(대본을 스트리밍으로 받으며 완성된 페이지부터 TTS)
+# 또는 "per_slide"(슬라이드별 대본을 병렬 생성 후 TTS)
+LESSON_SCRIPT_MODE = os.getenv("LESSON_SCRIPT_MODE", "batch")
+
+# 텍스트 정제 방식: "single"(전체를 한 번에, 기존 동작) 또는
+# "chunked"(페이지 창 단위 병렬 정제, 명시적으로 켤 때만 사용)
+CLEAN_TEXT_MODE = os.getenv("CLEAN_TEXT_MODE", "single")
+
+# PPTX 생성(코드·명세) 프롬프트의 입력 토큰 예산
+PPTX_PROMPT_BUDGET = prompt_budget("pptx", 24000)
+
+
+def _fit_pptx_messages(system: str, instructions: str, cleaned: str) -> list[dict]:
+    """PPTX 생성 프롬프트를 만들고, 예산을 넘는 강의 텍스트는 페이지별로 압축한다."""
+
+    def build(text: str) -> list[dict]:
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": instructions + "\n\n" + text},
+        ]
+
+    cleaned = compact_pages(
+        cleaned, PPTX_PROMPT_BUDGET - count_message_tokens(build(""))
+    )
+    messages = build(cleaned)
+    log_prompt_tokens("pptx", messages, PPTX_PROMPT_BUDGET)
+    return messages
+
 
 def mock_generate_lecture_video(pdf_path: str) -> str:
     """
@@ -44,90 +97,69 @@ def mock_generate_lecture_video(pdf_path: str) -> str:
     return target_path
 
 
-def generate_lecture_video(
-    subject: str,
-    description: str,
-    professor: str,
-    pdf_path: str,
-) -> str:
+def _generate_pptx(
+    cleaned: str, workdir: Path, use_cache: bool = True
+) -> tuple[str, list[str]]:
     """
-    사용자의 입력(subject, description, professor, pdf_path)을 받아
-    AI로 PPTX, 대본, 오디오를 순차 생성하고 마지막에 MP4 비디오 경로를 반환한다.
+    LLM으로 python-pptx 코드를 받아 실행하고,
+    생성된 PPTX 경로와 슬라이드별 텍스트(ppt_structure)를 반환한다.
+    use_cache=False면 LLM 응답 캐시를 건너뛴다.
     """
-    # 1) 작업 디렉터리 생성 → 모든 중간 산출물(tmpdir) 자동 삭제
-    temp_dir = tempfile.mkdtemp(prefix="lecture_gen_")
-    try:
-        workdir = Path(temp_dir)
-
-        # ───────────────────────────────────────────────
-        # 2) PDF → 텍스트 → (옵션) 정제
-        # ───────────────────────────────────────────────
-        pdf_bytes = Path(pdf_path).read_bytes()
-        raw_text = extract_text_from_pdf_content(pdf_bytes)
-        if raw_text is None:
-            raise RuntimeError("PDF 텍스트를 추출하지 못했습니다.")
-        # 필요시 LLM으로 노이즈 제거
-        cleaned = clean_text_with_llm(raw_text, API_KEY, MODEL_NAME) or raw_text
-        text_file = workdir / "lecture_text.txt"
-        text_file.write_text(cleaned, encoding="utf-8")
-
-        # ───────────────────────────────────────────────
-        # 3) LLM으로 PPTX 생성 코드 받아 실행
-        # ───────────────────────────────────────────────
-        # 3.1 LLM 클라이언트 초기화
-        client = get_openai_client(API_KEY)
-        if client is None:
-            raise RuntimeError("OpenAI 클라이언트 초기화 실패")
-
-        # 3.2 Python-pptx 생성용 프롬프트 구성
-        prompt = ppt_gen_prompt + "\n\n" + cleaned
+    # 3.1 LLM 클라이언트 초기화
+    client = get_openai_client(API_KEY)
+    if client is None:
+        raise RuntimeError("OpenAI 클라이언트 초기화 실패")
+
+    # 3.2 Python-pptx 생성용 프롬프트 구성
+    messages = _fit_pptx_messages(
+        "당신은 python-pptx 코드를 생성하는 AI입니다. 유효한 Python 코드만 리턴하세요.",
+        ppt_gen_prompt,
+        cleaned,
+    )
 
-        # 3.3 코드 생성 요청
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "당신은 python-pptx 코드를 생성하는 AI입니다. 유효한 Python 코드만 리턴하세요.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-        )
-        raw_code = response.choices[0].message.content
-
-        # 3.4 코드 블록 마커 제거
-        def strip_fences(raw: str) -> str:
-            """
-            ```python ... ``` 또는 ``` ... ``` 로 감싸인 코드를
-            언어 식별자까지 포함해 깔끔히 추출합니다.
-            """
-            s = raw.strip()
-
-            # 1) ``` 로 분할하고 중간 부분 취득
-            if "```" in s:
-                parts = s.split("```")
-                # parts = ["", "python\n<code...>\n", ...]
-                content = parts[1]
-            else:
-                content = s
-
-            # 2) 만약 첫 줄이 'python' 이라면 제거
-            lines = content.splitlines()
-            if lines and lines[0].strip().lower() == "python":
-                lines = lines[1:]
-
-            # 3) 끝에 ``` 가 남아 있다면 제거
-            if lines and lines[-1].strip() == "```":
-                lines = lines[:-1]
-
-            return "\n".join(lines).strip()
-
-        # 3.4 코드 블록 마커·언어 식별자 제거
-        code = strip_fences(raw_code)
-
-        # 3.4.1 데이터 구조 검증 코드 추가
-        validation_code = """
+    # 3.3 코드 생성 요청
+    raw_code = chat_completion(
+        client,
+        model=MODEL_NAME,
+        messages=messages,
+        temperature=0.3,
+        use_cache=use_cache,
+    )
+    if not raw_code:
+        raise RuntimeError("PPTX 생성 코드 응답이 비어있습니다.")
+
+    # 3.4 코드 블록 마커 제거
+    def strip_fences(raw: str) -> str:
+        """
+        ```python ... ``` 또는 ``` ... ``` 로 감싸인 코드를
+        언어 식별자까지 포함해 깔끔히 추출합니다.
+        """
+        s = raw.strip()
+
+        # 1) ``` 로 분할하고 중간 부분 취득
+        if "```" in s:
+            parts = s.split("```")
+            # parts = ["", "python\n<code...>\n", ...]
+            content = parts[1]
+        else:
+            content = s
+
+        # 2) 만약 첫 줄이 'python' 이라면 제거
+        lines = content.splitlines()
+        if lines and lines[0].strip().lower() == "python":
+            lines = lines[1:]
+
+        # 3) 끝에 ``` 가 남아 있다면 제거
+        if lines and lines[-1].strip() == "```":
+            lines = lines[:-1]
+
+        return "\n".join(lines).strip()
+
+    # 3.4 코드 블록 마커·언어 식별자 제거
+    code = strip_fences(raw_code)
+
+    # 3.4.1 데이터 구조 검증 코드 추가
+    validation_code = """
 def validate_slide_data(slides_data):
     \"\"\"슬라이드 데이터 구조를 검증합니다.\"\"\"
     if not isinstance(slides_data, list):
@@ -150,72 +182,164 @@ def validate_slide_data(slides_data):
                 raise ValueError("각 point는 'text' 키를 포함해야 합니다.")
 """
 
-        # 검증 코드를 structured_slides 정의 직후에 삽입
-        if "structured_slides =" in code:
-            # structured_slides 정의 후에 검증 코드 삽입
-            code = code.replace(
-                "structured_slides =",
-                "structured_slides =\n\n"
-                + validation_code
-                + "\n# 데이터 검증\nvalidate_slide_data(structured_slides)\n\n",
-            )
+    # 검증 코드를 structured_slides 정의 직후에 삽입
+    if "structured_slides =" in code:
+        # structured_slides 정의 후에 검증 코드 삽입
+        code = code.replace(
+            "structured_slides =",
+            "structured_slides =\n\n"
+            + validation_code
+            + "\n# 데이터 검증\nvalidate_slide_data(structured_slides)\n\n",
+        )
 
-        # 3.5 파일로 저장 후 실행
-        code_file = workdir / "gen_ppt.py"
-        code_file.write_text(code, encoding="utf-8")
-        print(f"PPTX 생성 코드 저장 완료: {code_file}")
-
-        try:
-            # 코드 실행
-            result = subprocess.run(
-                [sys.executable, str(code_file)],
-                check=True,
-                cwd=str(workdir),
-                capture_output=True,
-                text=True,
+    # 3.5 파일로 저장 후 실행
+    code_file = workdir / "gen_ppt.py"
+    code_file.write_text(code, encoding="utf-8")
+    print(f"PPTX 생성 코드 저장 완료: {code_file}")
+
+    try:
+        # 코드 실행
+        result = run_python_script(code_file, cwd=workdir)
+        print(f"PPTX 생성 코드 실행 결과:")
+        print(f"stdout: {result.stdout}")
+        print(f"stderr: {result.stderr}")
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        print(f"PPTX 생성 코드 실행 실패:")
+        print(f"stdout: {e.stdout}")
+        print(f"stderr: {e.stderr}")
+        raise RuntimeError(f"PPTX 생성 코드 실행 실패: {str(e)}")
+
+    # 3.6 생성된 .pptx 파일 찾기 및 검증
+    pptx_list = list(workdir.glob("*.pptx"))
+    print(f"찾은 PPTX 파일들: {pptx_list}")
+
+    if not pptx_list:
+        raise RuntimeError("PPTX 파일이 생성되지 않았습니다.")
+
+    pptx_path = str(pptx_list[0])
+    print(f"사용할 PPTX 파일: {pptx_path}")
+
+    # PPTX 파일 크기 확인
+    pptx_size = os.path.getsize(pptx_path)
+    if pptx_size == 0:
+        raise RuntimeError("생성된 PPTX 파일이 비어있습니다.")
+    print(f"PPTX 파일 크기: {pptx_size} bytes")
+
+    # PPTX 구조 추출
+    from pptx import Presentation
+
+    prs = Presentation(pptx_path)
+    ppt_structure = []
+    for slide in prs.slides:
+        slide_content = []
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                slide_content.append(shape.text)
+        ppt_structure.append("\n".join(slide_content))
+
+    return pptx_path, ppt_structure
+
+
+def _generate_pptx_from_spec(
+    cleaned: str, workdir: Path, use_cache: bool = True
+) -> tuple[str, list[str]]:
+    """
+    LLM에게 JSON 슬라이드 명세를 받아 검증한 뒤 프로세스 안에서 PPTX로 렌더링하고,
+    생성된 PPTX 경로와 명세에서 바로 만든 ppt_structure를 반환한다.
+    """
+    raw_spec = chat_completion(
+        None,
+        model=MODEL_NAME,
+        messages=_fit_pptx_messages(
+            "당신은 강의 슬라이드 명세를 JSON으로 작성하는 AI입니다. 유효한 JSON 객체만 리턴하세요.",
+            slide_spec_prompt,
+            cleaned,
+        ),
+        temperature=0.3,
+        use_cache=use_cache,
+        response_format={"type": "json_object"},
+    )
+    if not raw_spec:
+        raise RuntimeError("슬라이드 명세 응답이 비어있습니다.")
+
+    spec = parse_slide_spec(raw_spec)
+    slides = validate_slide_spec(spec)
+    (workdir / "slide_spec.json").write_text(raw_spec, encoding="utf-8")
+
+    pptx_path = workdir / safe_file_name(spec.get("file_name"))
+    render_slide_spec(slides, pptx_path)
+    print(f"슬라이드 명세 기반 PPTX 생성 완료: {pptx_path} ({len(slides)}장)")
+    return str(pptx_path), spec_to_ppt_structure(slides)
+
+
+def generate_lecture_video(
+    subject: str,
+    description: str,
+    professor: str,
+    pdf_path: str,
+    on_stage: Optional[Callable[[str], None]] = None,
+    on_video_start: Optional[Callable[[str], None]] = None,
+) -> str:
+    """
+    사용자의 입력(subject, description, professor, pdf_path)을 받아
+    AI로 PPTX, 대본, 오디오를 생성하고 마지막에 MP4 비디오 경로를 반환한다.
+
+    각 단계는 의존성 그래프(run_stages)로 실행되어, PPTX만 있으면 되는
+    슬라이드 렌더링이 대본 생성·TTS와 동시에 진행된다.
+    on_stage가 주어지면 각 단계가 시작될 때 단계 이름으로 호출한다.
+    on_video_start가 주어지면 영상 인코딩 직전에 MP4 경로로 호출하고, 영상은
+    앞에서부터 순서대로 쓰는 조각 MP4로 만든다 (인코딩 중 업로드용).
+    """
+    # 1) 작업 디렉터리 생성 → 오류 시 모든 중간 산출물(tmpdir) 삭제
+    temp_dir = tempfile.mkdtemp(prefix="lecture_gen_")
+    workdir = Path(temp_dir)
+    text_file = workdir / "lecture_text.txt"
+    script_file = workdir / "lesson_script.txt"
+    audio_dir = workdir / "audio"
+    slides_dir = workdir / "slides"
+
+    # ───────────────────────────────────────────────
+    # 2) PDF → 텍스트 → (옵션) 정제
+    # ───────────────────────────────────────────────
+    def extract_text() -> str:
+        raw_text = extract_text_from_pdf_path(str(pdf_path))
+        if raw_text is None:
+            raise RuntimeError("PDF 텍스트를 추출하지 못했습니다.")
+        # 머리글/바닥글·번호는 로컬에서 먼저 제거하고, 품질이 부족할 때만 LLM으로 정제
+        cleaned, score = clean_text_locally(raw_text)
+        if score < LOCAL_CLEAN_MIN_SCORE:
+            logger.info(
+                f"로컬 정제 품질 점수 {score} < {LOCAL_CLEAN_MIN_SCORE}, LLM 정제 진행"
             )
-            print(f"PPTX 생성 코드 실행 결과:")
-            print(f"stdout: {result.stdout}")
-            print(f"stderr: {result.stderr}")
-        except subprocess.CalledProcessError as e:
-            print(f"PPTX 생성 코드 실행 실패:")
-            print(f"stdout: {e.stdout}")
-            print(f"stderr: {e.stderr}")
-            raise RuntimeError(f"PPTX 생성 코드 실행 실패: {str(e)}")
-
-        # 3.6 생성된 .pptx 파일 찾기 및 검증
-        pptx_list = list(workdir.glob("*.pptx"))
-        print(f"찾은 PPTX 파일들: {pptx_list}")
-
-        if not pptx_list:
-            raise RuntimeError("PPTX 파일이 생성되지 않았습니다.")
-
-        pptx_path = str(pptx_list[0])
-        print(f"사용할 PPTX 파일: {pptx_path}")
-
-        # PPTX 파일 크기 확인
-        pptx_size = os.path.getsize(pptx_path)
-        if pptx_size == 0:
-            raise RuntimeError("생성된 PPTX 파일이 비어있습니다.")
-        print(f"PPTX 파일 크기: {pptx_size} bytes")
-
-        # PPTX 구조 추출
-        from pptx import Presentation
-
-        prs = Presentation(pptx_path)
-        ppt_structure = []
-        for slide in prs.slides:
-            slide_content = []
-            for shape in slide.shapes:
-                if hasattr(shape, "text"):
-                    slide_content.append(shape.text)
-            ppt_structure.append("\n".join(slide_content))
-
-        # ───────────────────────────────────────────────
-        # 4) 대본 생성 → 페이지별 MP3 변환
-        # ───────────────────────────────────────────────
-        script_file = workdir / "lesson_script.txt"
-        lesson = generate_lesson_script(
+            clean_fn = clean_text_with_llm
+            if CLEAN_TEXT_MODE == "chunked":
+                clean_fn = clean_text_with_llm_chunked
+            cleaned = clean_fn(cleaned, API_KEY, MODEL_NAME) or cleaned
+        text_file.write_text(cleaned, encoding="utf-8")
+        return cleaned
+
+    # ───────────────────────────────────────────────
+    # 3) LLM으로 PPTX 생성 코드 받아 실행
+    # ───────────────────────────────────────────────
+    def generate_pptx(extract_text: str) -> tuple[str, list[str]]:
+        if PPTX_GENERATION_MODE == "spec":
+            return _generate_pptx_from_spec(extract_text, workdir)
+        return _generate_pptx(extract_text, workdir)
+
+    # 3.7 PPTX → PDF → PNG (대본·TTS와 병렬 진행)
+    def render_slides(generate_pptx: tuple[str, list[str]]) -> list[Path]:
+        pptx_path, _ = generate_pptx
+        return _ppt_to_images(pptx_path, slides_dir)
+
+    # ───────────────────────────────────────────────
+    # 4) 대본 생성 → 페이지별 MP3 변환
+    # ───────────────────────────────────────────────
+    def generate_script(generate_pptx: tuple[str, list[str]]) -> Path:
+        _, ppt_structure = generate_pptx
+        script_fn = generate_lesson_script
+        if LESSON_SCRIPT_MODE == "per_slide":
+            script_fn = generate_lesson_script_per_slide
+        lesson = script_fn(
             input_text_file=str(text_file),
             output_script_file=str(script_file),
             description=description,
@@ -224,29 +348,52 @@ def validate_slide_data(slides_data):
         )
         if lesson is None:
             raise RuntimeError("수업 대본 생성 실패")
+        return script_file
 
-        audio_dir = workdir / "audio"
-        # 교수 이름에 따라 음성 선택
-        voice_key = professor.upper()  # 대문자로 변환
-        print(f"선택된 교수: {professor} (음성 키: {voice_key})")
-        
+    # 교수 이름에 따라 음성 선택
+    voice_key = professor.upper()  # 대문자로 변환
+    print(f"선택된 교수: {professor} (음성 키: {voice_key})")
+
+    def tts(generate_script: Path) -> Path:
         tts_pages_to_mp3(
-            txt_path=str(script_file),
+            txt_path=str(generate_script),
             out_dir=str(audio_dir),
             voice_key=voice_key,
             base_name="page",
         )
+        return audio_dir
 
-        # ───────────────────────────────────────────────
-        # 5) 슬라이드 + 오디오 합성 → MP4 생성
-        # ───────────────────────────────────────────────
+    # 4.1 스트리밍 모드: 대본 생성과 TTS를 한 단계에서 겹쳐 진행
+    def stream_script_tts(generate_pptx: tuple[str, list[str]]) -> Path:
+        _, ppt_structure = generate_pptx
+        pages = stream_lesson_script_pages(
+            input_text_file=str(text_file),
+            output_script_file=str(script_file),
+            description=description,
+            model=MODEL_NAME,
+            ppt_structure=ppt_structure,
+        )
+        tts_page_stream(pages, out_dir=str(audio_dir), voice_key=voice_key)
+        return audio_dir
+
+    # ───────────────────────────────────────────────
+    # 5) 슬라이드 + 오디오 합성 → MP4 생성
+    # ───────────────────────────────────────────────
+    def render_video(
+        generate_pptx: tuple[str, list[str]], render_slides: list[Path], tts: Path
+    ) -> Path:
+        pptx_path, _ = generate_pptx
         video_filename = f"{uuid.uuid4().hex}.mp4"
         video_path = workdir / video_filename
+        if on_video_start:
+            on_video_start(str(video_path))
         build_lecture_video(
             pptx_file=pptx_path,
-            audio_dir=str(audio_dir),
+            audio_dir=str(tts),
             output_path=str(video_path),
             fps=24,
+            slides=render_slides,
+            fragmented=on_video_start is not None,
         )
 
         # 비디오 파일이 생성되었는지 확인
@@ -258,9 +405,31 @@ def validate_slide_data(slides_data):
         if video_size == 0:
             raise RuntimeError(f"생성된 비디오 파일이 비어있습니다: {video_path}")
         print(f"비디오 파일 크기: {video_size} bytes")
+        return video_path
+
+    if LESSON_SCRIPT_MODE == "stream":
+        script_stages = [Stage("tts", stream_script_tts, deps=("generate_pptx",))]
+    else:
+        script_stages = [
+            Stage("generate_script", generate_script, deps=("generate_pptx",)),
+            Stage("tts", tts, deps=("generate_script",)),
+        ]
+
+    stages = [
+        Stage("extract_text", extract_text),
+        Stage("generate_pptx", generate_pptx, deps=("extract_text",)),
+        Stage("render_slides", render_slides, deps=("generate_pptx",)),
+        *script_stages,
+        Stage(
+            "render_video",
+            render_video,
+            deps=("generate_pptx", "render_slides", "tts"),
+        ),
+    ]
 
-        return str(video_path)
-
+    try:
+        results = run_stages(stages, on_stage=on_stage)
+        return str(results["render_video"])
     except Exception as e:
         # 오류 발생 시 임시 디렉토리 정리
         shutil.rmtree(temp_dir, ignore_errors=True)
@@ -1,24 +1,22 @@
 import logging
-import os
-import shutil
-import tempfile
 
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, filters, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Lecture
-from .s3_upload import upload_file_to_s3
+from .jobs import enqueue_lecture_job
+from .models import Lecture, LectureJob
 from .serializers import (
     LectureSerializer,
     LectureDetailSerializer,
     LectureUploadSerializer,
+    LectureJobSerializer,
 )
-from .utils import generate_lecture_video
 
 logger = logging.getLogger(__name__)
 
@@ -34,18 +32,16 @@ class UploadLectureView(APIView):
 
     @swagger_auto_schema(
         operation_summary="강의 업로드",
-        operation_description="PDF 파일을 업로드하여 강의 영상을 생성하고, S3에 업로드한 뒤 Lecture 객체를 생성합니다.",
+        operation_description="PDF 파일을 업로드하면 강의 영상 생성 작업을 등록하고 작업 ID를 바로 반환합니다. 진행 상황은 jobs/<job_id>로 조회합니다.",
         request_body=LectureUploadSerializer,
         responses={
-            201: openapi.Response(
-                "성공",
+            202: openapi.Response(
+                "작업 등록",
                 openapi.Schema(
                     type=openapi.TYPE_OBJECT,
                     properties={
-                        "lecture_id": openapi.Schema(type=openapi.TYPE_INTEGER),
-                        "video_url": openapi.Schema(
-                            type=openapi.TYPE_STRING, format="url"
-                        ),
+                        "job_id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "status": openapi.Schema(type=openapi.TYPE_STRING),
                     },
                 ),
             ),
@@ -57,48 +53,41 @@ class UploadLectureView(APIView):
             serializer = LectureUploadSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
 
-            subject = serializer.validated_data["subject"]
-            description = serializer.validated_data["description"]
-            professor = serializer.validated_data["professor"]
-            pdf_file = serializer.validated_data["file"]
-
-            with tempfile.TemporaryDirectory() as tmpdir:
-                pdf_path = os.path.join(tmpdir, pdf_file.name)
-                with open(pdf_path, "wb") as f:
-                    for chunk in pdf_file.chunks():
-                        f.write(chunk)
-
-                video_path = generate_lecture_video(
-                    subject=subject,
-                    description=description,
-                    professor=professor,
-                    pdf_path=pdf_path,
-                )
-
-                # S3에 업로드
-                video_filename = os.path.basename(video_path)
-                video_url = upload_file_to_s3(video_path, video_filename)
-
-                # 임시 디렉토리 정리
-                temp_dir = os.path.dirname(video_path)
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir, ignore_errors=True)
-
-                lecture = Lecture.objects.create(
-                    title=subject,
-                    professor=professor,
-                    video_url=video_url,
-                )
-
-            return Response({"lecture_id": lecture.id}, status=201)
+            job = enqueue_lecture_job(
+                subject=serializer.validated_data["subject"],
+                description=serializer.validated_data["description"],
+                professor=serializer.validated_data["professor"],
+                pdf_file=serializer.validated_data["file"],
+            )
+
+            return Response(
+                {"job_id": job.id, "status": job.status},
+                status=status.HTTP_202_ACCEPTED,
+            )
+        except ValidationError:
+            raise
         except Exception as e:
-            logger.error(f"강의 영상 생성 중 오류 발생: {str(e)}", exc_info=True)
+            logger.error(f"강의 생성 작업 등록 중 오류 발생: {str(e)}", exc_info=True)
             return Response(
-                {"error": f"강의 영상 생성 중 오류가 발생했습니다: {str(e)}"},
+                {"error": f"강의 생성 작업 등록 중 오류가 발생했습니다: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
 
+class LectureJobDetailView(generics.RetrieveAPIView):
+    queryset = LectureJob.objects.select_related("lecture")
+    serializer_class = LectureJobSerializer
+    lookup_field = "id"
+
+    @swagger_auto_schema(
+        operation_summary="강의 생성 작업 조회",
+        operation_description="job_id를 기반으로 작업 상태(status), 현재 단계(stage), 완료 시 lecture_id와 영상 URL을 반환합니다.",
+        responses={200: LectureJobSerializer()},
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
 class LectureListView(generics.ListAPIView):
     queryset = Lecture.objects.all()
     serializer_class = LectureSerializer
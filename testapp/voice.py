@@ -1,9 +1,28 @@
+import base64
+import json
 import os
 import re
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from textwrap import wrap
+from typing import Iterable, Optional
 
+import httpx
+import numpy as np
 from elevenlabs.client import ElevenLabs
+from websockets.exceptions import (
+    ConnectionClosedError,
+    ConnectionClosedOK,
+    InvalidStatus,
+)
+from websockets.sync.client import connect as ws_connect
+
+from .disk_cache import DiskCache, make_key
+from .retry import retry_with_backoff
 
 # ────────────────────────── #
 # 1. 환경 설정
@@ -13,6 +32,25 @@ DAWOON_VOICE_ID = os.getenv("DAWOON_VOICE_ID")
 JIJUN_VOICE_ID = os.getenv("JIJUN_VOICE_ID")
 IU_VOICE_ID = os.getenv("IU_VOICE_ID")
 MODEL_ID = "eleven_multilingual_v2"
+# 페이지 오디오 형식: "mp3"(MP3 파일) 또는 "pcm"(원본 PCM을 WAV로 저장해
+# 영상 조립 시 디코딩 없이 한 번만 인코딩)
+TTS_AUDIO_FORMAT = os.getenv("TTS_AUDIO_FORMAT", "mp3")
+PCM_SAMPLE_RATE = int(os.getenv("TTS_PCM_SAMPLE_RATE", 24000))
+PCM_SAMPLE_WIDTH = 2  # ElevenLabs PCM: 16비트 리틀 엔디언 모노
+if TTS_AUDIO_FORMAT == "pcm":
+    OUTPUT_FORMAT = f"pcm_{PCM_SAMPLE_RATE}"
+    AUDIO_EXT = "wav"
+else:
+    OUTPUT_FORMAT = "mp3_44100_128"
+    AUDIO_EXT = "mp3"
+# ElevenLabs 전송 방식: "http"(청크별 convert 요청) 또는 "websocket"(입력 스트리밍:
+# 문장을 보내는 대로 합성된 오디오 프레임을 받아 바로 파일에 기록)
+TTS_TRANSPORT = os.getenv("TTS_TRANSPORT", "http").lower()
+# 로컬 대역 서버(manage.py tts_ws_standin)로 바꿀 때: ws://127.0.0.1:8765
+ELEVENLABS_WS_URL = os.getenv("ELEVENLABS_WS_URL", "wss://api.elevenlabs.io")
+TTS_WS_TIMEOUT = float(os.getenv("TTS_WS_TIMEOUT", 30))  # 초, 연결·프레임 수신 대기
+# 요청 한 번에 보낼 최대 글자 수 (eleven_multilingual_v2 한도 이내)
+TTS_MAX_CHARS = int(os.getenv("TTS_MAX_CHARS", 4500))
 
 VOICE_MAP = {
     "DAWOON": DAWOON_VOICE_ID,
@@ -21,7 +59,91 @@ VOICE_MAP = {
 }
 DEFAULT_VOICE_KEY = "DAWOON"  # 프론트에서 아무 것도 안 보냈을 때
 
-client = ElevenLabs(api_key=EL_API_KEY)
+# Coqui 음성: 참조 음성 파일(COQUI_{KEY}_SPEAKER_WAV, 음성 복제) 또는
+# 모델 내장 화자 이름(COQUI_{KEY}_SPEAKER). 둘 다 없으면 모델의 첫 번째 화자
+COQUI_VOICE_MAP = {
+    key: {
+        "speaker_wav": os.getenv(f"COQUI_{key}_SPEAKER_WAV"),
+        "speaker": os.getenv(f"COQUI_{key}_SPEAKER"),
+    }
+    for key in VOICE_MAP
+}
+
+# 동시 TTS 설정 (ElevenLabs 요금제의 동시 요청 수·초당 요청 수에 맞춰 조정)
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", 1))  # 1이면 순차 처리
+TTS_RATE_PER_SEC = float(os.getenv("TTS_RATE_PER_SEC", 2))  # 0이면 제한 없음
+TTS_BURST = int(os.getenv("TTS_BURST", max(TTS_MAX_WORKERS, 1)))
+TTS_MAX_RETRIES = int(os.getenv("TTS_MAX_RETRIES", 4))
+TTS_BACKOFF_BASE = float(os.getenv("TTS_BACKOFF_BASE", 1.0))  # 초
+
+# 청크 단위 TTS 결과 캐시 (voice_id, MODEL_ID, output_format, 텍스트 해시 기준)
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+TTS_CACHE_DIR = os.getenv(
+    "TTS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "tts")
+)
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+
+# TTS 백엔드: "elevenlabs"(API) 또는 "coqui"(로컬 CPU 합성, 네트워크 불필요)
+TTS_BACKEND = os.getenv("TTS_BACKEND", "elevenlabs").lower()
+# 기본 백엔드가 실패하면(장애·한도 초과 등) 강의 전체를 다시 합성할 백엔드 (비우면 사용 안 함)
+TTS_FALLBACK_BACKEND = os.getenv("TTS_FALLBACK_BACKEND", "").lower()
+
+# Coqui TTS 설정 (XTTS v2는 COQUI_TOS_AGREED=1 환경 변수로 라이선스 동의 필요)
+COQUI_MODEL_NAME = os.getenv(
+    "COQUI_MODEL_NAME", "tts_models/multilingual/multi-dataset/xtts_v2"
+)
+COQUI_LANGUAGE = os.getenv("COQUI_LANGUAGE", "ko")
+COQUI_NUM_THREADS = int(os.getenv("COQUI_NUM_THREADS", os.cpu_count() or 1))
+# 한 번에 합성할 최대 글자 수 (XTTS v2 한국어 권장 길이)
+COQUI_MAX_CHARS = int(os.getenv("COQUI_MAX_CHARS", 95))
+
+tts_cache = DiskCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
+
+
+class TokenBucket:
+    """
+    스레드 안전한 토큰 버킷 속도 제한기.
+    초당 rate개의 토큰이 채워지고, 최대 burst개까지 쌓입니다.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰 하나를 얻을 때까지 대기합니다."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiter = TokenBucket(TTS_RATE_PER_SEC, TTS_BURST)
+
+_client: Optional[ElevenLabs] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> ElevenLabs:
+    """ElevenLabs 클라이언트를 처음 요청할 때 만듭니다 (로컬 백엔드만 쓸 때는 만들지 않음)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ElevenLabs(api_key=EL_API_KEY)
+        return _client
 
 
 # ────────────────────────── #
@@ -65,44 +187,522 @@ def split_pages(text: str) -> list[str]:
 
 
 # ────────────────────────── #
-# 3. (긴 문장 대응) 간단한 청크 함수
+# 3. 문장 단위 청크 (요청 수 최소화)
 # ────────────────────────── #
-def chunk_text(text: str, max_len: int = 4500):
-    for paragraph in text.splitlines():
-        if not paragraph.strip():
+# 문장 끝: 마침표·물음표·느낌표·말줄임표(+닫는 따옴표/괄호) 뒤에 공백이나 줄 끝.
+# "3.14"처럼 뒤에 공백이 없는 마침표는 문장 끝으로 보지 않음
+SENTENCE_END = re.compile(r"[.!?。？！…]+[\"'”’」』)\]]*(?=\s|$)")
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    한국어 대본을 문장 단위로 나눕니다.
+    줄바꿈도 문장 경계로 보며, 문장 부호 없이 끝나는 줄은 한 문장으로 취급합니다.
+    """
+    sentences = []
+    for line in text.splitlines():
+        line = line.strip()
+        start = 0
+        for match in SENTENCE_END.finditer(line):
+            sentence = line[start : match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        rest = line[start:].strip()
+        if rest:
+            sentences.append(rest)
+    return sentences
+
+
+def chunk_text(text: str, max_len: int = TTS_MAX_CHARS):
+    """
+    문장을 순서대로 max_len자까지 채워 묶은 청크를 내보냅니다.
+
+    문장 중간에서는 자르지 않으며, 순서를 지키는 묶음에서는 이렇게 앞에서부터
+    가득 채우는 방식이 요청 수가 가장 적습니다. max_len보다 긴 문장 하나만
+    공백 기준으로 나눕니다.
+    """
+    buffer = ""
+    for sentence in split_sentences(text):
+        if len(sentence) > max_len:
+            if buffer:
+                yield buffer
+                buffer = ""
+            yield from wrap(
+                sentence, max_len, break_long_words=False, break_on_hyphens=False
+            )
             continue
-        if len(paragraph) <= max_len:
-            yield paragraph
+        candidate = f"{buffer} {sentence}" if buffer else sentence
+        if len(candidate) > max_len:
+            yield buffer
+            buffer = sentence
         else:
-            for part in wrap(
-                paragraph, max_len, break_long_words=False, break_on_hyphens=False
-            ):
-                yield part
+            buffer = candidate
+    if buffer:
+        yield buffer
 
 
 # ────────────────────────── #
 # 4. ElevenLabs TTS → MP3 (단일 페이지용)
 # ────────────────────────── #
+def _is_retryable(exc: Exception) -> bool:
+    """429(요청 과다)·5xx 응답이나 네트워크 오류면 재시도 대상입니다."""
+    status_code = getattr(exc, "status_code", None)
+    if status_code is not None:
+        return status_code == 429 or 500 <= status_code < 600
+    return isinstance(exc, httpx.TransportError)
+
+
+def _convert_chunk(piece: str, voice_id: str) -> bytes:
+    """
+    청크 하나를 합성해 OUTPUT_FORMAT(MP3 또는 원본 PCM) 바이트로 반환합니다.
+    같은 (음성, 모델, 포맷, 텍스트) 조합은 캐시에서 바로 돌려줍니다.
+    """
+    if not TTS_CACHE_ENABLED:
+        return _request_chunk(piece, voice_id)
+
+    key = make_key(voice_id, MODEL_ID, OUTPUT_FORMAT, piece)
+    cached = tts_cache.get(key)
+    if cached is not None:
+        return cached
+
+    audio = _request_chunk(piece, voice_id)
+    tts_cache.set(key, audio)
+    return audio
+
+
+def _request_chunk(piece: str, voice_id: str) -> bytes:
+    """
+    ElevenLabs에 청크 하나를 요청합니다.
+    속도 제한기를 거쳐 요청하고, 재시도 대상 오류는 지수 백오프(+지터)로 재시도합니다.
+    """
+
+    def request() -> bytes:
+        _rate_limiter.acquire()
+        stream = _get_client().text_to_speech.convert(
+            voice_id=voice_id,
+            output_format=OUTPUT_FORMAT,
+            text=piece,
+            model_id=MODEL_ID,
+        )
+        # 스트림 도중 오류도 재시도할 수 있도록 전부 읽은 뒤 반환
+        return b"".join(packet for packet in stream if packet)
+
+    return retry_with_backoff(
+        request,
+        retryable=_is_retryable,
+        max_retries=TTS_MAX_RETRIES,
+        backoff_base=TTS_BACKOFF_BASE,
+        label="TTS 요청",
+        log=print,
+    )
+
+
 def page_to_mp3(text: str, out_path: str, voice_id: str):
     with open(out_path, "wb") as f:
         for piece in chunk_text(text):
-            stream = client.text_to_speech.convert(
-                voice_id=voice_id,
-                output_format="mp3_44100_128",
-                text=piece,
-                model_id=MODEL_ID,
-            )
-            for packet in stream:
-                if packet:
-                    f.write(packet)
+            f.write(_convert_chunk(piece, voice_id))
     print(f"✅ Saved → {out_path}")
 
 
+def page_to_wav(text: str, out_path: str, voice_id: str):
+    """청크별 PCM을 이어 붙여 WAV 하나로 저장합니다 (PCM은 이어 붙여도 경계 잡음이 없음)."""
+    with wave.open(out_path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(PCM_SAMPLE_WIDTH)
+        wav.setframerate(PCM_SAMPLE_RATE)
+        for piece in chunk_text(text):
+            wav.writeframes(_convert_chunk(piece, voice_id))
+    print(f"✅ Saved → {out_path}")
+
+
+def _is_retryable_ws(exc: Exception) -> bool:
+    """웹소켓 핸드셰이크의 429·5xx 응답, 비정상 종료, 네트워크 오류·시간 초과면 재시도 대상입니다."""
+    if isinstance(exc, InvalidStatus):
+        status_code = exc.response.status_code
+        return status_code == 429 or 500 <= status_code < 600
+    return isinstance(exc, (ConnectionClosedError, OSError))
+
+
+def _ws_url(voice_id: str) -> str:
+    return (
+        f"{ELEVENLABS_WS_URL}/v1/text-to-speech/{voice_id}/stream-input"
+        f"?model_id={MODEL_ID}&output_format={OUTPUT_FORMAT}"
+    )
+
+
+def _send_text_ws(ws, pieces: Iterable[str], errors: list) -> None:
+    """텍스트 조각을 받는 대로 보냅니다 (송신 스레드). 실패하면 연결을 닫아 수신을 끝냅니다."""
+    try:
+        ws.send(json.dumps({"text": " "}))  # 프로토콜상 첫 메시지는 공백 하나
+        for piece in pieces:
+            if piece.strip():
+                ws.send(json.dumps({"text": f"{piece.strip()} "}))
+        ws.send(json.dumps({"text": ""}))  # 입력 끝: 남은 텍스트를 합성하고 종료
+    except Exception as e:
+        errors.append(e)
+        ws.close()
+
+
+def _stream_ws(pieces: Iterable[str], write, voice_id: str) -> None:
+    """
+    웹소켓 연결 하나로 텍스트 조각을 보내면서, 도착한 오디오 프레임을 write로 넘깁니다.
+    송신은 별도 스레드에서 하므로 텍스트가 늦게 도착해도 수신이 막히지 않습니다.
+    """
+    _rate_limiter.acquire()
+    errors: list[Exception] = []
+    with ws_connect(
+        _ws_url(voice_id),
+        additional_headers={"xi-api-key": EL_API_KEY or ""},
+        open_timeout=TTS_WS_TIMEOUT,
+    ) as ws:
+        sender = threading.Thread(
+            target=_send_text_ws,
+            args=(ws, pieces, errors),
+            name="tts-ws-send",
+            daemon=True,
+        )
+        sender.start()
+        try:
+            while True:
+                try:
+                    message = json.loads(ws.recv(timeout=TTS_WS_TIMEOUT))
+                except ConnectionClosedOK:
+                    break
+                if message.get("error"):
+                    raise RuntimeError(
+                        "ElevenLabs 웹소켓 오류: "
+                        f"{message.get('message') or message['error']}"
+                    )
+                if message.get("audio"):
+                    write(base64.b64decode(message["audio"]))
+                if message.get("isFinal"):
+                    break
+        finally:
+            ws.close()
+            sender.join(TTS_WS_TIMEOUT)
+    if errors:
+        raise errors[0]
+
+
+def _pcm_writer(wav: wave.Wave_write):
+    """프레임 경계가 샘플 중간에서 끊겨도 샘플 단위로 맞춰 기록하는 함수를 만듭니다."""
+    pending = b""
+
+    def write(data: bytes) -> None:
+        nonlocal pending
+        data = pending + data
+        cut = len(data) - len(data) % PCM_SAMPLE_WIDTH
+        wav.writeframes(data[:cut])
+        pending = data[cut:]
+
+    return write
+
+
+def page_to_audio_ws(text: str | Iterable[str], out_path: str, voice_id: str):
+    """
+    ElevenLabs 웹소켓 입력 스트리밍으로 페이지 하나를 합성합니다.
+
+    text가 문자열이면 문장 단위로 나눠 차례로 보내고, 이터레이터면(예: LLM 출력)
+    조각이 도착하는 대로 보냅니다. 오디오 프레임은 도착하는 대로 out_path에
+    기록하므로 첫 오디오가 페이지 전체 합성을 기다리지 않습니다.
+    파일 형식은 page_to_mp3/page_to_wav와 같고(TTS_AUDIO_FORMAT), 청크 캐시는
+    쓰지 않습니다. 다시 보낼 수 있는 문자열 입력만 재시도합니다.
+    """
+
+    def synthesize() -> None:
+        pieces = split_sentences(text) if isinstance(text, str) else text
+        if AUDIO_EXT == "wav":
+            with wave.open(out_path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(PCM_SAMPLE_WIDTH)
+                wav.setframerate(PCM_SAMPLE_RATE)
+                _stream_ws(pieces, _pcm_writer(wav), voice_id)
+        else:
+            with open(out_path, "wb") as f:
+                _stream_ws(pieces, f.write, voice_id)
+
+    retry_with_backoff(
+        synthesize,
+        # 이터레이터 입력은 이미 소비했으므로 다시 보낼 수 없음
+        retryable=lambda e: isinstance(text, str) and _is_retryable_ws(e),
+        max_retries=TTS_MAX_RETRIES,
+        backoff_base=TTS_BACKOFF_BASE,
+        label="TTS 웹소켓",
+        log=print,
+    )
+    print(f"✅ Saved → {out_path}")
+
+
+# ────────────────────────── #
+# 5. TTS 백엔드
+# ────────────────────────── #
+class TTSBackend(ABC):
+    """
+    페이지 하나를 오디오 파일 하나로 합성하는 TTS 백엔드.
+    synthesize_page를 구현하지 않은 백엔드는 만들 때 바로 TypeError가 납니다.
+    """
+
+    name = ""
+    audio_ext = "mp3"
+    max_workers: Optional[int] = None  # 동시 합성 페이지 수 상한 (None이면 제한 없음)
+
+    @abstractmethod
+    def synthesize_page(self, text: str, out_path: str, voice_key: str) -> None:
+        """text를 voice_key 음성으로 합성해 out_path(audio_ext 형식)에 저장합니다."""
+
+
+class ElevenLabsBackend(TTSBackend):
+    """
+    ElevenLabs API (TTS_AUDIO_FORMAT에 따라 MP3 또는 WAV).
+    TTS_TRANSPORT가 "websocket"이면 입력 스트리밍 프로토콜로 합성합니다.
+    """
+
+    name = "elevenlabs"
+    audio_ext = AUDIO_EXT
+
+    def synthesize_page(self, text: str, out_path: str, voice_key: str) -> None:
+        if TTS_TRANSPORT == "websocket":
+            write_page = page_to_audio_ws
+        elif self.audio_ext == "wav":
+            write_page = page_to_wav
+        else:
+            write_page = page_to_mp3
+        write_page(text, out_path, VOICE_MAP[voice_key])
+
+
+class CoquiBackend(TTSBackend):
+    """
+    로컬 Coqui TTS (CPU). 모델은 프로세스당 처음 합성할 때 한 번만 불러옵니다.
+
+    모델 하나를 여러 스레드가 동시에 쓰지 않도록 페이지는 하나씩 합성하고,
+    대신 torch 연산 스레드를 CPU 코어 수(COQUI_NUM_THREADS)만큼 씁니다.
+    """
+
+    name = "coqui"
+    audio_ext = "wav"
+    max_workers = 1
+
+    def __init__(self, model_name: str = COQUI_MODEL_NAME):
+        self.model_name = model_name
+        self._tts = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._tts is None:
+            import torch
+            from TTS.api import TTS
+
+            torch.set_num_threads(COQUI_NUM_THREADS)
+            print(
+                f"Coqui TTS 모델 로드 중: {self.model_name} "
+                f"(CPU 스레드 {COQUI_NUM_THREADS}개)"
+            )
+            self._tts = TTS(self.model_name, progress_bar=False).to("cpu")
+        return self._tts
+
+    def _voice_args(self, tts, voice_key: str) -> dict:
+        voice = COQUI_VOICE_MAP.get(voice_key, {})
+        args = {}
+        if tts.is_multi_lingual:
+            args["language"] = COQUI_LANGUAGE
+        if voice.get("speaker_wav"):
+            args["speaker_wav"] = voice["speaker_wav"]
+        elif tts.is_multi_speaker:
+            args["speaker"] = voice.get("speaker") or tts.speakers[0]
+        return args
+
+    def synthesize_page(self, text: str, out_path: str, voice_key: str) -> None:
+        with self._lock:
+            tts = self._load()
+            voice_args = self._voice_args(tts, voice_key)
+            sample_rate = tts.synthesizer.output_sample_rate
+            with wave.open(out_path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(PCM_SAMPLE_WIDTH)
+                wav.setframerate(sample_rate)
+                # 문장 분리는 split_sentences 기준으로 맞추고 모델 쪽 분리는 끔
+                for piece in chunk_text(text, COQUI_MAX_CHARS):
+                    samples = tts.tts(text=piece, split_sentences=False, **voice_args)
+                    pcm = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+                    wav.writeframes((pcm * 32767).astype("<i2").tobytes())
+        print(f"✅ Saved → {out_path}")
+
+
+TTS_BACKENDS = {
+    ElevenLabsBackend.name: ElevenLabsBackend,
+    CoquiBackend.name: CoquiBackend,
+}
+_backends: dict[str, TTSBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_tts_backend(name: Optional[str] = None) -> TTSBackend:
+    """
+    이름으로 TTS 백엔드를 가져옵니다 (기본값: TTS_BACKEND).
+    백엔드는 프로세스당 하나만 만들어 재사용하므로 로컬 모델도 한 번만 불러옵니다.
+    """
+    name = (name or TTS_BACKEND).lower()
+    with _backends_lock:
+        if name not in _backends:
+            if name not in TTS_BACKENDS:
+                raise ValueError(
+                    f"알 수 없는 TTS 백엔드: {name} (가능한 값: {', '.join(TTS_BACKENDS)})"
+                )
+            _backends[name] = TTS_BACKENDS[name]()
+        return _backends[name]
+
+
 # ────────────────────────── #
-# 5. 전체 TXT → 다중 MP3
+# 6. 전체 TXT → 다중 MP3
 # ────────────────────────── #
+def _resolve_voice_key(voice_key: str) -> str:
+    # 음성 키 검증
+    if voice_key not in VOICE_MAP:
+        print(
+            f"경고: 잘못된 음성 키 '{voice_key}'. 기본값 '{DEFAULT_VOICE_KEY}'를 사용합니다."
+        )
+        voice_key = DEFAULT_VOICE_KEY
+    return voice_key
+
+
+def _page_converter(
+    out_dir: str, voice_key: str, base_name: str, backend: TTSBackend
+):
+    """
+    페이지 번호와 텍스트를 받아 {base_name}{idx}.{backend.audio_ext}로 합성하는
+    함수를 만듭니다.
+    """
+
+    def convert(idx: int, page: str) -> str:
+        out_path = os.path.join(out_dir, f"{base_name}{idx}.{backend.audio_ext}")
+        print(f"페이지 {idx} 변환 중: {out_path}")
+        try:
+            backend.synthesize_page(page, out_path, voice_key)
+            print(f"페이지 {idx} 변환 완료")
+            return out_path
+        except Exception as e:
+            print(f"페이지 {idx} 변환 중 오류 발생: {str(e)}")
+            raise
+
+    return convert
+
+
+def _run_pages(
+    jobs: Iterable[tuple[int, str]],
+    out_dir: str,
+    voice_key: str,
+    base_name: str,
+    max_workers: int,
+    backend: TTSBackend,
+) -> list[str]:
+    """
+    (페이지 번호, 텍스트)를 받는 대로 워커 스레드에서 합성하고, 결과를 페이지 순서대로
+    반환합니다. 한 페이지라도 실패하면 아직 시작하지 않은 페이지는 합성하지 않습니다.
+    """
+    convert = _page_converter(out_dir, voice_key, base_name, backend)
+    if backend.max_workers is not None:
+        max_workers = min(max_workers, backend.max_workers)
+    failed = threading.Event()
+
+    def run(idx: int, page: str) -> str:
+        if failed.is_set():
+            raise RuntimeError(f"앞 페이지 합성 실패로 페이지 {idx}를 건너뜁니다.")
+        try:
+            return convert(idx, page)
+        except Exception:
+            failed.set()
+            raise
+
+    with ThreadPoolExecutor(
+        max_workers=max(max_workers, 1), thread_name_prefix="tts"
+    ) as pool:
+        futures = [pool.submit(run, idx, page) for idx, page in jobs]
+        return [future.result() for future in futures]
+
+
+def _synthesize_pages(
+    jobs: Iterable[tuple[int, str]],
+    out_dir: str,
+    voice_key: str,
+    base_name: str,
+    max_workers: int,
+    backend: Optional[str],
+) -> list[str]:
+    """
+    기본 백엔드로 합성하고, 실패하면 TTS_FALLBACK_BACKEND로 강의 전체를 다시 합성합니다.
+
+    백엔드마다 오디오 형식(MP3/WAV)이 다를 수 있어 영상 조립이 한 형식만 보도록
+    페이지 단위가 아니라 강의 단위로 전환합니다. 페이지 입력 자체(예: 대본 스트리밍)가
+    실패한 경우에는 다시 시도하지 않습니다.
+    """
+    voice_key = _resolve_voice_key(voice_key)
+    primary = get_tts_backend(backend)
+    print(f"선택된 음성: {voice_key} (TTS 백엔드: {primary.name})")
+    os.makedirs(out_dir, exist_ok=True)
+
+    received: list[tuple[int, str]] = []
+    source_failed = False
+    # 캐시 카운터는 프로세스 누적값이라 이 강의 몫만 보려면 시작 시점 값을 빼야 함
+    cache_before = tts_cache.stats()
+
+    def track():
+        nonlocal source_failed
+        try:
+            for job in jobs:
+                received.append(job)
+                yield job
+        except Exception:
+            source_failed = True
+            raise
+
+    try:
+        audio_files = _run_pages(
+            track(), out_dir, voice_key, base_name, max_workers, primary
+        )
+        return _print_summary(audio_files, primary, cache_before)
+    except Exception as e:
+        fallback_name = TTS_FALLBACK_BACKEND
+        if source_failed or not fallback_name or fallback_name == primary.name:
+            raise
+        print(
+            f"{primary.name} TTS 실패 ({e}). "
+            f"{fallback_name} 백엔드로 전체 {len(received)}페이지를 다시 합성합니다."
+        )
+
+    # 형식이 섞이지 않도록 기본 백엔드가 만든 파일을 지우고 처음부터 다시 합성
+    for idx, _ in received:
+        Path(out_dir, f"{base_name}{idx}.{primary.audio_ext}").unlink(missing_ok=True)
+    fallback = get_tts_backend(fallback_name)
+    audio_files = _run_pages(
+        received, out_dir, voice_key, base_name, max_workers, fallback
+    )
+    return _print_summary(audio_files, fallback, cache_before)
+
+
+def _print_summary(
+    audio_files: list[str], backend: TTSBackend, cache_before: dict
+) -> list[str]:
+    print(
+        f"총 {len(audio_files)}개의 {backend.audio_ext.upper()} 파일이 생성되었습니다. "
+        f"(TTS 백엔드: {backend.name})"
+    )
+    if TTS_CACHE_ENABLED and backend.name == ElevenLabsBackend.name:
+        now = tts_cache.stats()
+        hits = now["hits"] - cache_before["hits"]
+        misses = now["misses"] - cache_before["misses"]
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        print(f"TTS 캐시 통계(이번 강의): 적중 {hits}, 미스 {misses} ({hit_rate:.0%})")
+    return audio_files
+
+
 def tts_pages_to_mp3(
-    txt_path: str, out_dir: str, voice_key: str, base_name: str = "page"
+    txt_path: str,
+    out_dir: str,
+    voice_key: str,
+    base_name: str = "page",
+    max_workers: int = TTS_MAX_WORKERS,
+    backend: Optional[str] = None,
 ) -> list[str]:
     """
     텍스트 파일을 페이지별로 분리하여 MP3 파일로 변환합니다.
@@ -112,20 +712,13 @@ def tts_pages_to_mp3(
         out_dir: 출력 디렉토리
         voice_key: 음성 키 ("DAWOON", "JIJUN", "IU" 중 하나)
         base_name: 기본 파일명 (기본값: "page")
+        max_workers: 동시에 합성할 페이지 수 (1이면 순차 처리)
+        backend: TTS 백엔드 이름 ("elevenlabs", "coqui", 기본값: TTS_BACKEND)
 
     Returns:
-        생성된 MP3 파일 경로 리스트
+        생성된 오디오 파일 경로 리스트 (페이지 순서).
+        ElevenLabs에서 TTS_AUDIO_FORMAT이 "pcm"이거나 Coqui 백엔드면 WAV 파일 경로 리스트.
     """
-    # 음성 키 검증 및 ID 가져오기
-    if voice_key not in VOICE_MAP:
-        print(
-            f"경고: 잘못된 음성 키 '{voice_key}'. 기본값 '{DEFAULT_VOICE_KEY}'를 사용합니다."
-        )
-        voice_key = DEFAULT_VOICE_KEY
-
-    voice_id = VOICE_MAP[voice_key]
-    print(f"선택된 음성: {voice_key} (ID: {voice_id})")
-
     # 텍스트 파일 읽기
     with open(txt_path, "r", encoding="utf-8") as f:
         text = f.read()
@@ -134,46 +727,37 @@ def tts_pages_to_mp3(
     pages = split_pages(text)
     print(f"총 {len(pages)}개의 페이지를 찾았습니다.")
 
-    # 출력 디렉토리 생성
-    os.makedirs(out_dir, exist_ok=True)
-
-    # 각 페이지를 MP3로 변환
-    mp3_files = []
+    jobs = []
     for idx, page in enumerate(pages, start=1):
         if not page.strip():  # 빈 페이지 건너뛰기
             print(f"페이지 {idx}가 비어있어 건너뜁니다.")
             continue
+        jobs.append((idx, page))
 
-        out_path = os.path.join(out_dir, f"{base_name}{idx}.mp3")
-        print(f"페이지 {idx} 변환 중: {out_path}")
+    return _synthesize_pages(jobs, out_dir, voice_key, base_name, max_workers, backend)
 
-        try:
-            page_to_mp3(page, out_path, voice_id)
-            mp3_files.append(out_path)
-            print(f"페이지 {idx} 변환 완료")
-        except Exception as e:
-            print(f"페이지 {idx} 변환 중 오류 발생: {str(e)}")
-            raise
 
-    print(f"총 {len(mp3_files)}개의 MP3 파일이 생성되었습니다.")
-    return mp3_files
+def tts_page_stream(
+    pages: Iterable[str],
+    out_dir: str,
+    voice_key: str,
+    base_name: str = "page",
+    max_workers: int = TTS_MAX_WORKERS,
+    backend: Optional[str] = None,
+) -> list[str]:
+    """
+    페이지가 하나씩 도착하는 대로(예: 대본 스트리밍) 바로 MP3 합성을 시작합니다.
 
+    페이지 이터레이터는 호출 스레드에서 소비하고 합성은 워커 스레드에서 하므로,
+    앞 페이지를 합성하는 동안에도 다음 페이지를 계속 받을 수 있습니다.
+    출력 파일 규칙과 반환값은 tts_pages_to_mp3와 같습니다.
+    """
 
-# ────────────────────────── #
-# 6. 스크립트 실행 (CLI 테스트용)
-#    $ python tts.py --voice iu
-# ────────────────────────── #
-if __name__ == "__main__":
-    import argparse
-
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--txt", default="./dataset/txt/script_text_page.txt")
-    parser.add_argument("--out", default="./dataset/mp3")
-    parser.add_argument(
-        "--voice", default=DEFAULT_VOICE_KEY, choices=list(VOICE_MAP.keys())
-    )
-    args = parser.parse_args()
+    def arrived():
+        for idx, page in enumerate(pages, start=1):
+            print(f"페이지 {idx} 대본 도착, 합성 시작")
+            yield idx, page
 
-    tts_pages_to_mp3(
-        args.txt, args.out, voice_key=args.voice, base_name="el_output_voice"
+    return _synthesize_pages(
+        arrived(), out_dir, voice_key, base_name, max_workers, backend
     )